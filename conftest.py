@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday April 25th 2024 12:55:55 am                                                #
-# Modified   : Monday January 27th 2025 03:01:07 pm                                                #
+# Modified   : Monday October 19th 2026 07:49:06 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -19,12 +19,18 @@
 import os
 import sys
 
+import pandas as pd
 import pytest
 from dotenv import load_dotenv
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.asset.dataset.config import DatasetConfig
 from genailab.container import GenAILabContainer
 from genailab.core.dtypes import DFType
 from genailab.infra.config.app import AppConfigReader
 from genailab.infra.persist.cloud.aws import S3Handler
+from genailab.infra.persist.repo.dataset import DatasetRepo
+from genailab.infra.persist.repo.object.dao import DAO
+from genailab.infra.persist.repo.object.rao import RAO
 from genailab.infra.utils.file.fileset import FileFormat
 from pyspark.sql import SparkSession
 
@@ -249,6 +255,67 @@ def workspace(container):
 def fao(container):
     return container.io.fao()
 
+# ------------------------------------------------------------------------------------------------ #
+#                                    REVIEW DATASETS                                               #
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture(scope="session")
+def review_config():
+    """Returns a function creating the config of the pandas review dataset of a dataprep stage."""
+
+    def create(stage: str) -> DatasetConfig:
+        return DatasetConfig.from_dict(
+            {
+                "phase": "dataprep",
+                "stage": stage,
+                "name": "review",
+                "file_format": "parquet",
+                "dftype": "pandas",
+            }
+        )
+
+    return create
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def review_repo(fao, tmp_path, review_config):
+    """Returns a function creating a temporary repository holding a raw review dataset.
+
+    The dataset has `rows` reviews, cycling through the first `categories` of Book, Finance and
+    Health & Fitness, with content containing newlines. Keyword arguments are passed on to the
+    DatasetRepo.
+    """
+    categories_ = ["Book", "Finance", "Health & Fitness"]
+    content_ = ["great\napp", "bad app\n", "fine"]
+
+    def create(name: str, rows: int = 3000, categories: int = 3, **kwargs) -> DatasetRepo:
+        repo = DatasetRepo(
+            location=str(tmp_path / name / "fal"),
+            dao=DAO(db_path=str(tmp_path / name / "dal" / "db")),
+            fao=fao,
+            rao=RAO(registry_path=str(tmp_path / name / "ral" / "registry")),
+            **kwargs,
+        )
+        df = pd.DataFrame(
+            {
+                "id": [str(i) for i in range(rows)],
+                "category": [categories_[i % categories] for i in range(rows)],
+                "content": [content_[i % categories] for i in range(rows)],
+            }
+        )
+        raw = (
+            DatasetBuilder(repo=repo, fao=fao)
+            .from_config(review_config("raw"))
+            .dataframe(df)
+            .creator("Test")
+            .build()
+        )
+        repo.add(dataset=raw, entity="Test")
+        return repo
+
+    return create
+
+
 # ------------------------------------------------------------------------------------------------ #
 #                                          FILEPATH                                                #
 # ------------------------------------------------------------------------------------------------ #
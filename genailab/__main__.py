@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Saturday September 14th 2024 06:28:52 am                                            #
-# Modified   : Sunday January 26th 2025 10:38:15 pm                                                #
+# Modified   : Monday October 19th 2026 06:44:33 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -27,9 +27,9 @@ logger = logging.getLogger(__name__)
 
 
 # ------------------------------------------------------------------------------------------------ #
-def main(force: bool = False):
+def main(force: bool = False, source: str = None):
     container = wire_container()
-    load_data(container=container, force=force)
+    load_data(container=container, force=force, source_filepath=source)
 
 
 if __name__ == "__main__":
@@ -41,7 +41,13 @@ if __name__ == "__main__":
         action="store_true",  # This makes it a boolean flag
         help="Force certain actions.",
     )
+    parser.add_argument(
+        "-s",
+        "--source",
+        default=None,
+        help="Source CSV or Parquet file or directory. Overrides the setup configuration.",
+    )
 
     args = parser.parse_args()
     load_dotenv(dotenv_path=".env", override=True)
-    main(force=args.force)
+    main(force=args.force, source=args.source)
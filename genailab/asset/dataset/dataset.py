@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Friday December 27th 2024 08:32:52 pm                                               #
-# Modified   : Tuesday January 28th 2025 01:39:15 am                                               #
+# Modified   : Monday October 19th 2026 06:53:53 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -163,6 +163,11 @@ class Dataset(Asset):
     def file(self, file: FileSet) -> None:
         self._file = file
 
+    @property
+    def num_rows(self) -> Optional[int]:
+        """Returns the number of rows recorded from the dataset's file footers, without reading the data."""
+        return self._file.num_rows if self._file else None
+
     @property
     def dqa(self) -> DQA:
         """Returns the Data Quality Analysis object."""
@@ -200,6 +205,15 @@ class Dataset(Asset):
         """
         entry = self._passport.as_dict()
         entry.update(self._state.as_dict())
+        if self._file is not None:
+            entry.update(
+                {
+                    "num_rows": self._file.num_rows,
+                    "num_row_groups": self._file.num_row_groups,
+                    "file_count": self._file.file_count,
+                    "size": self._file.size,
+                }
+            )
         return entry
 
     def access(self, entity: Optional[str] = None) -> None:
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Monday September 9th 2024 04:54:25 pm                                               #
-# Modified   : Monday January 27th 2025 01:56:46 pm                                                #
+# Modified   : Monday October 19th 2026 07:59:17 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -24,12 +24,22 @@ import logging
 import logging.config
 
 from dependency_injector import containers, providers
+from genailab.flow.base.engine import EngineSelector
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.infra.config.app import AppConfigReader
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 from genailab.infra.persist.repo.file.factory import DataFrameIOFactory
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
 from genailab.infra.persist.repo.file.fao import FAO
+from genailab.infra.persist.repo.file.ingest import CSVIngestor
+from genailab.infra.persist.repo.file.layout import ParquetLayout
 from genailab.infra.persist.repo.object.dao import DAO
 from genailab.infra.persist.repo.object.rao import RAO
+from genailab.infra.service.spark.lineage import LineageManager
 from genailab.infra.service.spark.pool import SparkSessionPool
 
 
@@ -81,6 +91,88 @@ class IOContainer(containers.DeclarativeContainer):
         rao=rao,
         dao=dao,
         fao=fao,
+        write_behind=config.ops.persist.write_behind,
+        full_fingerprint=config.ops.persist.full_fingerprint,
+    )
+
+    stage_cache = providers.Singleton(
+        StageCache,
+        location=config.repository.cache.location,
+        fao=fao,
+        budget=config.repository.cache.budget,
+    )
+
+    ingestor = providers.Singleton(
+        CSVIngestor,
+        config=config.io,
+    )
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                    FLOW CONTAINER                                                #
+# ------------------------------------------------------------------------------------------------ #
+class FlowContainer(containers.DeclarativeContainer):
+
+    config = providers.Configuration()
+
+    lineage = providers.Singleton(
+        LineageManager,
+        enabled=config.ops.lineage.enabled,
+        interval=config.ops.lineage.interval,
+        max_depth=config.ops.lineage.max_depth,
+        max_fields=config.ops.lineage.max_fields,
+        mode=config.ops.lineage.mode,
+        storage_level=config.ops.lineage.storage_level,
+    )
+
+    scheduler = providers.Singleton(
+        TaskScheduler,
+        max_workers=config.ops.scheduler.max_workers,
+        executor=config.ops.scheduler.executor,
+        lineage=lineage,
+    )
+
+    fao = providers.Dependency(instance_of=FAO)
+
+    layout = providers.Singleton(ParquetLayout.from_config, config=config.io.layout)
+
+    encoding = providers.Singleton(ParquetEncoding.from_config, config=config.io.encoding)
+
+    sharder = providers.Singleton(
+        ShardExecutor,
+        fao=fao,
+        enabled=config.ops.shard.enabled,
+        column=config.ops.shard.column,
+        max_workers=config.ops.shard.max_workers,
+    )
+
+    governor = providers.Singleton(
+        MemoryGovernor,
+        fao=fao,
+        enabled=config.ops.memory.enabled,
+        memory_limit=config.ops.memory.memory_limit,
+        fraction=config.ops.memory.fraction,
+        overhead=config.ops.memory.overhead,
+        min_batch_rows=config.ops.memory.min_batch_rows,
+        layout=layout,
+        encoding=encoding,
+    )
+
+    streamer = providers.Singleton(
+        StreamDriver,
+        fao=fao,
+        enabled=config.ops.stream.enabled,
+        batch_size=config.ops.stream.batch_size,
+        prefetch=config.ops.stream.prefetch,
+        layout=layout,
+        encoding=encoding,
+    )
+
+    engine = providers.Singleton(
+        EngineSelector,
+        governor=governor,
+        enabled=config.ops.engine.enabled,
+        local_limit=config.ops.engine.local_limit,
     )
 
 
@@ -105,3 +197,6 @@ class GenAILabContainer(containers.DeclarativeContainer):
 
     # IO Container
     io = providers.Container(IOContainer, config=config)
+
+    # Flow Container
+    flow = providers.Container(FlowContainer, config=config, fao=io.fao)
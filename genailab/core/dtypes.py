@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Monday August 26th 2024 10:17:42 pm                                                 #
-# Modified   : Friday January 31st 2025 03:27:48 am                                                #
+# Modified   : Monday October 19th 2026 06:37:06 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -122,3 +122,36 @@ SPARK_SCHEMA_DEFAULT = StructType(
         StructField("category", StringType(), False),
     ]
 )
+
+# ------------------------------------------------------------------------------------------------ #
+#                                  DATASET SCHEMA                                                  #
+# ------------------------------------------------------------------------------------------------ #
+COUNT_SCHEMA = {
+    "noun_count": np.float64,
+    "verb_count": np.float64,
+    "adjective_count": np.float64,
+    "adverb_count": np.float64,
+    "aspect_verb_pairs": np.float64,
+    "noun_phrases": np.float64,
+    "verb_phrases": np.float64,
+    "adverbial_phrases": np.float64,
+    "review_length": 'int64',
+    "lexical_density": np.float64,
+    "dependency_depth": 'int64',
+    "tqa_score": np.float64,
+}
+
+DATASET_SCHEMA = {
+    "id": 'str',
+    "app_id": 'str',
+    "app_name": 'str',
+    "category_id": "category",
+    "author": 'str',
+    "rating": 'int64',
+    "content": 'str',
+    "vote_sum": 'int64',
+    "vote_count": 'int64',
+    "date": "datetime64[ms]",
+    "category": "category",
+    **COUNT_SCHEMA,
+}
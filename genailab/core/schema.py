@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/core/schema.py                                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:39:19 pm                                                #
+# Modified   : Monday October 19th 2026 06:39:19 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Schema Registry Module"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pyspark.sql.types import (
+    BooleanType,
+    ByteType,
+    DataType,
+    DoubleType,
+    FloatType,
+    IntegerType,
+    LongType,
+    ShortType,
+    StringType,
+    StructField,
+    StructType,
+    TimestampType,
+)
+
+from genailab.core.dtypes import COUNT_SCHEMA, DTYPES
+from genailab.core.flow import PhaseDef, StageDef
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                         SCHEMA                                                   #
+# ------------------------------------------------------------------------------------------------ #
+class Schema:
+    """A declared dataset schema, rendered for pandas, Spark and Arrow from one definition.
+
+    Columns are declared with pandas dtypes, from which the Spark StructType and the Arrow
+    schema are derived, so the three engines always agree on the types of a dataset.
+
+    Args:
+        dtypes (Dict[str, Any]): Maps column names to pandas dtypes, in column order.
+    """
+
+    def __init__(self, dtypes: Dict[str, Any]) -> None:
+        self._dtypes = dict(dtypes)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._dtypes
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Schema) and self.dtypes == other.dtypes
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.dtypes})"
+
+    @property
+    def names(self) -> List[str]:
+        """Returns the declared column names."""
+        return list(self._dtypes.keys())
+
+    @property
+    def dtypes(self) -> Dict[str, str]:
+        """Returns the pandas dtypes of the declared columns."""
+        return {column: str(pd.api.types.pandas_dtype(dtype)) for column, dtype in self._dtypes.items()}
+
+    @property
+    def struct_type(self) -> StructType:
+        """Returns the Spark schema of the declared columns."""
+        return StructType(
+            [StructField(column, to_spark_type(dtype), True) for column, dtype in self._dtypes.items()]
+        )
+
+    @property
+    def arrow_schema(self) -> pa.Schema:
+        """Returns the Arrow schema of the declared columns."""
+        return pa.schema([(column, to_arrow_type(dtype)) for column, dtype in self._dtypes.items()])
+
+    def extend(self, dtypes: Dict[str, Any]) -> Schema:
+        """Returns a schema with additional or overridden columns."""
+        return Schema(dtypes={**self._dtypes, **dtypes})
+
+    def select(self, columns: List[str], default: Optional[Any] = None) -> Schema:
+        """Returns the schema of the given columns, in the given order.
+
+        Args:
+            columns (List[str]): The columns to select.
+            default (Optional[Any]): The dtype of undeclared columns. If None, undeclared
+                columns are omitted.
+        """
+        return Schema(
+            dtypes={
+                column: self._dtypes.get(column, default)
+                for column in columns
+                if column in self._dtypes or default is not None
+            }
+        )
+
+
+# ------------------------------------------------------------------------------------------------ #
+def to_spark_type(dtype: Any) -> DataType:
+    """Maps a pandas dtype to the Spark type it converts to."""
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if pd.api.types.is_bool_dtype(dtype):
+        return BooleanType()
+    if pd.api.types.is_integer_dtype(dtype):
+        return {1: ByteType(), 2: ShortType(), 4: IntegerType()}.get(dtype.itemsize, LongType())
+    if pd.api.types.is_float_dtype(dtype):
+        return FloatType() if dtype.itemsize == 4 else DoubleType()
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return TimestampType()
+    return StringType()
+
+
+def to_arrow_type(dtype: Any) -> pa.DataType:
+    """Maps a pandas dtype to the Arrow type it converts from."""
+    dtype = pd.api.types.pandas_dtype(dtype)
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pa.dictionary(pa.int32(), pa.string())
+    if pd.api.types.is_string_dtype(dtype) or dtype == np.dtype("O"):
+        return pa.string()
+    return pa.from_numpy_dtype(getattr(dtype, "numpy_dtype", dtype))
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      SCHEMA REGISTRY                                             #
+# ------------------------------------------------------------------------------------------------ #
+REVIEW_SCHEMA = Schema(dtypes={**DTYPES, "date": "datetime64[ms]"})
+TQA_SCHEMA = REVIEW_SCHEMA.extend(dtypes=COUNT_SCHEMA)
+
+
+# ------------------------------------------------------------------------------------------------ #
+class SchemaRegistry:
+    """Declared schemas of the datasets produced by each phase and stage.
+
+    Readers apply the registered schema at read time instead of inferring types, and columns
+    a stage adds beyond its declared schema keep the types stored in the file.
+    """
+
+    __defaults = {
+        (PhaseDef.DATAPREP, StageDef.RAW): REVIEW_SCHEMA,
+        (PhaseDef.DATAPREP, StageDef.PREPROCESS): REVIEW_SCHEMA,
+        (PhaseDef.DATAPREP, StageDef.DQA): REVIEW_SCHEMA,
+        (PhaseDef.DATAPREP, StageDef.SEMICLEAN): REVIEW_SCHEMA,
+        (PhaseDef.DATAPREP, StageDef.DQV): REVIEW_SCHEMA,
+        (PhaseDef.DATAPREP, StageDef.CLEAN): REVIEW_SCHEMA,
+        (PhaseDef.FEATURE, StageDef.TQA): TQA_SCHEMA,
+    }
+
+    def __init__(self) -> None:
+        self._schemas: Dict[Tuple[PhaseDef, StageDef], Schema] = dict(self.__defaults)
+
+    def register(self, phase: PhaseDef, stage: StageDef, schema: Schema) -> None:
+        """Registers the schema of the datasets of a phase and stage."""
+        self._schemas[(phase, stage)] = schema
+
+    def get(self, phase: PhaseDef, stage: StageDef) -> Optional[Schema]:
+        """Returns the schema of the datasets of a phase and stage, or None if undeclared."""
+        return self._schemas.get((phase, stage))
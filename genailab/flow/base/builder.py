@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:02:14 am                                              #
-# Modified   : Thursday January 30th 2025 03:00:34 pm                                              #
+# Modified   : Monday October 19th 2026 07:30:05 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -20,7 +20,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
 
 from dependency_injector.wiring import Provide, inject
 from pyspark.sql import SparkSession
@@ -30,11 +30,19 @@ from genailab.asset.dataset.config import DatasetConfig
 from genailab.container import GenAILabContainer
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.core.schema import Schema, SchemaRegistry
+from genailab.flow.base.engine import EngineSelector
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.flow.base.stage import Stage
 from genailab.flow.base.task import Task, TaskBuilder
 from genailab.infra.config.flow import FlowConfigReader
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 from genailab.infra.service.spark.pool import SparkSessionPool
+from genailab.infra.utils.file.fileset import FileSet
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -52,6 +60,18 @@ class StageBuilder(ABC):
             Default is injected from `GenAILabContainer.io.flowstate`.
         spark_session_pool (SparkSessionPool): Pool for managing Spark sessions.
             Default is injected from `GenAILabContainer.spark.session_pool`.
+        stage_cache (StageCache): Content-addressed cache of stage results.
+            Default is injected from `GenAILabContainer.io.stage_cache`.
+        scheduler (TaskScheduler): Scheduler running independent tasks concurrently.
+            Default is injected from `GenAILabContainer.flow.scheduler`.
+        sharder (ShardExecutor): Executor running pandas stages on each source partition.
+            Default is injected from `GenAILabContainer.flow.sharder`.
+        governor (MemoryGovernor): Governor running pandas stages in batches within a memory budget.
+            Default is injected from `GenAILabContainer.flow.governor`.
+        streamer (StreamDriver): Driver piping pandas stages from reader to writer in batches.
+            Default is injected from `GenAILabContainer.flow.streamer`.
+        engine_selector (EngineSelector): Selector choosing the engine from the size of the source.
+            Default is injected from `GenAILabContainer.flow.engine`.
         config_reader_cls (Type[FlowConfigReader]): Class used for reading
             pipeline configurations. Default is `FlowConfigReader`.
         dataset_builder_cls (Type[DatasetBuilder]): Class used for constructing datasets.
@@ -63,6 +83,13 @@ class StageBuilder(ABC):
         _repo (DatasetRepo): The dataset repository instance.
         _state (FlowState): The flow state object for managing pipeline state.
         _spark_session_pool (SparkSessionPool): Pool for Spark session management.
+        _stage_cache (StageCache): Content-addressed cache of stage results.
+        _scheduler (TaskScheduler): Scheduler running independent tasks concurrently.
+        _sharder (ShardExecutor): Executor running pandas stages on each source partition.
+        _governor (MemoryGovernor): Governor running pandas stages in batches within a memory budget.
+        _streamer (StreamDriver): Driver piping pandas stages from reader to writer in batches.
+        _engine_selector (EngineSelector): Selector choosing the engine from the size of the source.
+        _engine (Optional[DFType]): Engine overriding the selected one, if set.
         _config_reader (FlowConfigReader): Reader for accessing pipeline configurations.
         _dataset_builder (DatasetBuilder): Builder for creating datasets.
         _task_builder (TaskBuilder): Builder for creating tasks.
@@ -81,12 +108,25 @@ class StageBuilder(ABC):
         spark_session_pool: SparkSessionPool = Provide[
             GenAILabContainer.spark.session_pool
         ],
+        stage_cache: StageCache = Provide[GenAILabContainer.io.stage_cache],
+        scheduler: TaskScheduler = Provide[GenAILabContainer.flow.scheduler],
+        sharder: ShardExecutor = Provide[GenAILabContainer.flow.sharder],
+        governor: MemoryGovernor = Provide[GenAILabContainer.flow.governor],
+        streamer: StreamDriver = Provide[GenAILabContainer.flow.streamer],
+        engine_selector: EngineSelector = Provide[GenAILabContainer.flow.engine],
         config_reader_cls: Type[FlowConfigReader] = FlowConfigReader,
         dataset_builder_cls: Type[DatasetBuilder] = DatasetBuilder,
         task_builder_cls: Type[TaskBuilder] = TaskBuilder,
     ) -> None:
         self._repo = repo
         self._spark_session_pool = spark_session_pool
+        self._stage_cache = stage_cache
+        self._scheduler = scheduler
+        self._sharder = sharder
+        self._governor = governor
+        self._streamer = streamer
+        self._engine_selector = engine_selector
+        self._engine: Optional[DFType] = None
         self._config_reader = config_reader_cls()
         self._dataset_builder = dataset_builder_cls()
         self._task_builder = task_builder_cls()
@@ -101,6 +141,10 @@ class StageBuilder(ABC):
 
         self.reset()
 
+        # Start the JVM of Spark stages while they are configured.
+        if getattr(self, "dftype", None) in (DFType.SPARK, DFType.SPARKNLP):
+            self._spark_session_pool.warm(dftype=self.dftype)
+
     @property
     @abstractmethod
     def phase(self) -> PhaseDef:
@@ -123,6 +167,39 @@ class StageBuilder(ABC):
         """
         pass
 
+    @property
+    def engines(self) -> Tuple[DFType, ...]:
+        """
+        The engines the stage can run on.
+
+        Stages supporting more than one engine override this property, and their engine is
+        chosen at build time from the size of the source.
+
+        Returns:
+            Tuple[DFType, ...]: The supported engines.
+        """
+        return (self.dftype,)
+
+    def engine(self, dftype: DFType) -> StageBuilder:
+        """
+        Overrides the engine chosen from the size of the source for the next build.
+
+        Args:
+            dftype (DFType): The engine the stage runs on.
+
+        Returns:
+            StageBuilder: The builder instance for method chaining.
+
+        Raises:
+            ValueError: If the stage doesn't support the engine.
+        """
+        if dftype not in self.engines:
+            msg = f"{self.__class__.__name__} doesn't support the {dftype.value} engine. Supported engines: {', '.join(engine.value for engine in self.engines)}."
+            self._logger.error(msg)
+            raise ValueError(msg)
+        self._engine = dftype
+        return self
+
     def reset(self) -> None:
         """
         Resets the internal state of the builder.
@@ -142,6 +219,7 @@ class StageBuilder(ABC):
             phase=self.phase, stage=self.stage, config="tasks"
         )
         self._tasks: List[Task] = []
+        self._engine = None
 
     @abstractmethod
     def build(self, *args, **kwargs) -> Stage:
@@ -223,17 +301,78 @@ class StageBuilder(ABC):
         dataset_config = self._get_config(phase=phase, stage=stage, config=config)
         return DatasetConfig.from_dict(config=dataset_config)
 
-    def _get_spark(self, dftype: DFType) -> SparkSession:
+    def _get_spark(
+        self, dftype: DFType, source_config: Optional[DatasetConfig] = None
+    ) -> SparkSession:
         """
-        Retrieves a Spark session for the specified data frame type.
+        Retrieves a Spark session for the specified data frame type, tuned to the source.
+
+        Sessions of the other type are stopped. The session's shuffle partitions and Arrow
+        batch size are tuned to the estimated in-memory size of the source.
 
         Args:
             dftype (DFType): The type of data frame (e.g., PySpark, Pandas).
+            source_config (Optional[DatasetConfig]): Configuration of the source dataset.
+                Defaults to the source configuration of the stage.
 
         Returns:
             SparkSession: A Spark session instance.
         """
-        self._spark_session_pool.stop()
+        self._spark_session_pool.stop(keep=dftype)
+        file, schema = self._get_source_file(source_config=source_config)
+        if file is not None and file.path is not None and file.num_rows:
+            size = self._governor.estimate_size(
+                filepath=file.path, num_rows=file.num_rows, schema=schema
+            )
+            self._spark_session_pool.tune(input_size=size, num_rows=file.num_rows)
         return self._spark_session_pool.get_spark_session(dftype=dftype)
 
+    def _get_source_file(
+        self, source_config: Optional[DatasetConfig] = None
+    ) -> Tuple[Optional[FileSet], Optional[Schema]]:
+        """
+        Retrieves the FileSet and declared schema of the source from the repository.
+
+        Args:
+            source_config (Optional[DatasetConfig]): Configuration of the source dataset.
+                Defaults to the source configuration of the stage.
+
+        Returns:
+            Tuple[Optional[FileSet], Optional[Schema]]: The FileSet, with its footer
+                statistics, and the schema of the source, or None if it is not registered.
+        """
+        config = source_config or self._source_config
+        if config is None:
+            return None, None
+        asset_id = self._repo.get_asset_id(
+            phase=config.phase, stage=config.stage, name=config.name
+        )
+        if not self._repo.exists(asset_id=asset_id):
+            return None, None
+        return (
+            self._repo.get_meta(asset_id=asset_id).file,
+            SchemaRegistry().get(phase=config.phase, stage=config.stage),
+        )
 
+    def _select_engine(self, source_config: Optional[DatasetConfig] = None) -> DFType:
+        """
+        Chooses the engine of the stage from the size of its source.
+
+        The engine set with `engine` takes precedence. Otherwise the EngineSelector sizes the
+        source from the footer statistics recorded in the repository.
+
+        Args:
+            source_config (Optional[DatasetConfig]): Configuration of the source dataset.
+                Defaults to the source configuration of the stage.
+
+        Returns:
+            DFType: The engine the stage runs on.
+        """
+        name = f"{self.phase.value}_{self.stage.value}"
+        if self._engine is not None:
+            self._logger.info(f"Running {name} on {self._engine.value}, as set on the builder.")
+            return self._engine
+        file, schema = self._get_source_file(source_config=source_config)
+        return self._engine_selector.select(
+            engines=self.engines, file=file, schema=schema, name=name
+        )
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/engine.py                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:24:02 pm                                                #
+# Modified   : Monday October 19th 2026 07:24:02 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Engine Selection Module"""
+from __future__ import annotations
+
+import logging
+from typing import Optional, Sequence, Union
+
+from dask.utils import parse_bytes
+
+from genailab.core.dtypes import DFType
+from genailab.core.schema import Schema
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.infra.utils.data.dataframe import DatasetSizeThreshold
+from genailab.infra.utils.file.fileset import FileSet
+
+# ------------------------------------------------------------------------------------------------ #
+# Engines from lightest to heaviest: in process, out of core on one machine, and on a cluster.
+ENGINE_RANK = {DFType.PANDAS: 0, DFType.DASK: 1, DFType.SPARK: 2, DFType.SPARKNLP: 2}
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       ENGINE SELECTOR                                            #
+# ------------------------------------------------------------------------------------------------ #
+class EngineSelector:
+    """Chooses the dataframe engine of a stage from the size of its source.
+
+    The in-memory size of the source is estimated without loading it: the row count comes from
+    the Parquet footer statistics recorded on its FileSet, and the average row size is measured
+    on a sample of its first batch by the MemoryGovernor. Sources whose processing fits the
+    governor's budget run on pandas, sources up to `local_limit` on Dask, and larger sources on
+    Spark. A stage runs on the lightest engine it supports that is at least as heavy as the one
+    its source needs, or its heaviest engine if none is.
+
+    Args:
+        governor (MemoryGovernor): Governor estimating dataset sizes and owning the memory budget.
+        enabled (bool): Whether engines are chosen from the size of the source. If False, stages
+            run on their default engine. Defaults to True.
+        local_limit (Optional[Union[int, str]]): Largest source, in bytes in memory or as a
+            string such as "10GiB", processed on a single machine with Dask. Defaults to the
+            maximum size of the SMALL DatasetSizeThreshold.
+    """
+
+    def __init__(
+        self,
+        governor: MemoryGovernor,
+        enabled: bool = True,
+        local_limit: Optional[Union[int, str]] = None,
+    ) -> None:
+        self._governor = governor
+        self._enabled = enabled
+        self._local_limit = (
+            parse_bytes(local_limit)
+            if local_limit is not None
+            else DatasetSizeThreshold.SMALL.max_size
+        )
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if engines are chosen from the size of the source."""
+        return self._enabled
+
+    def select(
+        self,
+        engines: Sequence[DFType],
+        file: Optional[FileSet],
+        schema: Optional[Schema] = None,
+        default: Optional[DFType] = None,
+        name: str = "stage",
+    ) -> DFType:
+        """Chooses the engine a stage runs on.
+
+        Args:
+            engines (Sequence[DFType]): The engines the stage supports.
+            file (Optional[FileSet]): The FileSet of the stage's source, or None if the source
+                is not registered yet.
+            schema (Optional[Schema]): Declared schema of the source.
+            default (Optional[DFType]): The engine used when the size of the source is unknown
+                or selection is disabled. Defaults to the first engine.
+            name (str): Name of the stage, for logging.
+
+        Returns:
+            DFType: The engine chosen.
+
+        Raises:
+            ValueError: If no engines are given.
+        """
+        if not engines:
+            msg = f"No engines given for {name}."
+            self._logger.error(msg)
+            raise ValueError(msg)
+        default = default or engines[0]
+        if len(engines) == 1:
+            return engines[0]
+        if not self._enabled:
+            self._logger.info(f"Engine selection is disabled. Running {name} on {default.value}.")
+            return default
+        if file is None or file.path is None:
+            self._logger.info(
+                f"The size of the source of {name} is unknown. Running {name} on {default.value}."
+            )
+            return default
+
+        size = self._estimate_size(file=file, schema=schema)
+        budget = self._governor.budget
+        if size * self._governor.overhead <= budget:
+            required, reason = DFType.PANDAS, f"fits the {budget / 1024**2:,.0f} MB memory budget"
+        elif size <= self._local_limit:
+            required, reason = (
+                DFType.DASK,
+                f"exceeds the {budget / 1024**2:,.0f} MB memory budget and is within the "
+                f"{self._local_limit / 1024**2:,.0f} MB local limit",
+            )
+        else:
+            required, reason = (
+                DFType.SPARK,
+                f"exceeds the {self._local_limit / 1024**2:,.0f} MB local limit",
+            )
+
+        candidates = [
+            engine for engine in engines if ENGINE_RANK[engine] >= ENGINE_RANK[required]
+        ]
+        engine = (
+            min(candidates, key=ENGINE_RANK.get)
+            if candidates
+            else max(engines, key=ENGINE_RANK.get)
+        )
+        self._logger.info(
+            f"Running {name} on {engine.value}. Its source of {file.num_rows or 'unknown'} rows "
+            f"takes an estimated {size / 1024**2:,.0f} MB in memory, which {reason}."
+        )
+        return engine
+
+    def _estimate_size(self, file: FileSet, schema: Optional[Schema] = None) -> int:
+        """Estimates the in-memory size of a source from its row count and a sampled row size.
+
+        Sources without footer statistics, such as CSV files, are sized by their files on disk.
+        """
+        if not file.num_rows:
+            return int(file.size or 0)
+        return self._governor.estimate_size(
+            filepath=file.path, num_rows=file.num_rows, schema=schema
+        )
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/governor.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:14:46 pm                                                #
+# Modified   : Monday October 19th 2026 08:38:04 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Memory Governor Module"""
+from __future__ import annotations
+
+import logging
+import os
+from typing import Callable, Iterator, List, Optional, Union
+
+import pandas as pd
+import psutil
+from dask.utils import parse_bytes
+
+from genailab.core.schema import Schema
+from genailab.flow.base.stream import compact, spill
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.fao import FAO
+from genailab.infra.persist.repo.file.layout import ParquetLayout
+from genailab.infra.utils.data.dataframe import PandasDataFrameMemoryFootprintEstimator
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                       MEMORY GOVERNOR                                            #
+# ------------------------------------------------------------------------------------------------ #
+class MemoryGovernor:
+    """Runs pandas stages out of core, in batches sized to a memory budget.
+
+    The memory a stage needs is estimated from the average row size of a sample of its source,
+    measured with the PandasDataFrameMemoryFootprintEstimator, times the number of rows and an
+    overhead factor covering the copies made by the tasks and the writer. If that exceeds the
+    budget, the source is streamed through the FAO in batches of as many rows as fit in the
+    budget. Each batch is processed and spilled to disk, and the spilled files are merged into
+    the partitions of a single destination directory and compacted into files sized by the
+    layout, ready to be registered with `DatasetRepo.add_file`. The row size is re-measured on
+    every batch, including the columns the tasks add, and the size of the next batch adapts to
+    it.
+
+    Args:
+        fao (FAO): File access object streaming the source and writing the spilled batches.
+        enabled (bool): Whether stages that don't fit in the budget run in batches.
+            Defaults to True.
+        memory_limit (Optional[Union[int, str]]): The budget in bytes, or as a string such as
+            "24GiB". Defaults to `fraction` of the memory available when the stage runs.
+        fraction (float): Share of the available memory used as the budget when no limit is
+            set. Defaults to 0.6.
+        overhead (float): Peak memory of processing a batch in multiples of the batch's size.
+            Defaults to 4.0.
+        min_batch_rows (int): Smallest batch, however low the budget. Defaults to 1000.
+        layout (Optional[ParquetLayout]): Sizes and sorts the compacted files. Defaults to the
+            default ParquetLayout.
+        encoding (Optional[ParquetEncoding]): Chooses the compression and encodings of the
+            compacted files. If None, pyarrow's defaults apply.
+    """
+
+    def __init__(
+        self,
+        fao: FAO,
+        enabled: bool = True,
+        memory_limit: Optional[Union[int, str]] = None,
+        fraction: float = 0.6,
+        overhead: float = 4.0,
+        min_batch_rows: int = 1000,
+        layout: Optional[ParquetLayout] = None,
+        encoding: Optional[ParquetEncoding] = None,
+    ) -> None:
+        self._fao = fao
+        self._enabled = enabled
+        self._memory_limit = parse_bytes(memory_limit) if memory_limit is not None else None
+        self._fraction = fraction
+        self._overhead = overhead
+        self._min_batch_rows = min_batch_rows
+        self._layout = layout or ParquetLayout()
+        self._encoding = encoding
+        self._estimator = PandasDataFrameMemoryFootprintEstimator()
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if stages that don't fit in the budget run in batches."""
+        return self._enabled
+
+    @property
+    def budget(self) -> int:
+        """Returns the memory budget in bytes."""
+        if self._memory_limit is not None:
+            return self._memory_limit
+        return int(psutil.virtual_memory().available * self._fraction)
+
+    def batch_rows(self, row_size: float) -> int:
+        """Returns the number of rows of the given size that can be processed within the budget."""
+        if row_size <= 0:
+            return self._min_batch_rows
+        return max(self._min_batch_rows, int(self.budget / (row_size * self._overhead)))
+
+    @property
+    def overhead(self) -> float:
+        """Returns the peak memory of processing data in multiples of its size."""
+        return self._overhead
+
+    def estimate_size(self, filepath: str, num_rows: int, schema: Optional[Schema] = None) -> int:
+        """Estimates the in-memory size of a dataset as a pandas DataFrame.
+
+        Only the first batch of the dataset is read; its average row size is measured on a sample
+        of rows and extrapolated to the number of rows.
+
+        Args:
+            filepath (str): Path of the dataset's file or directory.
+            num_rows (int): Number of rows of the dataset.
+            schema (Optional[Schema]): Declared schema of the dataset.
+
+        Returns:
+            int: The estimated size in bytes.
+        """
+        return int(self._sample_row_size(filepath=filepath, schema=schema) * num_rows)
+
+    def fits(self, filepath: str, num_rows: int, schema: Optional[Schema] = None) -> bool:
+        """Checks if processing a dataset as a whole fits within the budget.
+
+        Args:
+            filepath (str): Path of the dataset's file or directory.
+            num_rows (int): Number of rows of the dataset.
+            schema (Optional[Schema]): Declared schema of the dataset.
+
+        Returns:
+            bool: True if the estimated memory required is within the budget.
+        """
+        size = self.estimate_size(filepath=filepath, num_rows=num_rows, schema=schema)
+        required = size * self._overhead
+        budget = self.budget
+        self._logger.debug(
+            f"Processing {filepath} requires an estimated {required / 1024**2:,.0f} MB of a "
+            f"{budget / 1024**2:,.0f} MB budget."
+        )
+        return required <= budget
+
+    def run(
+        self,
+        filepath: str,
+        destination: str,
+        transform: Callable[[pd.DataFrame], pd.DataFrame],
+        schema: Optional[Schema] = None,
+    ) -> int:
+        """Streams the dataset through the transform in batches and spills the results.
+
+        Args:
+            filepath (str): Path of the source dataset's file or directory.
+            destination (str): Directory receiving the merged results.
+            transform (Callable[[pd.DataFrame], pd.DataFrame]): Processes a batch of rows.
+                Applied to each batch independently, so it must compute each row from that row.
+            schema (Optional[Schema]): Declared schema of the source dataset.
+
+        Returns:
+            int: The number of rows written.
+        """
+        row_size = self._sample_row_size(filepath=filepath, schema=schema)
+        target = self.batch_rows(row_size=row_size)
+        # Read in smaller chunks so the batch size can adapt between batches.
+        chunk_rows = max(self._min_batch_rows, target // 8)
+        os.makedirs(destination, exist_ok=True)
+
+        rows = 0
+        index = 0
+        chunks: List[pd.DataFrame] = []
+        pending = 0
+        batches = self._fao.iter_batches(filepath=filepath, schema=schema, batch_size=chunk_rows)
+        for chunk in batches:
+            chunks.append(chunk)
+            pending += len(chunk)
+            if pending < target:
+                continue
+            written, row_size = self._process(
+                batch=self._concat(chunks=chunks, schema=schema),
+                index=index,
+                transform=transform,
+                destination=destination,
+            )
+            rows += written
+            index += 1
+            chunks = []
+            pending = 0
+            target = self.batch_rows(row_size=row_size)
+        if chunks:
+            written, _ = self._process(
+                batch=self._concat(chunks=chunks, schema=schema),
+                index=index,
+                transform=transform,
+                destination=destination,
+            )
+            rows += written
+            index += 1
+        # Compaction holds no more rows than a batch, so it stays within the budget.
+        compact(
+            destination=destination,
+            layout=self._layout,
+            encoding=self._encoding,
+            max_rows=self.batch_rows(row_size=row_size),
+        )
+        self._logger.debug(f"Processed {rows} rows of {filepath} in {index} batches.")
+        return rows
+
+    def _process(
+        self,
+        batch: pd.DataFrame,
+        index: int,
+        transform: Callable[[pd.DataFrame], pd.DataFrame],
+        destination: str,
+    ) -> tuple:
+        """Transforms and spills a batch, returning the rows written and the measured row size.
+
+        The row size is the larger of the input and output memory per input row.
+        """
+        num_rows = len(batch)
+        input_size = self._estimator.estimate_memory_size(df=batch)
+        self._logger.debug(f"Processing batch {index} of {num_rows} rows.")
+        result = transform(batch)
+        del batch
+        output_size = self._estimator.estimate_memory_size(df=result)
+        row_size = max(input_size, output_size) / max(num_rows, 1)
+        written = len(result)
+        if written:
+            spill(fao=self._fao, dataframe=result, index=index, destination=destination)
+        return written, row_size
+
+    def _concat(self, chunks: List[pd.DataFrame], schema: Optional[Schema]) -> pd.DataFrame:
+        """Concatenates chunks, restoring categoricals whose categories differ between chunks."""
+        if len(chunks) == 1:
+            return chunks[0]
+        dataframe = pd.concat(chunks, ignore_index=True)
+        if schema is None:
+            return dataframe
+        dtypes = {
+            column: dtype
+            for column, dtype in schema.dtypes.items()
+            if column in dataframe.columns and str(dataframe[column].dtype) != dtype
+        }
+        return dataframe.astype(dtypes) if dtypes else dataframe
+
+    def _sample_row_size(self, filepath: str, schema: Optional[Schema] = None) -> float:
+        """Measures the average row size of the first batch of a dataset."""
+        batches: Iterator[pd.DataFrame] = self._fao.iter_batches(
+            filepath=filepath, schema=schema, batch_size=self._min_batch_rows * 10
+        )
+        sample = next(batches, None)
+        batches.close()
+        return self._estimator.estimate_row_size(df=sample) if sample is not None else 0.0
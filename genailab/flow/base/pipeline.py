@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/pipeline.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:01:50 pm                                                #
+# Modified   : Monday October 19th 2026 07:08:34 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Fused Pipeline Module"""
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Optional
+
+from pyspark.sql import DataFrame
+
+from genailab.asset.dataset.dataset import Dataset
+from genailab.flow.base.stage import Stage
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        FUSED PIPELINE                                            #
+# ------------------------------------------------------------------------------------------------ #
+class FusedPipeline:
+    """Runs a chain of stages end to end, keeping the dataframe in memory between them.
+
+    Each stage reads its source from the previous stage's in-memory result rather than from
+    the repository; Spark results are cached so the next stage and the writer share them. Stage
+    outputs are published by a single background writer in stage order, so the repository,
+    stage cache and consumption records match those of running the stages one at a time.
+
+    Persistence modes:
+        - "async": intermediate and final datasets are published in the background while later
+          stages compute. Write errors surface when the run completes.
+        - "sync": each dataset is published before the next stage starts.
+        - "skip": only the final dataset is published. Intermediate datasets are not added to
+          the repository, so the final dataset's source passport refers to an unregistered
+          dataset.
+
+    Stages whose targets are already fresh are skipped unless the run is forced; the fused
+    run starts at the first stale stage, reading its source from the repository.
+
+    Args:
+        stages (List[Stage]): The stages in execution order. Each stage's source configuration
+            must match the previous stage's target configuration.
+        persist (str): Persistence mode. Defaults to "async".
+    """
+
+    __modes = ("async", "sync", "skip")
+
+    def __init__(self, stages: List[Stage], persist: str = "async") -> None:
+        if persist not in self.__modes:
+            raise ValueError(f"Unsupported persistence mode '{persist}'. Expected one of {list(self.__modes)}.")
+        if not stages:
+            raise ValueError("A fused pipeline requires at least one stage.")
+        self._stages = stages
+        self._persist = persist
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def run(self, force: bool = False) -> Dataset:
+        """Runs the stages and returns the final dataset.
+
+        Args:
+            force (bool): If True, runs every stage even if its target is fresh. Defaults to False.
+
+        Returns:
+            Dataset: The target dataset of the last stage.
+
+        Raises:
+            RuntimeError: If a stage or a background write fails.
+        """
+        start = 0
+        if not force:
+            while start < len(self._stages) and self._stages[start].fresh():
+                start += 1
+        if start == len(self._stages):
+            return self._stages[-1].run(force=False)
+        if start > 0:
+            self._logger.debug(f"Skipping {start} stages with fresh targets.")
+
+        stages = self._stages[start:]
+        futures: List[Future] = []
+        cached: List[DataFrame] = []
+        source: Optional[Dataset] = None
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="fused-writer") as writer:
+            try:
+                for i, stage in enumerate(stages):
+                    last = i == len(stages) - 1
+                    source, target = stage.process(source=source, copy=self._persist == "async")
+                    if not last and isinstance(target.dataframe, DataFrame):
+                        # Cached so the writer and the next stage don't each recompute it.
+                        cached.append(target.dataframe.persist())
+
+                    add = self._persist != "skip" or last
+                    futures.append(
+                        writer.submit(stage.publish, source=source, target=target, add=add)
+                    )
+                    if self._persist == "sync" and futures[-1].exception() is not None:
+                        break
+                    source = target
+            finally:
+                # Waits for the writes before releasing the cached Spark results they read.
+                errors = [future.exception() for future in futures]
+                for i, stage in enumerate(stages):
+                    if errors[i] is None:
+                        # Joins datasets the repository itself writes behind.
+                        try:
+                            stage.join()
+                        except Exception as e:
+                            errors[i] = e
+                for dataframe in cached:
+                    dataframe.unpersist()
+
+        for stage, error in zip(stages, errors):
+            if error is not None:
+                msg = f"Error publishing the {stage.stage.label} target dataset: {error}"
+                self._logger.error(msg)
+                raise RuntimeError(msg) from error
+        return futures[-1].result()
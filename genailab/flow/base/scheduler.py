@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/scheduler.py                                                    #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:56:48 pm                                                #
+# Modified   : Monday October 19th 2026 07:00:15 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Task Scheduler Module"""
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Optional
+
+import pandas as pd
+from pyspark.sql import DataFrame
+
+from genailab.flow.base.task import Task
+from genailab.infra.service.spark.lineage import LineageManager
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        TASK SCHEDULER                                            #
+# ------------------------------------------------------------------------------------------------ #
+class TaskScheduler:
+    """Runs the tasks of a stage concurrently where their columns allow it.
+
+    Tasks declaring both `inputs` and `outputs` are column-local: they rewrite or add only their
+    output columns and leave rows untouched. Consecutive column-local tasks form a segment whose
+    tasks are levelled by their column dependencies; a task waits for every earlier task it reads
+    from (read-after-write), writes over (write-after-write) or overwrites the input of
+    (write-after-read). The tasks in a level run concurrently on a worker pool, each on a copy of
+    its own columns, and their output columns are merged back into the dataframe. Tasks that
+    don't declare their columns, such as repair tasks that drop rows, are barriers that run alone
+    on the full dataframe. Spark dataframes are always run sequentially, with the lineage
+    manager truncating their logical plan between tasks.
+
+    Args:
+        max_workers (Optional[int]): Maximum number of workers. Defaults to the CPU count.
+            A value of 1 runs all tasks sequentially.
+        executor (str): Pool type, either "process" or "thread". Defaults to "process".
+        lineage (Optional[LineageManager]): Lineage manager for Spark task chains.
+            Defaults to None.
+    """
+
+    __executors = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        executor: str = "process",
+        lineage: Optional[LineageManager] = None,
+    ) -> None:
+        if executor not in self.__executors:
+            raise ValueError(
+                f"Unsupported executor '{executor}'. Expected one of {list(self.__executors)}."
+            )
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._executor = executor
+        self._lineage = lineage
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def plan(self, tasks: List[Task]) -> List[List[List[Task]]]:
+        """Groups the tasks into segments of concurrently executable levels.
+
+        Args:
+            tasks (List[Task]): The tasks in their declared order.
+
+        Returns:
+            List[List[List[Task]]]: Segments in execution order. Each segment is a list of
+                levels and each level a list of tasks that may run concurrently. A barrier task
+                forms a segment with a single level of its own.
+        """
+        segments: List[List[List[Task]]] = []
+        segment: List[Task] = []
+        for task in tasks:
+            if self._is_local(task):
+                segment.append(task)
+                continue
+            if segment:
+                segments.append(self._level(segment))
+                segment = []
+            segments.append([[task]])
+        if segment:
+            segments.append(self._level(segment))
+        return segments
+
+    def run(self, tasks: List[Task], dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Runs the tasks against the dataframe.
+
+        The result equals that of running the tasks in sequence, including the column order.
+
+        Args:
+            tasks (List[Task]): The tasks in their declared order.
+            dataframe (pd.DataFrame): The input dataframe.
+
+        Returns:
+            pd.DataFrame: The processed dataframe.
+
+        Raises:
+            RuntimeError: If a task fails or a column-local task changes the rows.
+        """
+        if not isinstance(dataframe, pd.DataFrame):
+            return self._run_sequential(tasks=tasks, dataframe=dataframe)
+
+        segments = self.plan(tasks=tasks)
+        if self._max_workers == 1 or all(
+            len(level) == 1 for segment in segments for level in segment
+        ):
+            return self._run_sequential(tasks=tasks, dataframe=dataframe)
+
+        with self.__executors[self._executor](max_workers=self._max_workers) as pool:
+            for segment in segments:
+                columns = list(dataframe.columns)
+                for level in segment:
+                    if len(level) == 1:
+                        dataframe = self._run_task(task=level[0], dataframe=dataframe)
+                    else:
+                        dataframe = self._run_level(level=level, dataframe=dataframe, pool=pool)
+                # Restore the column order a sequential run would produce.
+                for task in (task for level in segment for task in level):
+                    for column in task.outputs or []:
+                        if column not in columns and column in dataframe.columns:
+                            columns.append(column)
+                if len(columns) == len(dataframe.columns):
+                    dataframe = dataframe[columns]
+        return dataframe
+
+    def _run_sequential(self, tasks: List[Task], dataframe: Any) -> Any:
+        """Runs the tasks one after another, controlling the lineage of Spark dataframes."""
+        lineage = self._lineage if isinstance(dataframe, DataFrame) else None
+        if lineage is not None:
+            lineage.reset()
+        for task in tasks:
+            dataframe = self._run_task(task=task, dataframe=dataframe)
+            if lineage is not None:
+                dataframe = lineage.control(dataframe)
+        if lineage is not None:
+            report = lineage.report
+            self._logger.info(
+                f"Lineage: {report['truncations']} truncations, maximum plan depth {report['max_depth']} "
+                f"and width {report['max_width']}, {report['truncation_time']:.1f}s truncating, "
+                f"an estimated {report['analysis_time_saved']:.1f}s of plan analysis saved."
+            )
+        return dataframe
+
+    def _run_level(self, level: List[Task], dataframe: pd.DataFrame, pool: Executor) -> pd.DataFrame:
+        """Runs the tasks of a level concurrently and merges their output columns.
+
+        Args:
+            level (List[Task]): Tasks with no column dependencies between them.
+            dataframe (pd.DataFrame): The input dataframe.
+            pool (Executor): The worker pool.
+
+        Returns:
+            pd.DataFrame: The dataframe with the output columns of all tasks in the level.
+        """
+        self._logger.debug(
+            f"Running {len(level)} tasks concurrently: {', '.join(task.name for task in level)}."
+        )
+        futures = []
+        for task in level:
+            columns = [
+                column
+                for column in dict.fromkeys(task.inputs + task.outputs)
+                if column in dataframe.columns
+            ]
+            futures.append(pool.submit(_run_columns, task, dataframe[columns].copy()))
+
+        dataframe = dataframe.copy()
+        for task, future in zip(level, futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                self._logger.error(f"Error in task {task.__class__.__name__}: {e}")
+                raise RuntimeError(f"Error in task {task.__class__.__name__}: {e}") from e
+            if not result.index.equals(dataframe.index):
+                msg = f"Task {task.__class__.__name__} declares its columns but changed the rows of the dataframe."
+                self._logger.error(msg)
+                raise RuntimeError(msg)
+            for column in task.outputs:
+                dataframe[column] = result[column]
+        return dataframe
+
+    def _run_task(self, task: Task, dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Runs a single task on the full dataframe."""
+        try:
+            return task.run(dataframe)
+        except Exception as e:
+            self._logger.error(f"Error in task {task.__class__.__name__}: {e}")
+            raise RuntimeError(f"Error in task {task.__class__.__name__}: {e}") from e
+
+    @staticmethod
+    def _is_local(task: Task) -> bool:
+        """Returns True if the task declares both the columns it reads and writes."""
+        return task.inputs is not None and task.outputs is not None
+
+    @staticmethod
+    def _level(segment: List[Task]) -> List[List[Task]]:
+        """Assigns the tasks of a segment to levels by their column dependencies."""
+        levels: List[List[Task]] = []
+        depths: List[int] = []
+        for j, task in enumerate(segment):
+            inputs, outputs = set(task.inputs), set(task.outputs)
+            depth = 0
+            for i in range(j):
+                prior_inputs, prior_outputs = set(segment[i].inputs), set(segment[i].outputs)
+                if prior_outputs & (inputs | outputs) or prior_inputs & outputs:
+                    depth = max(depth, depths[i] + 1)
+            depths.append(depth)
+            if depth == len(levels):
+                levels.append([])
+            levels[depth].append(task)
+        return levels
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _run_columns(task: Task, dataframe: pd.DataFrame) -> pd.DataFrame:
+    """Runs a task in a worker and returns only its output columns."""
+    return task.run(dataframe)[task.outputs]
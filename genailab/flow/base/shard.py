@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/shard.py                                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:11:07 pm                                                #
+# Modified   : Monday October 19th 2026 07:11:07 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Shard Executor Module"""
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
+
+import pandas as pd
+
+from genailab.core.dtypes import DFType
+from genailab.core.schema import Schema
+from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.file.fao import FAO
+from genailab.infra.utils.file.fileset import FileFormat
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        SHARD EXECUTOR                                            #
+# ------------------------------------------------------------------------------------------------ #
+class ShardExecutor:
+    """Runs the tasks of a pandas stage independently on each hive partition of its source.
+
+    Each partition directory of the source, such as `category=Games`, is a shard. A worker process
+    reads only its shard through the FAO reader, restores the partition column, runs the tasks
+    and writes its output through the FAO writer. The shard outputs are then gathered into the
+    matching partitions of a single destination directory, ready to be registered with
+    `DatasetRepo.add_file`. Peak memory is bounded by the largest shard rather than the dataset.
+
+    Sharding applies only when every task is `shardable`, i.e. computes each row from that row
+    alone, so the shards together equal a run on the full dataframe up to row order.
+
+    Args:
+        fao (FAO): File access object reading the source and writing the shard outputs.
+        enabled (bool): Whether stages run sharded where possible. Defaults to False.
+        column (str): The partition column. Defaults to "category".
+        max_workers (Optional[int]): Maximum number of worker processes. Defaults to the CPU
+            count. A value of 1 runs the shards one after another in the calling process.
+    """
+
+    def __init__(
+        self,
+        fao: FAO,
+        enabled: bool = False,
+        column: str = "category",
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self._fao = fao
+        self._enabled = enabled
+        self._column = column
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if stages run sharded where possible."""
+        return self._enabled
+
+    @property
+    def column(self) -> str:
+        """Returns the partition column."""
+        return self._column
+
+    def shards(self, filepath: str) -> Dict[str, str]:
+        """Returns the partition directories of a dataset on the partition column.
+
+        Args:
+            filepath (str): Path of the dataset's file or directory.
+
+        Returns:
+            Dict[str, str]: Directories keyed by unescaped partition value. Empty if the dataset
+                is not partitioned on the column.
+        """
+        if not os.path.isdir(filepath):
+            return {}
+        prefix = f"{self._column}="
+        return {
+            unquote(entry.name)[len(prefix):]: entry.path
+            for entry in os.scandir(filepath)
+            if entry.is_dir() and unquote(entry.name).startswith(prefix)
+        }
+
+    def supports(self, tasks: List[Task], filepath: str) -> bool:
+        """Returns True if the tasks can run sharded on the dataset at filepath.
+
+        Args:
+            tasks (List[Task]): The tasks of the stage.
+            filepath (str): Path of the source dataset's file or directory.
+        """
+        return (
+            self._enabled
+            and bool(tasks)
+            and all(task.shardable for task in tasks)
+            and bool(self.shards(filepath=filepath))
+        )
+
+    def run(
+        self,
+        tasks: List[Task],
+        filepath: str,
+        destination: str,
+        schema: Optional[Schema] = None,
+        prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    ) -> int:
+        """Runs the tasks on each shard of the source and gathers the outputs at destination.
+
+        Args:
+            tasks (List[Task]): The tasks in their declared order.
+            filepath (str): Path of the hive-partitioned source directory.
+            destination (str): Directory receiving one partition directory per non-empty shard.
+            schema (Optional[Schema]): Declared schema of the source dataset.
+            prepare (Optional[Callable]): Module-level function applied to each shard before
+                the tasks, such as `Stage._prepare`. It must be picklable.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            RuntimeError: If the processing of a shard fails.
+        """
+        shards = self.shards(filepath=filepath)
+        os.makedirs(destination, exist_ok=True)
+        args = [
+            (self._fao, directory, self._column, value, tasks, schema, prepare,
+             os.path.join(destination, f".shard-{i}"))
+            for i, (value, directory) in enumerate(shards.items())
+        ]
+        max_workers = min(self._max_workers, len(args))
+        self._logger.debug(
+            f"Running {len(tasks)} tasks on {len(args)} shards of {filepath} with {max_workers} workers."
+        )
+
+        rows = 0
+        if max_workers <= 1:
+            for arg in args:
+                rows += self._collect(result=self._run_shard(arg), destination=destination)
+            return rows
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(_run_shard, *arg): arg for arg in args}
+            for future in as_completed(futures):
+                result = self._get_result(future=future, value=futures[future][3])
+                rows += self._collect(result=result, destination=destination)
+        return rows
+
+    def _run_shard(self, arg: tuple) -> Tuple[Optional[str], int]:
+        """Runs a shard in the calling process."""
+        try:
+            return _run_shard(*arg)
+        except Exception as e:
+            msg = f"Error in shard {self._column}={arg[3]}: {e}"
+            self._logger.error(msg)
+            raise RuntimeError(msg) from e
+
+    def _get_result(self, future, value: str) -> Tuple[Optional[str], int]:
+        """Returns the result of a shard submitted to the pool."""
+        try:
+            return future.result()
+        except Exception as e:
+            msg = f"Error in shard {self._column}={value}: {e}"
+            self._logger.error(msg)
+            raise RuntimeError(msg) from e
+
+    def _collect(self, result: Tuple[Optional[str], int], destination: str) -> int:
+        """Moves the partition directories written by a shard into the destination."""
+        outpath, rows = result
+        if outpath is None:
+            return 0
+        for entry in os.scandir(outpath):
+            shutil.move(entry.path, os.path.join(destination, entry.name))
+        shutil.rmtree(outpath, ignore_errors=True)
+        return rows
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _run_shard(
+    fao: FAO,
+    directory: str,
+    column: str,
+    value: str,
+    tasks: List[Task],
+    schema: Optional[Schema],
+    prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+    outpath: str,
+) -> Tuple[Optional[str], int]:
+    """Reads a partition directory, runs the tasks on it and writes the result.
+
+    Module-level so it can be pickled to worker processes.
+
+    Returns:
+        Tuple[Optional[str], int]: The directory holding the shard's output partition, or None if
+            no rows remain, and the number of rows written.
+    """
+    dataframe = fao.read(
+        filepath=directory, dftype=DFType.PANDAS, file_format=FileFormat.PARQUET, schema=schema
+    )
+    # The partition column is encoded in the directory name, not in the files.
+    dtype = schema.dtypes.get(column) if schema is not None and column in schema else None
+    dataframe[column] = pd.Series(value, index=dataframe.index, dtype=dtype)
+
+    if prepare is not None:
+        dataframe = prepare(dataframe)
+    for task in tasks:
+        dataframe = task.run(dataframe)
+
+    if dataframe.empty:
+        return None, 0
+
+    fao.create(
+        filepath=outpath, file_format=FileFormat.PARQUET, dataframe=dataframe, overwrite=False
+    )
+    # Writers not configured to partition on the column write a single file.
+    if os.path.isfile(outpath):
+        partition = os.path.join(f"{outpath}.tmp", os.path.basename(directory))
+        os.makedirs(partition)
+        shutil.move(outpath, os.path.join(partition, "part-0.parquet"))
+        os.rename(f"{outpath}.tmp", outpath)
+    return outpath, len(dataframe)
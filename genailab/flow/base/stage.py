@@ -11,19 +11,25 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 03:43:30 am                                              #
-# Modified   : Thursday January 30th 2025 04:27:12 pm                                              #
+# Modified   : Monday October 19th 2026 08:36:55 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
 # ================================================================================================ #
+import functools
 import inspect
+import json
 import logging
+import shutil
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
 
 import pandas as pd
+import xxhash
 from git import Union
 from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql import functions as F
 
 from genailab.asset.dataset.builder import DatasetBuilder
 from genailab.asset.dataset.config import DatasetConfig
@@ -31,10 +37,22 @@ from genailab.asset.dataset.dataset import Dataset
 from genailab.asset.dataset.identity import DatasetPassport
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.core.schema import SchemaRegistry
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.flow.base.task import Task
 from genailab.infra.exception.object import ObjectNotFoundError
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 from genailab.infra.service.logging.stage import stage_logger
+from genailab.infra.utils.data.convert import (
+    PandasToSparkConverter,
+    SparkToPandasConverter,
+)
+from genailab.infra.utils.file.copy import Copy
+from genailab.infra.utils.file.fileset import FileFormat
 from genailab.infra.utils.visual.print import Printer
 
 # ------------------------------------------------------------------------------------------------ #
@@ -56,6 +74,15 @@ class Stage(ABC):
         repo (DatasetRepo): Repository for dataset storage and management.
         dataset_builder (DatasetBuilder): Builder for creating `Dataset` objects.
         spark (Optional[SparkSession]): Optional Spark session for distributed processing.
+        cache (Optional[StageCache]): Optional content-addressed cache of stage results.
+        scheduler (Optional[TaskScheduler]): Optional scheduler running independent tasks
+            concurrently. Tasks run in sequence if not provided.
+        sharder (Optional[ShardExecutor]): Optional executor running the tasks of pandas stages
+            on each partition of the source in worker processes.
+        governor (Optional[MemoryGovernor]): Optional governor running pandas stages in batches
+            when the source doesn't fit in its memory budget.
+        streamer (Optional[StreamDriver]): Optional driver piping the source of pandas stages
+            from reader to writer one batch at a time.
 
     Attributes:
         _source_config (DatasetConfig): Stores the configuration for the source dataset.
@@ -64,6 +91,11 @@ class Stage(ABC):
         _repo (DatasetRepo): Repository for managing datasets.
         _dataset_builder (DatasetBuilder): Builder for constructing datasets.
         _spark (Optional[SparkSession]): Optional Spark session for distributed data processing.
+        _cache (Optional[StageCache]): Optional content-addressed cache of stage results.
+        _scheduler (TaskScheduler): Scheduler for running the tasks.
+        _sharder (Optional[ShardExecutor]): Executor for sharded runs.
+        _governor (Optional[MemoryGovernor]): Governor for batched runs.
+        _streamer (Optional[StreamDriver]): Driver for streamed runs.
         _source (Optional[Dataset]): Reference to the source dataset.
         _target (Optional[Dataset]): Reference to the target dataset.
         _logger (Logger): Logger instance for the stage.
@@ -77,6 +109,11 @@ class Stage(ABC):
         repo: DatasetRepo,
         dataset_builder: DatasetBuilder,
         spark: Optional[SparkSession] = None,
+        cache: Optional[StageCache] = None,
+        scheduler: Optional[TaskScheduler] = None,
+        sharder: Optional[ShardExecutor] = None,
+        governor: Optional[MemoryGovernor] = None,
+        streamer: Optional[StreamDriver] = None,
     ) -> None:
         self._source_config = source_config
         self._target_config = target_config
@@ -84,6 +121,11 @@ class Stage(ABC):
         self._repo = repo
         self._dataset_builder = dataset_builder
         self._spark = spark
+        self._cache = cache
+        self._scheduler = scheduler or TaskScheduler(max_workers=1)
+        self._sharder = sharder
+        self._governor = governor
+        self._streamer = streamer
 
         self._source: Optional[Dataset] = None
         self._target: Optional[Dataset] = None
@@ -136,13 +178,24 @@ class Stage(ABC):
 
         if self._dataset_exists(config=self._source_config):
             # Check cache if not forcing execution and return if cache is fresh.
-            if self._fresh_cache_exists() and not force:
+            if not force and self._fresh_cache_exists():
                 dataset = self._get_dataset(config=self._target_config)
                 msg = f"Obtained the {self.stage.label} target dataset {dataset.asset_id} from cache."
                 self._logger.debug(msg)
                 msg += "\nTo force execution, run the stage with force=True."
                 printer.print_string(string=msg)
                 return dataset
+            # A previous run with the same source, tasks and code may still be in the stage cache.
+            elif not force and self._stage_cache_hit():
+                dataset = self._restore()
+                msg = f"Restored the {self.stage.label} target dataset {dataset.asset_id} from the stage cache."
+                self._logger.debug(msg)
+                msg += "\nTo force execution, run the stage with force=True."
+                printer.print_string(string=msg)
+                return dataset
+            # If only some task configurations changed, recompute just their columns.
+            elif not force and self._incremental_run_possible():
+                return self._run_incremental()
             else:
                 return self._run()
         else:
@@ -172,6 +225,24 @@ class Stage(ABC):
             self._logger.debug(msg)
             return False
 
+        target_asset_id = self._repo.get_asset_id(
+            phase=self._target_config.phase,
+            stage=self._target_config.stage,
+            name=self._target_config.name,
+        )
+        if not self._repo.verify(asset_id=target_asset_id):
+            msg = f"The target dataset cache for {self.phase.label}/{self.stage.label} failed fingerprint verification."
+            self._logger.debug(msg)
+            return False
+
+        if self._cache is not None:
+            entry = self._get_cache_entry(source_meta=source_meta)
+            target_meta = self._repo.get_meta(asset_id=target_asset_id)
+            if entry is None or entry["fingerprint"] != self._repo.get_fingerprint(dataset=target_meta):
+                msg = f"The target dataset cache for {self.phase.label}/{self.stage.label} was produced by a different source, task configuration, or code version."
+                self._logger.debug(msg)
+                return False
+
         msg = f"The target dataset cache for {self.phase.label}/{self.stage.label} exists in the repository."
         self._logger.debug(msg)
         return True
@@ -183,30 +254,532 @@ class Stage(ABC):
             Dataset: The processed dataset.
         """
         self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        if self._shardable():
+            return self._run_sharded()
+        if self._streamable():
+            return self._run_streamed()
+        if self._batchable():
+            return self._run_batched()
+
         # Remove existing target dataset if it exists.
         self._remove_dataset(config=self._target_config)
 
         # Obtain the source dataset from the repo.
         source = self._get_dataset(config=self._source_config)
-        dataframe = source.dataframe
+        dataframe = self._transform(source.dataframe)
+
+        return self._save(source=source, dataframe=dataframe)
 
-        for task in self._tasks:
-            try:
-                dataframe = task.run(dataframe)
-            except Exception as e:
-                self._logger.error(f"Error in task {task.__class__.__name__}: {e}")
-                raise RuntimeError(f"Error in task {task.__class__.__name__}: {e}")
+    def _transform(
+        self, dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]
+    ) -> Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]:
+        """Prepares the dataframe and runs the stage tasks on it."""
+        return self._scheduler.run(tasks=self._tasks, dataframe=self._prepare(dataframe))
+
+    @staticmethod
+    def _prepare(
+        dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]
+    ) -> Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]:
+        """Prepares the source dataframe before the tasks run. Returns it unchanged by default.
+
+        Static so that sharded runs can send it to worker processes.
+        """
+        return dataframe
+
+    def _row_local(self) -> bool:
+        """Returns True if source and target are pandas Parquet datasets and all tasks are row-local.
+
+        Such stages can run on any split of their source rows without loading it as a whole. Tasks
+        declare this with `Task.row_local`; declaring their columns is not enough.
+        """
+        return all(
+            config.dftype == DFType.PANDAS and config.file_format == FileFormat.PARQUET
+            for config in (self._source_config, self._target_config)
+        ) and all(task.row_local for task in self._tasks)
+
+    def _shardable(self) -> bool:
+        """Checks if the stage can run sharded on the partitions of its source.
+
+        Returns:
+            bool: True if a sharder is enabled, the stage is row-local and the source is
+                partitioned on the shard column.
+        """
+        if self._sharder is None or not self._sharder.enabled or not self._row_local():
+            return False
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        filepath = getattr(source_meta.file, "path", None)
+        return filepath is not None and self._sharder.supports(tasks=self._tasks, filepath=filepath)
+
+    def _streamable(self) -> bool:
+        """Checks if the stage can pipe its source from reader to writer batch by batch.
+
+        Returns:
+            bool: True if a stream driver is enabled, the stage is row-local and all its tasks
+                are streamable.
+        """
+        if self._streamer is None or not self._streamer.supports(tasks=self._tasks):
+            return False
+        if not self._row_local():
+            return False
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        return getattr(source_meta.file, "path", None) is not None
+
+    def _batchable(self) -> bool:
+        """Checks if the stage must run in batches to stay within the memory budget.
+
+        Returns:
+            bool: True if a memory governor is enabled, the stage is row-local and the source
+                doesn't fit in the budget.
+        """
+        if self._governor is None or not self._governor.enabled or not self._row_local():
+            return False
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        file = source_meta.file
+        if file is None or not file.num_rows:
+            return False
+        return not self._governor.fits(
+            filepath=file.path,
+            num_rows=file.num_rows,
+            schema=SchemaRegistry().get(phase=source_meta.phase, stage=source_meta.stage),
+        )
+
+    def _run_sharded(self) -> Dataset:
+        """Runs the tasks on each partition of the source and registers the combined target.
+
+        Each shard is read, processed and written to the matching partition of the target by a
+        worker process.
+
+        Returns:
+            Dataset: The target dataset. Its dataframe is not loaded.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        return self._run_staged(
+            write=lambda source, staging: self._sharder.run(
+                tasks=self._tasks,
+                filepath=source.file.path,
+                destination=staging,
+                schema=SchemaRegistry().get(phase=source.phase, stage=source.stage),
+                prepare=self._prepare,
+            )
+        )
 
+    def _run_streamed(self) -> Dataset:
+        """Pipes the source through the tasks' `run_batch` from reader to writer.
+
+        Reads and writes overlap with compute, and memory stays constant.
+
+        Returns:
+            Dataset: The target dataset. Its dataframe is not loaded.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        return self._run_staged(
+            write=lambda source, staging: self._streamer.run(
+                tasks=self._tasks,
+                filepath=source.file.path,
+                destination=staging,
+                schema=SchemaRegistry().get(phase=source.phase, stage=source.stage),
+                prepare=self._prepare,
+            )
+        )
+
+    def _run_batched(self) -> Dataset:
+        """Runs the tasks on batches of the source sized to the memory budget.
+
+        Each batch is streamed from the source, processed and spilled to the target's files.
+
+        Returns:
+            Dataset: The target dataset. Its dataframe is not loaded.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        return self._run_staged(
+            write=lambda source, staging: self._governor.run(
+                filepath=source.file.path,
+                destination=staging,
+                transform=self._transform,
+                schema=SchemaRegistry().get(phase=source.phase, stage=source.stage),
+            )
+        )
+
+    def _run_staged(self, write: Callable[[Dataset, str], int]) -> Dataset:
+        """Writes the target's files to a staging area and registers the target.
+
+        The source is never loaded as a whole. The target is registered with
+        `DatasetRepo.add_file`, without loading its dataframe.
+
+        Args:
+            write (Callable[[Dataset, str], int]): Writes the target's files for the source
+                dataset's metadata into the staging directory, returning the number of rows.
+
+        Returns:
+            Dataset: The target dataset. Its dataframe is not loaded.
+        """
+        self._remove_dataset(config=self._target_config)
+
+        source = self._get_dataset(config=self._source_config, meta_only=True)
+        target = self._create_dataset(
+            source=source.passport, config=self._target_config, dataframe=pd.DataFrame()
+        )
+        # The files are gathered in a staging area within the repository and moved into place.
+        staging = Path(self._repo.location) / ".staging" / target.asset_id
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            rows = write(source, str(staging))
+            target = self._repo.add_file(
+                dataset=target, filepath=str(staging), entity=self.__class__.__name__
+            )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        self._logger.debug(f"Wrote {rows} rows of dataset {target.asset_id}.")
+
+        if self._cache is not None:
+            self._put_cache(source=source, target=target)
+        return self.publish(source=source, target=target, add=False)
+
+    def _stage_cache_hit(self) -> bool:
+        """Checks if the stage cache holds a result for the current source, tasks and code.
+
+        Returns:
+            bool: True if a cached result exists, False otherwise.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        if self._cache is None:
+            return False
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        key = self._get_cache_key(source_meta=source_meta)
+        return key is not None and self._cache.exists(key=key)
+
+    def _restore(self) -> Dataset:
+        """Restores the target dataset from the stage cache.
+
+        The cache entry's files are snapshotted into the repository and registered with
+        `DatasetRepo.add_file`, so the data is neither read nor rewritten and the target shares
+        storage with the entry where the filesystem allows.
+
+        Returns:
+            Dataset: The restored dataset. Its dataframe is not loaded.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        self._remove_dataset(config=self._target_config)
+
+        source = self._get_dataset(config=self._source_config, meta_only=True)
+        key = self._get_cache_key(source_meta=source)
+        entry = self._cache.get_entry(key=key)
+        target = self._create_dataset(
+            source=source.passport, config=self._target_config, dataframe=pd.DataFrame()
+        )
+        staging = Path(self._repo.location) / ".staging" / target.asset_id
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            Copy().snapshot(source=entry["path"], target=str(staging))
+            target = self._repo.add_file(
+                dataset=target, filepath=str(staging), entity=self.__class__.__name__
+            )
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        # The entry is re-pointed at the new target rather than replaced.
+        self._cache.update(key=key, fingerprint=self._repo.get_fingerprint(dataset=target))
+        return self.publish(source=source, target=target, add=False)
+
+    def _save(
+        self,
+        source: Dataset,
+        dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame],
+        cache: bool = True,
+    ) -> Dataset:
+        """Adds the target dataset to the repository, records it in the stage cache and marks the
+        source as consumed.
+
+        Args:
+            source (Dataset): The source dataset.
+            dataframe (Union[pd.DataFrame, DataFrame]): The target dataframe.
+            cache (bool): Whether to add the target to the stage cache. Default is True.
+
+        Returns:
+            Dataset: The target dataset.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        target = self._create_dataset(
+            source=source.passport, config=self._target_config, dataframe=dataframe
+        )
+        return self.publish(source=source, target=target, cache=cache)
+
+    def fresh(self) -> bool:
+        """Returns True if the source exists and the target in the repository is up to date."""
+        return self._dataset_exists(config=self._source_config) and self._fresh_cache_exists()
+
+    @stage_logger
+    def process(self, source: Optional[Dataset] = None, copy: bool = False) -> Tuple[Dataset, Dataset]:
+        """Runs the stage tasks without persisting the result.
+
+        Used by fused runs that keep the dataframe in memory between stages. The source
+        dataframe is converted to the stage's dataframe type if needed.
+
+        Args:
+            source (Optional[Dataset]): The source dataset held in memory. If not provided, it
+                is read from the repository.
+            copy (bool): Whether to run the tasks on a copy of a pandas source dataframe, leaving
+                the source untouched by tasks that modify their input in place. Default is False.
+
+        Returns:
+            Tuple[Dataset, Dataset]: The source and the unpersisted target dataset. Pass both to
+                `publish` to persist the target.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        if source is None:
+            source = self._get_dataset(config=self._source_config)
+        dataframe = self._convert(dataframe=source.dataframe, dftype=self._source_config.dftype)
+        if copy and dataframe is source.dataframe and isinstance(dataframe, pd.DataFrame):
+            dataframe = dataframe.copy()
+        dataframe = self._transform(dataframe)
         target = self._create_dataset(
             source=source.passport, config=self._target_config, dataframe=dataframe
         )
-        target = self._repo.add(dataset=target, entity=self.__class__.__name__)
+        return source, target
+
+    def publish(self, source: Dataset, target: Dataset, cache: bool = True, add: bool = True) -> Dataset:
+        """Adds the target dataset to the repository, records it in the stage cache and marks the
+        source as consumed.
+
+        Args:
+            source (Dataset): The source dataset.
+            target (Dataset): The target dataset.
+            cache (bool): Whether to add the target to the stage cache. Default is True.
+            add (bool): Whether to add the target to the repository. If False, only the source
+                is marked as consumed. Default is True.
+
+        Returns:
+            Dataset: The target dataset.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        if add:
+            self._remove_dataset(config=self._target_config)
+            cache = cache and self._cache is not None
+            if self._repo.write_behind:
+                # The target is written in the background and served from memory until then.
+                handle = self._repo.add_async(
+                    dataset=target,
+                    entity=self.__class__.__name__,
+                    on_registered=functools.partial(self._put_cache, source) if cache else None,
+                )
+                target = handle.dataset
+            else:
+                target = self._repo.add(dataset=target, entity=self.__class__.__name__)
+                if cache:
+                    self._put_cache(source=source, target=target)
 
-        source.consume(entity=self.__class__.__name__)
-        self._repo.update(dataset=source)
+        # Sources held only in memory by a fused run are not in the repository.
+        if self._repo.exists(asset_id=source.asset_id):
+            source.consume(entity=self.__class__.__name__)
+            self._repo.update(dataset=source)
 
         return target
 
+    def join(self) -> None:
+        """Waits for the repository's background writes, raising the first failure."""
+        self._repo.join()
+
+    def _put_cache(self, source: Dataset, target: Dataset) -> None:
+        """Records the persisted target in the stage cache."""
+        metadata = self._get_cache_metadata(source_meta=source)
+        if metadata is not None:
+            self._cache.put(
+                key=StageCache.get_key(**metadata),
+                filepath=target.file.path,
+                file_format=target.passport.file_format,
+                fingerprint=self._repo.get_fingerprint(dataset=target),
+                metadata=metadata,
+            )
+
+    def _convert(
+        self, dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame], dftype: DFType
+    ) -> Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]:
+        """Converts an in-memory dataframe to the given dataframe type."""
+        if dftype == DFType.PANDAS and isinstance(dataframe, DataFrame):
+            return SparkToPandasConverter().to_pandas(sdf=dataframe)
+        if dftype in (DFType.SPARK, DFType.SPARKNLP) and not isinstance(dataframe, DataFrame):
+            return PandasToSparkConverter().to_spark(pdf=dataframe, spark=self._spark)
+        return dataframe
+
+    def _incremental_run_possible(self) -> bool:
+        """Checks if the stage can be re-run incrementally from a cached result.
+
+        An incremental run is possible when the stage cache holds a result for the same source
+        and code whose task list differs from the current one only in the configuration of
+        some tasks, every task in the stage is additive, and every changed task reads only
+        columns of the source dataset.
+
+        Returns:
+            bool: True if an incremental run is possible, False otherwise.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        if self._cache is None:
+            return False
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        return self._get_incremental_base(source_meta=source_meta) is not None
+
+    def _run_incremental(self) -> Dataset:
+        """Recomputes the columns of the changed tasks and splices them into the cached result.
+
+        Returns:
+            Dataset: The processed dataset.
+        """
+        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
+        source_meta = self._get_dataset(config=self._source_config, meta_only=True)
+        entry, changed = self._get_incremental_base(source_meta=source_meta)
+
+        source = self._get_dataset(config=self._source_config)
+        if not self._ids_unique(dataframe=source.dataframe):
+            self._logger.debug("Source ids are not unique. Running all tasks.")
+            return self._run()
+
+        msg = f"Re-running {len(changed)} of {len(self._tasks)} tasks with changed configurations: {', '.join(task.name for task in changed)}."
+        self._logger.debug(msg)
+        printer.print_string(string=msg)
+
+        self._remove_dataset(config=self._target_config)
+
+        # The tasks see the source as a full run prepares it.
+        dataframe = self._prepare(source.dataframe)
+        dataframe = self._scheduler.run(tasks=changed, dataframe=dataframe)
+
+        base = self._cache.read(
+            key=entry["key"], dftype=self._target_config.dftype, spark=self._spark
+        )
+        dataframe = self._splice(
+            base=base,
+            dataframe=dataframe,
+            columns=[task.new_column for task in changed],
+        )
+        return self._save(source=source, dataframe=dataframe)
+
+    def _get_incremental_base(self, source_meta: Dataset) -> Optional[tuple]:
+        """Finds a cached result from which the stage can be re-run incrementally.
+
+        Args:
+            source_meta (Dataset): The source dataset metadata.
+
+        Returns:
+            Optional[tuple]: The stage cache entry and the list of changed tasks, or None.
+        """
+        metadata = self._get_cache_metadata(source_meta=source_meta)
+        if metadata is None or not all(task.additive for task in self._tasks):
+            return None
+        entry = self._cache.find(
+            source_fingerprint=metadata["source_fingerprint"],
+            code_version=metadata["code_version"],
+        )
+        if entry is None:
+            return None
+
+        previous = entry["metadata"]["task_configs"]
+        current = metadata["task_configs"]
+        if len(previous) != len(current):
+            return None
+
+        source_columns = set(self._repo.get_columns(asset_id=source_meta.asset_id))
+        changed = []
+        for task, old, new in zip(self._tasks, previous, current):
+            if (old.get("module"), old.get("class_name")) != (new.get("module"), new.get("class_name")):
+                return None
+            if old == new:
+                continue
+            columns = task.column if isinstance(task.column, list) else [task.column]
+            if not columns or not set(columns) <= source_columns:
+                return None
+            changed.append(task)
+        return (entry, changed) if changed else None
+
+    def _ids_unique(
+        self, dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]
+    ) -> bool:
+        """Returns True if the dataframe has an `id` column with unique values."""
+        if "id" not in dataframe.columns:
+            return False
+        if isinstance(dataframe, DataFrame):
+            return dataframe.groupBy("id").count().filter(F.col("count") > 1).limit(1).count() == 0
+        return dataframe["id"].is_unique
+
+    def _splice(
+        self,
+        base: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame],
+        dataframe: Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame],
+        columns: List[str],
+    ) -> Union[pd.DataFrame, pd.core.frame.DataFrame, DataFrame]:
+        """Replaces columns of the cached result with recomputed ones, joined by `id`.
+
+        Args:
+            base (Union[pd.DataFrame, DataFrame]): The cached stage result.
+            dataframe (Union[pd.DataFrame, DataFrame]): The source with recomputed columns.
+            columns (List[str]): The recomputed columns.
+
+        Returns:
+            Union[pd.DataFrame, DataFrame]: The cached result with the columns replaced, in the
+                original column order.
+        """
+        order = list(base.columns) + [c for c in columns if c not in base.columns]
+        if isinstance(base, DataFrame):
+            delta = dataframe.select("id", *columns)
+            return base.drop(*columns).join(delta, on="id", how="left").select(*order)
+        delta = dataframe[["id"] + columns]
+        return base.drop(columns=columns, errors="ignore").merge(delta, on="id", how="left")[order]
+
+    def _get_cache_entry(self, source_meta: Dataset) -> Optional[dict]:
+        """Returns the stage cache entry for the current source, tasks and code, if any."""
+        key = self._get_cache_key(source_meta=source_meta)
+        return self._cache.get_entry(key=key) if key is not None else None
+
+    def _get_cache_key(self, source_meta: Dataset) -> Optional[str]:
+        """Computes the stage cache key for the current source, tasks and code.
+
+        Returns:
+            Optional[str]: The cache key, or None if the source has no fingerprint.
+        """
+        metadata = self._get_cache_metadata(source_meta=source_meta)
+        return StageCache.get_key(**metadata) if metadata is not None else None
+
+    def _get_cache_metadata(self, source_meta: Dataset) -> Optional[dict]:
+        """Returns the source fingerprint, task configurations and code version of a run.
+
+        The source is identified by the content fingerprint of its files, which the repository
+        computes once per dataset. Values are normalized through JSON so they compare equal to
+        those stored in the cache.
+
+        Returns:
+            Optional[dict]: The metadata, or None if the source has no fingerprint.
+        """
+        source_fingerprint = self._repo.get_fingerprint(dataset=source_meta)
+        if source_fingerprint is None:
+            return None
+        task_configs = [
+            task.config
+            or {"module": task.__class__.__module__, "class_name": task.name}
+            for task in self._tasks
+        ]
+        return json.loads(
+            json.dumps(
+                {
+                    "source_fingerprint": source_fingerprint,
+                    "task_configs": task_configs,
+                    "code_version": self._get_code_version(),
+                },
+                default=str,
+            )
+        )
+
+    def _get_code_version(self) -> str:
+        """Fingerprints the source files defining the stage, its tasks, and their base classes."""
+        filepaths = set()
+        for obj in [self] + self._tasks:
+            for cls in obj.__class__.__mro__:
+                if cls.__module__.startswith("genailab") and inspect.getsourcefile(cls):
+                    filepaths.add(inspect.getsourcefile(cls))
+        hasher = xxhash.xxh3_128()
+        for filepath in sorted(filepaths):
+            with open(filepath, "rb") as file:
+                hasher.update(file.read())
+        return hasher.hexdigest()
+
     def _create_dataset(
         self,
         config: DatasetConfig,
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/flow/base/stream.py                                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:17:43 pm                                                #
+# Modified   : Monday October 19th 2026 07:59:17 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Stream Driver Module"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterator, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from genailab.core.schema import Schema
+from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.fao import FAO
+from genailab.infra.persist.repo.file.layout import ParquetLayout
+from genailab.infra.utils.file.fileset import FileFormat
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        STREAM DRIVER                                             #
+# ------------------------------------------------------------------------------------------------ #
+class StreamDriver:
+    """Pipes a pandas stage's source from reader to writer one batch at a time.
+
+    Batches are read from the source through `FAO.iter_batches` on a reader thread, run through
+    the `run_batch` method of each task on the calling thread, and spilled through the FAO writer
+    on a writer thread, so reads and writes overlap with compute. At most `prefetch` batches are
+    read ahead and `prefetch` written behind, so memory stays constant however large the source.
+    The spilled files are merged into the partitions of a single destination directory and
+    compacted into files sized by the layout, ready to be registered with `DatasetRepo.add_file`.
+
+    Streaming applies only when every task is `streamable`, i.e. implements `run_batch`.
+
+    Args:
+        fao (FAO): File access object reading the source and writing the batches.
+        enabled (bool): Whether stages whose tasks are all streamable run streamed.
+            Defaults to False.
+        batch_size (int): Maximum number of rows per batch. Defaults to 131072.
+        prefetch (int): Number of batches read ahead and written behind. Defaults to 2.
+        layout (Optional[ParquetLayout]): Sizes and sorts the compacted files. Defaults to the
+            default ParquetLayout.
+        encoding (Optional[ParquetEncoding]): Chooses the compression and encodings of the
+            compacted files. If None, pyarrow's defaults apply.
+    """
+
+    def __init__(
+        self,
+        fao: FAO,
+        enabled: bool = False,
+        batch_size: int = 131072,
+        prefetch: int = 2,
+        layout: Optional[ParquetLayout] = None,
+        encoding: Optional[ParquetEncoding] = None,
+    ) -> None:
+        self._fao = fao
+        self._enabled = enabled
+        self._batch_size = batch_size
+        self._prefetch = max(prefetch, 1)
+        self._layout = layout or ParquetLayout()
+        self._encoding = encoding
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def enabled(self) -> bool:
+        """Returns True if stages whose tasks are all streamable run streamed."""
+        return self._enabled
+
+    def supports(self, tasks: List[Task]) -> bool:
+        """Returns True if the tasks can run streamed."""
+        return self._enabled and bool(tasks) and all(task.streamable for task in tasks)
+
+    def run(
+        self,
+        tasks: List[Task],
+        filepath: str,
+        destination: str,
+        schema: Optional[Schema] = None,
+        prepare: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> int:
+        """Streams the source through the tasks and spills the results to destination.
+
+        Args:
+            tasks (List[Task]): The streamable tasks in their declared order.
+            filepath (str): Path of the source dataset's file or directory.
+            destination (str): Directory receiving the merged results.
+            schema (Optional[Schema]): Declared schema of the source dataset.
+            prepare (Optional[Callable]): Applied to each batch before the tasks.
+            columns (Optional[List[str]]): Columns to read. Defaults to all columns.
+
+        Returns:
+            int: The number of rows written.
+
+        Raises:
+            RuntimeError: If a task fails on a batch.
+        """
+        os.makedirs(destination, exist_ok=True)
+        batches = self._fao.iter_batches(
+            filepath=filepath, schema=schema, batch_size=self._batch_size, columns=columns
+        )
+        rows = 0
+        index = 0
+        pending: Deque[Future] = deque()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-writer") as writer:
+            try:
+                for batch in self._read_ahead(batches=batches):
+                    if prepare is not None:
+                        batch = prepare(batch)
+                    for task in tasks:
+                        batch = self._run_batch(task=task, batch=batch, index=index)
+                    if len(batch):
+                        pending.append(
+                            writer.submit(
+                                spill, fao=self._fao, dataframe=batch, index=index, destination=destination
+                            )
+                        )
+                        rows += len(batch)
+                    index += 1
+                    # Bound the batches held in memory by the writer.
+                    while len(pending) > self._prefetch:
+                        pending.popleft().result()
+            finally:
+                while pending:
+                    pending.popleft().result()
+        compact(destination=destination, layout=self._layout, encoding=self._encoding)
+        self._logger.debug(f"Streamed {rows} rows of {filepath} in {index} batches.")
+        return rows
+
+    def _run_batch(self, task: Task, batch: pd.DataFrame, index: int) -> pd.DataFrame:
+        """Runs a task on a batch."""
+        try:
+            return task.run_batch(batch)
+        except Exception as e:
+            msg = f"Error in task {task.__class__.__name__} on batch {index}: {e}"
+            self._logger.error(msg)
+            raise RuntimeError(msg) from e
+
+    def _read_ahead(self, batches: Iterator[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+        """Reads up to `prefetch` batches ahead of the consumer on a reader thread."""
+        buffer: queue.Queue = queue.Queue(maxsize=self._prefetch)
+        stop = threading.Event()
+
+        def put(item: tuple) -> bool:
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def read() -> None:
+            try:
+                for batch in batches:
+                    if not put(("batch", batch)):
+                        return
+                put(("done", None))
+            except Exception as e:
+                put(("error", e))
+
+        reader = threading.Thread(target=read, name="stream-reader", daemon=True)
+        reader.start()
+        try:
+            while True:
+                kind, item = buffer.get()
+                if kind == "done":
+                    return
+                if kind == "error":
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            reader.join()
+
+
+# ------------------------------------------------------------------------------------------------ #
+def spill(fao: FAO, dataframe: pd.DataFrame, index: int, destination: str) -> None:
+    """Writes a processed batch and merges its files into the destination's partitions.
+
+    File names are prefixed with the batch number so the rows are read back in batch order.
+
+    Args:
+        fao (FAO): File access object writing the batch.
+        dataframe (pd.DataFrame): The batch.
+        index (int): The batch number.
+        destination (str): Directory receiving the merged batches.
+    """
+    outpath = os.path.join(destination, f".batch-{index:05d}")
+    fao.create(filepath=outpath, file_format=FileFormat.PARQUET, dataframe=dataframe, overwrite=False)
+    if os.path.isfile(outpath):
+        shutil.move(outpath, os.path.join(destination, f"part-{index:05d}.parquet"))
+        return
+    for root, _, files in os.walk(outpath):
+        partition = os.path.join(destination, os.path.relpath(root, outpath))
+        os.makedirs(partition, exist_ok=True)
+        for file in files:
+            shutil.move(os.path.join(root, file), os.path.join(partition, f"batch-{index:05d}-{file}"))
+    shutil.rmtree(outpath, ignore_errors=True)
+
+
+# ------------------------------------------------------------------------------------------------ #
+def compact(
+    destination: str,
+    layout: ParquetLayout,
+    encoding: Optional[ParquetEncoding] = None,
+    max_rows: Optional[int] = None,
+) -> None:
+    """Rewrites the spilled files of each partition of the destination into files sized by the layout.
+
+    Spilling leaves a file per batch and partition. Each partition's files are read back in batch
+    order and rewritten into files of the layout's target file size, each sorted by the layout's
+    sort columns and written in row groups of its target row group size. The rewritten files
+    replace the spilled ones once all are written.
+
+    Args:
+        destination (str): Directory holding the spilled batches.
+        layout (ParquetLayout): Plans the size and row order of the compacted files.
+        encoding (Optional[ParquetEncoding]): Plans the compression and encodings of the
+            compacted files.
+        max_rows (Optional[int]): Maximum number of rows held in memory, which caps the rows
+            per file. Defaults to the layout's rows per file.
+    """
+    for directory, _, names in os.walk(destination):
+        spilled = [
+            os.path.join(directory, name)
+            for name in sorted(names)
+            if name.endswith(".parquet") and not name.startswith((".", "_"))
+        ]
+        if len(spilled) > 1:
+            _compact_partition(
+                directory=directory, spilled=spilled, layout=layout, encoding=encoding, max_rows=max_rows
+            )
+
+
+def _compact_partition(
+    directory: str,
+    spilled: List[str],
+    layout: ParquetLayout,
+    encoding: Optional[ParquetEncoding],
+    max_rows: Optional[int],
+) -> None:
+    """Rewrites the spilled files of one partition in order, one file of buffered rows at a time."""
+    compacted: List[str] = []
+    buffer: List[pa.Table] = []
+    buffered = 0
+    rows_per_file = 0
+    options: dict = {}
+
+    def write(table: pa.Table) -> None:
+        path = os.path.join(directory, f".compact-{len(compacted):05d}.parquet")
+        pq.write_table(layout.sort_arrow(table), path, **options)
+        compacted.append(path)
+
+    for path in spilled:
+        for batch in pq.ParquetFile(path).iter_batches():
+            if not options:
+                plan = layout.plan_arrow(batch=batch)
+                rows_per_file = min(plan["max_rows_per_file"], max_rows or plan["max_rows_per_file"])
+                options = {
+                    "row_group_size": plan["max_rows_per_group"],
+                    "write_page_index": layout.page_index,
+                }
+                if encoding is not None:
+                    options.update(encoding.plan_arrow(schema=batch.schema))
+            buffer.append(pa.Table.from_batches([batch]))
+            buffered += batch.num_rows
+            while buffered >= rows_per_file:
+                table = pa.concat_tables(buffer, promote_options="default")
+                write(table.slice(0, rows_per_file))
+                buffer = [table.slice(rows_per_file)]
+                buffered -= rows_per_file
+    if buffered:
+        write(pa.concat_tables(buffer, promote_options="default"))
+
+    for path in spilled:
+        os.remove(path)
+    for i, path in enumerate(compacted):
+        os.replace(path, os.path.join(directory, f"part-{i:05d}.parquet"))
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:33:59 am                                              #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 07:45:14 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -19,10 +19,11 @@
 """Abstract Base Classes for Task classes """
 from __future__ import annotations
 
+import copy
 import importlib
 import logging
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List, Optional
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -64,6 +65,145 @@ class Task(ABC):
         """
         return self.__class__.__name__
 
+    @property
+    def config(self) -> Optional[dict]:
+        """
+        Returns the configuration the task was built from.
+
+        Returns:
+        --------
+        Optional[dict]
+            The task configuration, or None if the task was not built by the TaskBuilder.
+        """
+        return getattr(self, "_config", None)
+
+    @config.setter
+    def config(self, config: dict) -> None:
+        self._config = config
+
+    @property
+    def additive(self) -> bool:
+        """
+        Indicates whether the task only adds a column to its input.
+
+        Additive tasks read the columns named by `column`, add `new_column`, and leave all other
+        rows and columns unchanged. Stages use this to recompute a single task's column
+        without re-running the others.
+
+        Returns:
+        --------
+        bool
+            True if the task is additive, False otherwise.
+        """
+        return False
+
+    @property
+    def inputs(self) -> Optional[List[str]]:
+        """
+        Returns the columns the task reads.
+
+        Additive tasks read the columns named by `column`. Other tasks read unknown columns
+        unless they override this property.
+
+        Returns:
+        --------
+        Optional[List[str]]
+            The columns read by the task, or None if they are not known.
+        """
+        if not self.additive:
+            return None
+        column = getattr(self, "column", None)
+        return list(column) if isinstance(column, (list, tuple)) else [column]
+
+    @property
+    def outputs(self) -> Optional[List[str]]:
+        """
+        Returns the columns the task writes.
+
+        A task with declared outputs changes nothing but those columns: it neither adds, drops
+        nor reorders rows. The TaskScheduler runs tasks with declared inputs and outputs
+        concurrently when their columns don't overlap. Additive tasks write `new_column`.
+
+        Returns:
+        --------
+        Optional[List[str]]
+            The columns written by the task, or None if the task may change any column or row.
+        """
+        return [getattr(self, "new_column")] if self.additive else None
+
+    @property
+    def row_local(self) -> bool:
+        """
+        Indicates whether the task computes each row from that row alone.
+
+        Row-local tasks neither compare rows nor aggregate over them, so running them on any split
+        of their input and combining the results equals running them on the whole input.
+        Declaring columns doesn't make a task row-local: a duplicate detector only adds a column,
+        yet depends on every other row. Tasks opt in by overriding this property; tasks
+        implementing `run_batch` are row-local by contract.
+
+        Returns:
+        --------
+        bool
+            True if the task is row-local, False otherwise.
+        """
+        return self.streamable
+
+    @property
+    def shardable(self) -> bool:
+        """
+        Indicates whether the task can run independently on each partition of its input.
+
+        The ShardExecutor runs a stage sharded only if all its tasks are shardable. Only
+        row-local tasks are shardable.
+
+        Returns:
+        --------
+        bool
+            True if the task is shardable, False otherwise.
+        """
+        return self.row_local
+
+    @property
+    def streamable(self) -> bool:
+        """
+        Indicates whether the task can process its input one batch of rows at a time.
+
+        Tasks are streamable if they implement `run_batch`. The StreamDriver runs a stage
+        streamed only if all its tasks are streamable.
+
+        Returns:
+        --------
+        bool
+            True if the task is streamable, False otherwise.
+        """
+        return type(self).run_batch is not Task.run_batch
+
+    def run_batch(self, batch: Any) -> Any:
+        """
+        Processes one batch of rows of a streamed input.
+
+        Implemented by row-local tasks, which compute each row from that row alone, so that
+        running them batch by batch equals running them on the whole input. Unlike `run`, it is
+        called once per batch and does not log each call.
+
+        Parameters:
+        -----------
+        batch : Any
+            A batch of rows of the input data.
+
+        Returns:
+        --------
+        Any
+            The processed batch.
+
+        Raises:
+        -------
+        NotImplementedError
+            If the task does not support streaming.
+        """
+        raise NotImplementedError(f"{self.name} does not support streaming.")
+
     @abstractmethod
     def run(self, *args, data: Any, **kwargs) -> Any:
         """
@@ -126,11 +266,14 @@ class TaskBuilder:
         module = task_config["module"]
         class_name = task_config["class_name"]
         params = task_config["params"]
-        return self.instantiate_class(
+        task = self.instantiate_class(
             module=module,
             class_name=class_name,
             params=params,
         )
+        # Record a copy of the configuration; stage builders mutate the config dicts they hold.
+        task.config = copy.deepcopy(task_config)
+        return task
 
     # ------------------------------------------------------------------------------------------------ #
     def instantiate_class(
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:30:48 am                                              #
-# Modified   : Tuesday January 28th 2025 06:23:45 am                                               #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -24,8 +24,13 @@ from genailab.asset.dataset.config import DatasetConfig
 from genailab.asset.dataset.dataset import Dataset
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.flow.base.stage import Stage
 from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 from pyspark.sql import SparkSession
 
@@ -59,6 +64,11 @@ class DataCleaningStage(Stage):
             constructing the dataset.
         spark (Optional[SparkSession]): An optional Spark session to be used
             for Spark operations. Defaults to None.
+        cache (Optional[StageCache]): Optional content-addressed cache of stage results.
+        scheduler (Optional[TaskScheduler]): Optional scheduler running independent tasks concurrently.
+        sharder (Optional[ShardExecutor]): Optional executor running the tasks on each source partition.
+        governor (Optional[MemoryGovernor]): Optional governor running the stage in batches within a memory budget.
+        streamer (Optional[StreamDriver]): Optional driver piping the source from reader to writer in batches.
     """
 
     __PHASE = PhaseDef.DATAPREP
@@ -73,6 +83,11 @@ class DataCleaningStage(Stage):
         repo: DatasetRepo,
         dataset_builder: DatasetBuilder,
         spark: Optional[SparkSession] = None,
+        cache: Optional[StageCache] = None,
+        scheduler: Optional[TaskScheduler] = None,
+        sharder: Optional[ShardExecutor] = None,
+        governor: Optional[MemoryGovernor] = None,
+        streamer: Optional[StreamDriver] = None,
     ) -> None:
         super().__init__(
             source_config=source_config,
@@ -81,6 +96,11 @@ class DataCleaningStage(Stage):
             repo=repo,
             dataset_builder=dataset_builder,
             spark=spark,
+            cache=cache,
+            scheduler=scheduler,
+            sharder=sharder,
+            governor=governor,
+            streamer=streamer,
         )
 
     @property
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:01:45 am                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:30:05 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -329,7 +329,7 @@ class DataQualityAssessmentStageBuilder(StageBuilder):
         self._validate(strict=strict)
 
         # Obtain a spark session
-        self._spark = self._get_spark(dftype=self.dftype)
+        self._spark = self._get_spark(dftype=self.dftype, source_config=source_config)
 
         stage = DataQualityAssessmentStage(
             source_config=source_config or self._source_config,
@@ -338,6 +338,11 @@ class DataQualityAssessmentStageBuilder(StageBuilder):
             repo=self._repo,
             dataset_builder=self._dataset_builder,
             spark=self._spark,
+            cache=self._stage_cache,
+            scheduler=self._scheduler,
+            sharder=self._sharder,
+            governor=self._governor,
+            streamer=self._streamer,
         )
         self.reset()
         return stage
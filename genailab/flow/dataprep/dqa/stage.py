@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:30:48 am                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -23,8 +23,13 @@ from genailab.asset.dataset.builder import DatasetBuilder
 from genailab.asset.dataset.config import DatasetConfig
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.flow.base.stage import Stage
 from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 from pyspark.sql import SparkSession
 
@@ -47,6 +52,11 @@ class DataQualityAssessmentStage(Stage):
         repo (DatasetRepo): Repository object for dataset management.
         dataset_builder (DatasetBuilder): Object responsible for building datasets.
         spark (Optional[SparkSession]): Optional Spark session used for executing tasks on Spark dataframes.
+        cache (Optional[StageCache]): Optional content-addressed cache of stage results.
+        scheduler (Optional[TaskScheduler]): Optional scheduler running independent tasks concurrently.
+        sharder (Optional[ShardExecutor]): Optional executor running the tasks on each source partition.
+        governor (Optional[MemoryGovernor]): Optional governor running the stage in batches within a memory budget.
+        streamer (Optional[StreamDriver]): Optional driver piping the source from reader to writer in batches.
 
     Properties:
         phase (PhaseDef): Returns the phase of the pipeline, DATAPREP.
@@ -66,6 +76,11 @@ class DataQualityAssessmentStage(Stage):
         repo: DatasetRepo,
         dataset_builder: DatasetBuilder,
         spark: Optional[SparkSession] = None,
+        cache: Optional[StageCache] = None,
+        scheduler: Optional[TaskScheduler] = None,
+        sharder: Optional[ShardExecutor] = None,
+        governor: Optional[MemoryGovernor] = None,
+        streamer: Optional[StreamDriver] = None,
     ) -> None:
         super().__init__(
             source_config=source_config,
@@ -74,6 +89,11 @@ class DataQualityAssessmentStage(Stage):
             repo=repo,
             dataset_builder=dataset_builder,
             spark=spark,
+            cache=cache,
+            scheduler=scheduler,
+            sharder=sharder,
+            governor=governor,
+            streamer=streamer,
         )
 
     @property
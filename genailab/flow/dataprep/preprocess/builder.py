@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:01:45 am                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -201,6 +201,11 @@ class PreprocessStageBuilder(StageBuilder):
             repo=self._repo,
             dataset_builder=DatasetBuilder(),
             spark=self._spark,
+            cache=self._stage_cache,
+            scheduler=self._scheduler,
+            sharder=self._sharder,
+            governor=self._governor,
+            streamer=self._streamer,
         )
         self.reset()
         return stage
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday January 1st 2025 05:54:25 am                                              #
-# Modified   : Monday January 27th 2025 05:09:12 pm                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -19,6 +19,8 @@
 """Preprocess Task Module"""
 
 
+from typing import List
+
 import pandas as pd
 from genailab.flow.base.task import Task
 from genailab.infra.service.logging.task import task_logger
@@ -50,6 +52,16 @@ class VerifyEncodingTask(Task):
         self._column = column
         self._kwargs = kwargs
 
+    @property
+    def inputs(self) -> List[str]:
+        """Returns the column the task reads."""
+        return [self._column]
+
+    @property
+    def outputs(self) -> List[str]:
+        """Returns the column the task rewrites in place."""
+        return [self._column]
+
     @task_logger
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -64,10 +76,14 @@ class VerifyEncodingTask(Task):
         Returns:
             pd.DataFrame: The DataFrame with the specified column re-encoded to ensure UTF-8 compliance.
         """
-        data[self._column] = (
-            data[self._column].str.encode("utf-8", errors="ignore").str.decode("utf-8")
+        return self.run_batch(data)
+
+    def run_batch(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Re-encodes the specified column of a batch of rows."""
+        batch[self._column] = (
+            batch[self._column].str.encode("utf-8", errors="ignore").str.decode("utf-8")
         )
-        return data
+        return batch
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -93,6 +109,16 @@ class CastDataTypeTask(Task):
         self._datatypes = datatypes
         self._kwargs = kwargs
 
+    @property
+    def inputs(self) -> List[str]:
+        """Returns the columns the task casts."""
+        return list(self._datatypes)
+
+    @property
+    def outputs(self) -> List[str]:
+        """Returns the columns the task casts in place."""
+        return list(self._datatypes)
+
     @task_logger
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -111,15 +137,21 @@ class CastDataTypeTask(Task):
         Raises:
             ValueError: If a specified column is not found in the DataFrame.
         """
+        return self.run_batch(data)
+
+    def run_batch(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Casts the specified columns of a batch of rows."""
         for column, dtype in self._datatypes.items():
-            if column in data.columns:
-                data[column] = data[column].astype(dtype)
+            if column in batch.columns:
+                # Columns read with their declared schema already have the target dtype.
+                if batch[column].dtype != dtype:
+                    batch[column] = batch[column].astype(dtype)
             else:
                 msg = f"Column {column} not found in DataFrame"
                 self._logger.exception(msg)
                 raise ValueError(msg)
 
-        return data
+        return batch
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -143,6 +175,16 @@ class RemoveNewlinesTask(Task):
         super().__init__(**kwargs)
         self._column = column
 
+    @property
+    def inputs(self) -> List[str]:
+        """Returns the column the task reads."""
+        return [self._column]
+
+    @property
+    def outputs(self) -> List[str]:
+        """Returns the column the task rewrites in place."""
+        return [self._column]
+
     @task_logger
     def run(self, data: pd.DataFrame, **kwargs) -> pd.DataFrame:
         """
@@ -156,8 +198,12 @@ class RemoveNewlinesTask(Task):
         Returns:
             pd.DataFrame: The DataFrame with newline characters removed from the specified column.
         """
-        data[self._column] = data[self._column].str.replace("\n", " ")
-        return data
+        return self.run_batch(data)
+
+    def run_batch(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Removes newline characters from the specified column of a batch of rows."""
+        batch[self._column] = batch[self._column].str.replace("\n", " ")
+        return batch
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -178,6 +224,16 @@ class ConvertDateTimetoMS(Task):
         super().__init__(**kwargs)
         self._column = column
 
+    @property
+    def inputs(self) -> List[str]:
+        """Returns the column the task reads."""
+        return [self._column]
+
+    @property
+    def outputs(self) -> List[str]:
+        """Returns the column the task rewrites in place."""
+        return [self._column]
+
     @task_logger
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -189,9 +245,12 @@ class ConvertDateTimetoMS(Task):
         Returns:
             pd.DataFrame: The DataFrame with the converted column values in UTC.
         """
+        return self.run_batch(data)
 
-        data[self._column] = self._convert_datetime_ns_to_ms(data[self._column])
-        return data
+    def run_batch(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Converts the datetime column of a batch of rows."""
+        batch[self._column] = self._convert_datetime_ns_to_ms(batch[self._column])
+        return batch
 
     def _convert_datetime_ns_to_ms(self, datetime_series):
         try:
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday November 21st 2024 12:27:43 am                                             #
-# Modified   : Tuesday January 28th 2025 02:51:11 am                                               #
+# Modified   : Monday October 19th 2026 07:45:14 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -33,6 +33,7 @@ from genailab.flow.dataprep.quality.strategy.numeric import NumericStrategyFacto
 from genailab.flow.dataprep.quality.strategy.text.distributed import (
     TextStrategyFactory as SparkTextStrategyFactory,
 )
+from genailab.flow.dataprep.quality.strategy.text.local import TextStrategyFactory
 from genailab.infra.service.logging.task import task_logger
 
 
@@ -79,6 +80,27 @@ class AnomalyDetectRepairTask(Task):
         }
         self._kwargs = kwargs
 
+    @property
+    def column(self) -> Union[str, list]:
+        """Returns the column or columns analyzed by the task."""
+        return self._column
+
+    @property
+    def new_column(self) -> str:
+        """Returns the column that stores detection or repair results."""
+        return self._new_column
+
+    @property
+    def additive(self) -> bool:
+        """Detection only adds `new_column`; repair may change values or drop rows."""
+        return self._mode == "detect"
+
+    @property
+    def row_local(self) -> bool:
+        """Detectors may compare rows or use statistics of the whole dataset, such as duplicates
+        and percentiles, so anomaly tasks are not row-local unless a subclass says so."""
+        return False
+
     @task_logger
     def run(self, data: Union[pd.core.frame.DataFrame, pd.DataFrame, DataFrame]) -> Union[pd.core.frame.DataFrame, pd.DataFrame, DataFrame]:
         """
@@ -212,6 +234,22 @@ class TextAnomalyDetectRepairTask(AnomalyDetectRepairTask):
             **kwargs,
         )
 
+    @property
+    def row_local(self) -> bool:
+        """Text strategies match patterns and thresholds within each row's text."""
+        return True
+
+    @property
+    def streamable(self) -> bool:
+        """The pandas regex strategies compute each row from that row alone."""
+        return isinstance(self._strategy_factory, TextStrategyFactory)
+
+    def run_batch(
+        self, batch: Union[pd.core.frame.DataFrame, pd.DataFrame]
+    ) -> Union[pd.core.frame.DataFrame, pd.DataFrame]:
+        """Detects or repairs anomalies in a batch of rows."""
+        return self._mode_map[self._mode](data=batch)
+
 
 # ------------------------------------------------------------------------------------------------ #
 class NumericAnomalyDetectRepairTask(AnomalyDetectRepairTask):
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday November 21st 2024 03:13:48 am                                             #
-# Modified   : Wednesday January 29th 2025 09:27:25 am                                             #
+# Modified   : Monday October 19th 2026 07:32:52 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -29,6 +29,7 @@ from genailab.flow.dataprep.quality.strategy.factory import (
 )
 from genailab.flow.dataprep.quality.strategy.text import SPECIAL_ACCENT_MAP
 from genailab.flow.dataprep.quality.strategy.text.pattern import RegexFactory
+from genailab.infra.service.spark.files import get_file
 from lingua import Language, LanguageDetectorBuilder
 from pyspark.sql import DataFrame
 from pyspark.sql import functions as F
@@ -40,7 +41,19 @@ languages = [Language.ENGLISH, Language.SPANISH]
 detector = LanguageDetectorBuilder.from_languages(*languages).build()
 # ------------------------------------------------------------------------------------------------ #
 fasttext.FastText.eprint = lambda x: None  # Suppress FastText warnings
-fasttext_model = fasttext.load_model("models/language_detection/lid.176.bin")
+FASTTEXT_MODEL = "models/language_detection/lid.176.bin"
+_fasttext_model = None
+
+
+def get_fasttext_model():
+    """Loads the FastText model once per process.
+
+    On executors, the model is loaded from the copy distributed with the Spark session.
+    """
+    global _fasttext_model
+    if _fasttext_model is None:
+        _fasttext_model = fasttext.load_model(get_file(FASTTEXT_MODEL))
+    return _fasttext_model
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -913,7 +926,7 @@ def lm_fasttext(text):
         True if the text is non-English, False otherwise.
     """
     try:
-        predictions = fasttext_model.predict(text)
+        predictions = get_fasttext_model().predict(text)
         return predictions[0][0] != "__label__en"
     except Exception as e:
         print(f"Error in language detection: {e}")
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Friday November 22nd 2024 01:08:57 am                                               #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:45:14 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -79,3 +79,8 @@ class DetectOrRepairUniquenessTask(NominalAnomalyDetectRepairTask):
             unit=unit,
             **kwargs,
         )
+
+    @property
+    def row_local(self) -> bool:
+        """Duplicates are found across the whole dataset, so the task can't run per partition."""
+        return False
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday January 19th 2025 11:14:25 am                                                #
-# Modified   : Friday January 31st 2025 03:52:32 pm                                                #
+# Modified   : Monday October 19th 2026 07:25:54 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -20,7 +20,7 @@
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Optional, Type
+from typing import Optional, Tuple, Type
 
 from genailab.asset.dataset.config import DatasetConfig
 from genailab.core.dtypes import DFType
@@ -79,11 +79,19 @@ class TQAStageBuilder(StageBuilder):
         """
         return self._dftype
 
+    @property
+    def engines(self) -> Tuple[DFType, ...]:
+        """
+        The engines the stage can run on: TQAnalystPandas or TQAnalystDask.
+
+        Returns:
+            Tuple[DFType, ...]: The supported engines.
+        """
+        return (DFType.PANDAS, DFType.DASK)
+
     def reset(self) -> None:
         """Resets the builder."""
         super().reset()
-        self._source_config = None
-        self._target_config = None
         self._tqa_task = None
         self._dftype = None
 
@@ -149,6 +157,9 @@ class TQAStageBuilder(StageBuilder):
         Builds the Text Quality Analysis - Syntactic Stage by validating configurations,
         assembling the tasks and returning the configured stage.
 
+        If neither `with_pandas` nor `with_dask` was called, the analyst is chosen from the size
+        of the source, or from the engine set with `engine`, with default parameters.
+
         Args:
             source_config (Optional[DatasetConfig]): An optional configuration object for
                 the source dataset. If not provided, the method falls back to the source
@@ -161,6 +172,12 @@ class TQAStageBuilder(StageBuilder):
         Returns:
             TQASyntacticStage: The builder instance with the constructed stage.
         """
+        if self._tqa_task is None:
+            engine = self._select_engine(source_config=source_config)
+            if engine == DFType.DASK:
+                self.with_dask()
+            else:
+                self.with_pandas()
 
         self._validate(strict=strict)
 
@@ -170,6 +187,11 @@ class TQAStageBuilder(StageBuilder):
             tasks=deepcopy(self._tasks),
             repo=self._repo,
             dataset_builder=self._dataset_builder,
+            cache=self._stage_cache,
+            scheduler=self._scheduler,
+            sharder=self._sharder,
+            governor=self._governor,
+            streamer=self._streamer,
         )
         self.reset()
         return stage
@@ -11,23 +11,27 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday January 19th 2025 11:26:44 am                                                #
-# Modified   : Friday January 31st 2025 04:44:17 am                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
 # ================================================================================================ #
 """TQA Stage Module"""
-import inspect
 import re
-from typing import List
+from typing import List, Optional
 
+import pandas as pd
 from genailab.asset.dataset.builder import DatasetBuilder
 from genailab.asset.dataset.config import DatasetConfig
-from genailab.asset.dataset.dataset import Dataset
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.governor import MemoryGovernor
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stream import StreamDriver
 from genailab.flow.base.stage import Stage
 from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.cache import StageCache
 from genailab.infra.persist.repo.dataset import DatasetRepo
 
 
@@ -46,6 +50,11 @@ class TQAStage(Stage):
         repo: DatasetRepo,
         dataset_builder: DatasetBuilder,
         column: str = "content",
+        cache: Optional[StageCache] = None,
+        scheduler: Optional[TaskScheduler] = None,
+        sharder: Optional[ShardExecutor] = None,
+        governor: Optional[MemoryGovernor] = None,
+        streamer: Optional[StreamDriver] = None,
     ) -> None:
         super().__init__(
             source_config=source_config,
@@ -53,6 +62,11 @@ class TQAStage(Stage):
             tasks=tasks,
             repo=repo,
             dataset_builder=dataset_builder,
+            cache=cache,
+            scheduler=scheduler,
+            sharder=sharder,
+            governor=governor,
+            streamer=streamer,
         )
         self._column = column
 
@@ -72,42 +86,21 @@ class TQAStage(Stage):
         """Returns the data frame type used in this stage."""
         return self.__DFTYPE
 
-    def _run(self) -> Dataset:
-        """Executes the stage tasks and saves the resulting dataset.
+    @staticmethod
+    def _prepare(dataframe: pd.DataFrame) -> pd.DataFrame:
+        """Cleans the review text before the tasks run.
+
+        Args:
+            dataframe (pd.DataFrame): The source dataframe.
 
         Returns:
-            Dataset: The processed dataset.
+            pd.DataFrame: The dataframe with cleaned `content`.
         """
-        self._logger.debug(f"Inside {self.__class__.__name__}: {inspect.currentframe().f_code.co_name}")
-        # Remove existing target dataset if it exists.
-        self._remove_dataset(config=self._target_config)
-
-        # Obtain the source dataset from the repo.
-        source = self._get_dataset(config=self._source_config)
-        dataframe = source.dataframe
-
-        # Clean text
-        dataframe['content'] = dataframe['content'].apply(self._clean_text)
-
-        for task in self._tasks:
-            try:
-                dataframe = task.run(dataframe)
-            except Exception as e:
-                self._logger.error(f"Error in task {task.__class__.__name__}: {e}")
-                raise RuntimeError(f"Error in task {task.__class__.__name__}: {e}")
-
-        target = self._create_dataset(
-            source=source.passport, config=self._target_config, dataframe=dataframe
-        )
-        target = self._repo.add(dataset=target, entity=self.__class__.__name__)
-
-        source.consume(entity=self.__class__.__name__)
-        self._repo.update(dataset=source)
-
-        return target
-
+        dataframe['content'] = dataframe['content'].apply(TQAStage._clean_text)
+        return dataframe
 
-    def _clean_text(self, text):
+    @staticmethod
+    def _clean_text(text):
         """
         Cleans the input text by:
         - Lowercasing
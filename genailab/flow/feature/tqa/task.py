@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday January 19th 2025 11:53:03 am                                                #
-# Modified   : Sunday February 2nd 2025 12:13:31 pm                                                #
+# Modified   : Monday October 19th 2026 07:45:14 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -33,43 +33,10 @@ from dask.distributed import Client, LocalCluster
 from pandarallel import pandarallel
 from tqdm import tqdm
 
+from genailab.core.dtypes import COUNT_SCHEMA, DATASET_SCHEMA  # noqa: F401
 from genailab.flow.base.task import Task
 
 pandarallel.initialize(progress_bar=True, nb_workers=18, verbose=0)
-# ------------------------------------------------------------------------------------------------ #
-#                                  DATASET SCHEMA                                                  #
-# ------------------------------------------------------------------------------------------------ #
-COUNT_SCHEMA = {
-    "noun_count": np.float64,
-    "verb_count": np.float64,
-    "adjective_count": np.float64,
-    "adverb_count": np.float64,
-    "aspect_verb_pairs": np.float64,
-    "noun_phrases": np.float64,
-    "verb_phrases": np.float64,
-    "adverbial_phrases": np.float64,
-    "review_length": 'int64',
-    "lexical_density": np.float64,
-    "dependency_depth": 'int64',
-    "tqa_score": np.float64,
-}
-
-DATASET_SCHEMA = {
-    "id": 'str',
-    "app_id": 'str',
-    "app_name": 'str',
-    "category_id": "category",
-    "author": 'str',
-    "rating": 'int64',
-    "content": 'str',
-    "vote_sum": 'int64',
-    "vote_count": 'int64',
-    "date": "datetime64[ms]",
-    "category": "category",
- **COUNT_SCHEMA,
-
-}
-
 # ------------------------------------------------------------------------------------------------ #
 #                                    TQA TASK                                                      #
 # ------------------------------------------------------------------------------------------------ #
@@ -130,6 +97,11 @@ class TQATask(Task):
         """
         self.__dict__.update(state)
 
+    @property
+    def row_local(self) -> bool:
+        """Syntactic features and scores are computed per review, so the task can run per partition."""
+        return True
+
     def run(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Processes a batch of reviews and computes syntactic features and TQA syntactic scores.
@@ -11,17 +11,24 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Monday September 9th 2024 10:57:37 am                                               #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 06:46:49 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 """Amazon AWS Module"""
+import hashlib
 import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
 
 import boto3
+import botocore.config
 import botocore.exceptions
+from boto3.s3.transfer import TransferConfig
 from genailab.infra.config.app import AppConfigReader
 from tqdm import tqdm
 
@@ -35,56 +42,93 @@ def lambda_handler(bucket_name: str, local_download_path: str):
     today = datetime.now().strftime("%y%m%d")
     seven_days_ago = (datetime.now() - timedelta(days=7)).strftime("%y%m%d")
 
-    # List objects in the bucket with the desired prefix
+    # List objects in the bucket with the desired prefix, across all result pages
     prefix = "appreviews-"  # Customize if needed
-    objects = s3_handler.s3_client.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-
-    if "Contents" in objects:
-        # Filter for files in the last 7 days
-        filtered_files = [
-            obj["Key"]
-            for obj in objects["Contents"]
-            if seven_days_ago <= obj["Key"].split("-")[1][:6] <= today
-        ]
-
-        if filtered_files:
-            # Sort by date (latest first) and download the latest one
-            latest_file = sorted(filtered_files, reverse=True)[0]
-            local_path = os.path.join(local_download_path, latest_file)
-            s3_handler.download_file(bucket_name, latest_file, local_path)
-        else:
-            print("No new files found within the last 7 days.")
+    filtered_files = [
+        obj
+        for obj in s3_handler.list_objects(bucket_name=bucket_name, prefix=prefix)
+        if seven_days_ago <= obj["Key"].split("-")[1][:6] <= today
+    ]
+
+    if filtered_files:
+        # Sort by date (latest first) and download the latest one
+        latest_file = sorted(filtered_files, key=lambda obj: obj["Key"], reverse=True)[0]
+        local_path = os.path.join(local_download_path, latest_file["Key"])
+        s3_handler.download_file(
+            bucket_name, latest_file["Key"], local_path, etag=latest_file["ETag"]
+        )
+    else:
+        print("No new files found within the last 7 days.")
 
 
 # ------------------------------------------------------------------------------------------------ #
 class S3Handler:
-    """ """
+    """Transfers files and folders between the local filesystem and Amazon S3.
+
+    Files above the multipart threshold are transferred in parts by concurrent threads, and
+    folders are transferred file by file through a bounded thread pool. Downloads go through a
+    local content-addressed cache keyed by the object's ETag, so pulling an unchanged object
+    again is a local link rather than a network transfer.
+
+    Transfer settings are read from the `aws` section of the configuration. Credentials and the
+    endpoint are resolved by boto3 from the environment, e.g. AWS_ACCESS_KEY_ID,
+    AWS_SECRET_ACCESS_KEY, AWS_DEFAULT_REGION and AWS_ENDPOINT_URL.
+
+    Args:
+        config_reader_cls (type[AppConfigReader]): The configuration reader class.
+        s3_client (Optional[Any]): A boto3 S3 client. If None, one is created from the
+            environment.
+    """
 
     def __init__(
         self,
         config_reader_cls: type[AppConfigReader] = AppConfigReader,
+        s3_client: Optional[Any] = None,
     ) -> None:
-        """
-        Initializes the S3Handler with optional AWS credentials and configuration.
-
-        Args:
-            aws_access_key_id (str, optional): AWS access key ID.
-            aws_secret_access_key (str, optional): AWS secret access key.
-            region_name (str, optional): AWS region name.
-            config (dict, optional): Dictionary containing configuration options such as read timeout and retries.
-        """
-        config_reader = config_reader_cls()
-        aws_config = config_reader.aws
+        config = config_reader_cls().get_config(namespace=False).get("aws") or {}
+        transfer = config.get("transfer") or {}
+        self._max_workers = transfer.get("max_workers", 16)
+        max_concurrency = transfer.get("max_concurrency", 8)
+        self._transfer_config = TransferConfig(
+            multipart_threshold=transfer.get("multipart_threshold", 67108864),
+            multipart_chunksize=transfer.get("multipart_chunksize", 67108864),
+            max_concurrency=max_concurrency,
+            use_threads=max_concurrency > 1,
+        )
+        cache = config.get("cache") or {}
+        self._cache_location = cache.get("location")
 
-        self.s3_client = boto3.client(
+        # Each of the pool's workers runs up to max_concurrency part transfers, so the
+        # connection pool is sized to serve all of them without blocking.
+        self.s3_client = s3_client or boto3.client(
             "s3",
-            aws_access_key_id=aws_config.aws_access_key_id,
-            aws_secret_access_key=aws_config.aws_secret_access_key,
-            region_name=aws_config.region_name,
+            config=botocore.config.Config(
+                max_pool_connections=self._max_workers * max_concurrency,
+                retries={"max_attempts": 10, "mode": "adaptive"},
+            ),
         )
 
+    def list_objects(self, bucket_name: str, prefix: str = "") -> Iterator[Dict[str, Any]]:
+        """Lists the objects under a prefix, following continuation tokens across pages.
+
+        Args:
+            bucket_name (str): Name of the S3 bucket.
+            prefix (str): The key prefix.
+
+        Yields:
+            Dict[str, Any]: The object summaries, with Key, ETag, Size and LastModified.
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+            yield from page.get("Contents", [])
+
     def download_file(
-        self, bucket_name: str, s3_key: str, local_path: str, force: bool = False
+        self,
+        bucket_name: str,
+        s3_key: str,
+        local_path: str,
+        force: bool = False,
+        etag: Optional[str] = None,
     ) -> None:
         """
         Downloads a file from an S3 bucket to a local path.
@@ -94,57 +138,84 @@ class S3Handler:
             s3_key (str): The key of the file in the S3 bucket.
             local_path (str): The local path where the file should be saved.
             force (bool): Whether to donwload the file if it already exists.
+            etag (Optional[str]): The object's ETag, if known from a listing. Saves a HEAD
+                request when the cache is enabled.
 
         Raises:
             Exception: If there is an error downloading the file.
         """
         try:
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-            if not os.path.exists(local_path) or force:
-                self.s3_client.download_file(bucket_name, s3_key, local_path)
+            if os.path.exists(local_path) and not force:
+                print(f"{local_path} was not downloaded, as it already exists.")
+                return
+            os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+            if not self._cache_location:
+                self._download(bucket_name=bucket_name, s3_key=s3_key, local_path=local_path)
                 print(f"Downloaded {s3_key} from {bucket_name} to {local_path}")
+                return
+
+            etag = etag or self.s3_client.head_object(Bucket=bucket_name, Key=s3_key)["ETag"]
+            cache_path = self._get_cache_path(etag=etag)
+            if os.path.exists(cache_path):
+                print(f"Restored {s3_key} from the cache to {local_path}")
             else:
-                print(f"{local_path} was not downloaded, as it already exists.")
+                self._download(bucket_name=bucket_name, s3_key=s3_key, local_path=cache_path)
+                print(f"Downloaded {s3_key} from {bucket_name} to {local_path}")
+            self._link(source=cache_path, destination=local_path)
 
         except Exception as e:
             print(f"Error downloading {s3_key} from {bucket_name}: {e}")
 
     def download_folder(
         self, bucket_name: str, s3_folder: str, local_folder: str, force: bool = False
-    ) -> None:
+    ) -> List[str]:
         """
         Downloads a folder from an S3 bucket to a local directory.
 
+        Files are downloaded concurrently by a bounded thread pool.
+
         Args:
             bucket_name (str): Name of the S3 bucket.
             s3_folder (str): The folder path in the S3 bucket.
             local_folder (str): The local directory where the files should be saved.
             force (bool): Whether to donwload the file if it already exists.
 
+        Returns:
+            List[str]: The local paths of the files in the folder.
+
         Raises:
             Exception: If there is an error downloading the folder.
         """
+        local_paths = []
         try:
-            paginator = self.s3_client.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=bucket_name, Prefix=s3_folder):
-                if "Contents" in page:
-                    for obj in tqdm(page["Contents"]):
-                        s3_key = obj["Key"]
-                        local_path = os.path.join(
-                            local_folder, os.path.relpath(s3_key, s3_folder)
+            objects = [
+                obj
+                for obj in self.list_objects(bucket_name=bucket_name, prefix=s3_folder)
+                if not obj["Key"].endswith("/")
+            ]
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = []
+                for obj in objects:
+                    local_path = os.path.join(
+                        local_folder, os.path.relpath(obj["Key"], s3_folder)
+                    )
+                    local_paths.append(local_path)
+                    futures.append(
+                        executor.submit(
+                            self.download_file,
+                            bucket_name,
+                            obj["Key"],
+                            local_path,
+                            force=force,
+                            etag=obj.get("ETag"),
                         )
-                        if not os.path.exists(local_path) or force:
-                            self.download_file(bucket_name, s3_key, local_path)
-                            print(
-                                f"Downloaded {local_path} from {bucket_name}/{s3_key}"
-                            )
-                        else:
-                            print(
-                                f"{local_path} was not downloaded, as it already exists."
-                            )
+                    )
+                for future in tqdm(as_completed(futures), total=len(futures)):
+                    future.result()
 
         except Exception as e:
             print(f"Error downloading folder {s3_folder} from {bucket_name}: {e}")
+        return local_paths
 
     def upload_file(
         self, local_path: str, bucket_name: str, s3_key: str, force: bool = False
@@ -152,6 +223,8 @@ class S3Handler:
         """
         Uploads a file to an S3 bucket.
 
+        Files above the multipart threshold are uploaded in parts by concurrent threads.
+
         Args:
             local_path (str): The local file path to upload.
             bucket_name (str): Name of the S3 bucket.
@@ -163,7 +236,9 @@ class S3Handler:
         """
         try:
             if not self.file_exists(bucket_name=bucket_name, s3_key=s3_key) or force:
-                self.s3_client.upload_file(local_path, bucket_name, s3_key)
+                self.s3_client.upload_file(
+                    local_path, bucket_name, s3_key, Config=self._transfer_config
+                )
                 print(f"Uploaded {local_path} to {bucket_name}/{s3_key}")
             else:
                 print(f"File {s3_key} already exists in {bucket_name} bucket.")
@@ -176,6 +251,8 @@ class S3Handler:
         """
         Uploads a local folder and its contents to an S3 bucket.
 
+        Files are uploaded concurrently by a bounded thread pool.
+
         Args:
             local_folder (str): The local folder path to upload.
             bucket_name (str): Name of the S3 bucket.
@@ -186,19 +263,21 @@ class S3Handler:
             Exception: If there is an error uploading the folder.
         """
         try:
-            for root, dirs, files in os.walk(local_folder):
-                for file in tqdm(files):
-                    local_path = os.path.join(root, file)
-                    s3_key = os.path.join(
-                        s3_folder, os.path.relpath(local_path, local_folder)
-                    )
-                    if (
-                        not self.file_exists(bucket_name=bucket_name, s3_key=s3_key)
-                        or force
-                    ):
-                        self.upload_file(local_path, bucket_name, s3_key)
-                    else:
-                        print(f"File {s3_key} already exists in {bucket_name} bucket.")
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                futures = []
+                for root, dirs, files in os.walk(local_folder):
+                    for file in files:
+                        local_path = os.path.join(root, file)
+                        s3_key = os.path.join(
+                            s3_folder, os.path.relpath(local_path, local_folder)
+                        )
+                        futures.append(
+                            executor.submit(
+                                self.upload_file, local_path, bucket_name, s3_key, force=force
+                            )
+                        )
+                for future in tqdm(as_completed(futures), total=len(futures)):
+                    future.result()
         except Exception as e:
             print(
                 f"Error uploading folder {local_folder} to {bucket_name}/{s3_folder}: {e}"
@@ -220,7 +299,7 @@ class S3Handler:
             region = region or self.s3_client.meta.region_name
             self.s3_client.create_bucket(
                 Bucket=bucket_name,
-                CreateBucketAppConfigReaderuration={"LocationConstraint": region},
+                CreateBucketConfiguration={"LocationConstraint": region},
             )
             print(f"Bucket '{bucket_name}' created successfully in region '{region}'.")
             return True
@@ -361,3 +440,32 @@ class S3Handler:
                 f"Error deleting folder '{s3_folder}' from bucket '{bucket_name}': {e}"
             )
             return False
+
+    def _download(self, bucket_name: str, s3_key: str, local_path: str) -> None:
+        """Downloads an object to a temporary file and renames it, so a partial download is
+        never visible at the local path."""
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        tmp_path = f"{local_path}.{uuid.uuid4().hex}.part"
+        try:
+            self.s3_client.download_file(
+                bucket_name, s3_key, tmp_path, Config=self._transfer_config
+            )
+            os.replace(tmp_path, local_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _get_cache_path(self, etag: str) -> str:
+        """Returns the cache path of the object with the given ETag."""
+        key = hashlib.sha256(etag.strip('"').encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_location, key[:2], key)
+
+    @staticmethod
+    def _link(source: str, destination: str) -> None:
+        """Hard links a cached file to the destination, copying when linking is not possible."""
+        if os.path.exists(destination):
+            os.remove(destination)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
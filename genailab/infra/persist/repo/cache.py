@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/persist/repo/cache.py                                               #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:24:51 pm                                                #
+# Modified   : Monday October 19th 2026 06:52:26 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Stage Result Cache Module"""
+import json
+import logging
+import os
+import shutil
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+import xxhash
+from pyspark.sql import DataFrame, SparkSession
+
+from genailab.core.dtypes import DFType
+from genailab.infra.persist.repo.file.fao import FAO
+from genailab.infra.utils.file.copy import Copy
+from genailab.infra.utils.file.fileset import FileAttr, FileFormat
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      STAGE CACHE                                                 #
+# ------------------------------------------------------------------------------------------------ #
+class StageCache:
+    """Content-addressed store of stage results.
+
+    Each entry holds a snapshot of a stage's target dataset files, addressed by a key derived from
+    everything that determines the result: the content fingerprint of the source dataset, the
+    ordered task configurations, and the version of the code that runs them. Identical inputs
+    therefore always map to the same entry, and any change to data, configuration, or code
+    produces a new key.
+
+    Entries are stored under `location/<key>/` alongside a small `entry.json` record. Files are
+    linked rather than copied where the filesystem allows, so an entry shares storage with the
+    dataset it was taken from. When the total size of the cache exceeds the storage budget, the
+    least recently used entries are removed.
+
+    Args:
+        location (str): Base directory for the cache.
+        fao (FAO): File access object used to read cached results.
+        budget (int): Storage budget in bytes.
+    """
+
+    __ENTRY_FILENAME = "entry.json"
+    __DATA_FILENAME = "data"
+
+    def __init__(self, location: str, fao: FAO, budget: int) -> None:
+        self._location = location
+        self._fao = fao
+        self._budget = budget
+        self._copy = Copy()
+        os.makedirs(self._location, exist_ok=True)
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def location(self) -> str:
+        """Returns the base directory of the cache."""
+        return self._location
+
+    @property
+    def size(self) -> int:
+        """Returns the total size of the cache entries in bytes."""
+        return sum(entry["size"] for entry in self._read_entries())
+
+    @staticmethod
+    def get_key(
+        source_fingerprint: str, task_configs: List[Dict[str, Any]], code_version: str
+    ) -> str:
+        """Computes the cache key for a stage run.
+
+        Args:
+            source_fingerprint (str): Content fingerprint of the source dataset.
+            task_configs (List[Dict[str, Any]]): Task configurations in execution order.
+            code_version (str): Version of the code that executes the tasks.
+
+        Returns:
+            str: Hexadecimal cache key.
+        """
+        payload = json.dumps(
+            {
+                "source": source_fingerprint,
+                "tasks": task_configs,
+                "code": code_version,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return xxhash.xxh3_128_hexdigest(payload.encode("utf-8"))
+
+    def exists(self, key: str) -> bool:
+        """Returns True if an entry exists for the key."""
+        return os.path.exists(self._get_entry_path(key=key))
+
+    def get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the entry record for a key and marks it as recently used.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Dict[str, Any]]: The entry record, or None on a cache miss.
+        """
+        entry = self._read_entry(key=key)
+        if entry is None:
+            return None
+        entry["accessed"] = datetime.now().isoformat()
+        self._write_entry(entry=entry)
+        return entry
+
+    def find(self, **metadata: Any) -> Optional[Dict[str, Any]]:
+        """Returns the most recently used entry whose metadata matches all given values.
+
+        Args:
+            **metadata: Metadata names and values to match.
+
+        Returns:
+            Optional[Dict[str, Any]]: The matching entry record, or None.
+        """
+        entries = [
+            entry
+            for entry in self._read_entries()
+            if all(
+                entry.get("metadata", {}).get(name) == value
+                for name, value in metadata.items()
+            )
+        ]
+        if not entries:
+            return None
+        return self.get_entry(key=max(entries, key=lambda entry: entry["accessed"])["key"])
+
+    def read(
+        self, key: str, dftype: DFType, spark: Optional[SparkSession] = None
+    ) -> Union[pd.DataFrame, DataFrame]:
+        """Reads the cached result for a key.
+
+        Args:
+            key (str): The cache key.
+            dftype (DFType): The dataframe type to return.
+            spark (Optional[SparkSession]): Spark session for Spark dataframes.
+
+        Returns:
+            Union[pd.DataFrame, DataFrame]: The cached result.
+
+        Raises:
+            FileNotFoundError: If no entry exists for the key.
+        """
+        entry = self.get_entry(key=key)
+        if entry is None:
+            raise FileNotFoundError(f"No stage cache entry exists for key {key}.")
+        return self._fao.read(
+            filepath=entry["path"],
+            dftype=dftype,
+            file_format=FileFormat.from_value(entry["file_format"]),
+            spark=spark,
+        )
+
+    def put(
+        self,
+        key: str,
+        filepath: str,
+        file_format: FileFormat,
+        fingerprint: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Stores the files of a stage result under a key, replacing any existing entry.
+
+        Args:
+            key (str): The cache key.
+            filepath (str): Path to the file or directory containing the result.
+            file_format (FileFormat): The format of the result files.
+            fingerprint (Optional[str]): Content fingerprint of the target dataset.
+            metadata (Optional[Dict[str, Any]]): JSON-serializable values describing how the
+                result was produced, e.g. the components of the key. Used by `find`.
+        """
+        path = os.path.join(self._location, key, f"{self.__DATA_FILENAME}{file_format.ext}")
+        self.remove(key=key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._copy.snapshot(source=filepath, target=path, overwrite=True)
+        now = datetime.now().isoformat()
+        self._write_entry(
+            entry={
+                "key": key,
+                "path": path,
+                "file_format": file_format.value,
+                "fingerprint": fingerprint,
+                "metadata": metadata or {},
+                "size": FileAttr.get_size(path=path, in_bytes=True),
+                "created": now,
+                "accessed": now,
+            }
+        )
+        self._logger.debug(f"Added stage cache entry {key}.")
+        self.collect_garbage()
+
+    def update(self, key: str, fingerprint: Optional[str]) -> None:
+        """Records the fingerprint of the target dataset last produced from an entry.
+
+        Args:
+            key (str): The cache key.
+            fingerprint (Optional[str]): Content fingerprint of the target dataset.
+
+        Raises:
+            FileNotFoundError: If no entry exists for the key.
+        """
+        entry = self._read_entry(key=key)
+        if entry is None:
+            raise FileNotFoundError(f"No stage cache entry exists for key {key}.")
+        entry["fingerprint"] = fingerprint
+        self._write_entry(entry=entry)
+
+    def remove(self, key: str) -> None:
+        """Removes the entry for a key, if it exists."""
+        shutil.rmtree(os.path.join(self._location, key), ignore_errors=True)
+
+    def collect_garbage(self) -> None:
+        """Removes least recently used entries until the cache is within its storage budget."""
+        entries = sorted(self._read_entries(), key=lambda entry: entry["accessed"])
+        size = sum(entry["size"] for entry in entries)
+        # Never evict the most recently used entry, even if it alone exceeds the budget.
+        for entry in entries[:-1]:
+            if size <= self._budget:
+                break
+            self.remove(key=entry["key"])
+            size -= entry["size"]
+            self._logger.debug(f"Evicted stage cache entry {entry['key']}.")
+
+    def reset(self) -> None:
+        """Removes all entries from the cache."""
+        for entry in self._read_entries():
+            self.remove(key=entry["key"])
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self._location, key, self.__ENTRY_FILENAME)
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._get_entry_path(key=key), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _read_entries(self) -> List[Dict[str, Any]]:
+        entries = [self._read_entry(key=key) for key in os.listdir(self._location)]
+        return [entry for entry in entries if entry is not None]
+
+    def _write_entry(self, entry: Dict[str, Any]) -> None:
+        # Write to a temporary file and rename so a crash never leaves a partial record.
+        path = self._get_entry_path(key=entry["key"])
+        with open(f"{path}.tmp", "w") as file:
+            json.dump(entry, file)
+        os.replace(f"{path}.tmp", path)
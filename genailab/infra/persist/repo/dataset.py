@@ -11,31 +11,81 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Monday December 23rd 2024 02:46:53 pm                                               #
-# Modified   : Tuesday January 28th 2025 06:23:32 am                                               #
+# Modified   : Monday October 19th 2026 08:31:39 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 """Dataset Repo Module"""
 
+import copy
 import logging
+import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote
 
 import pandas as pd
+import pyarrow.dataset as ds
 from genailab.asset.base.asset import AssetType
 from genailab.asset.base.repo import Repo
 from genailab.asset.dataset.dataset import Dataset
 from genailab.asset.dataset.identity import DatasetPassport
 from genailab.core.dtypes import DFType
 from genailab.core.flow import PhaseDef, StageDef
+from genailab.core.schema import SchemaRegistry
 from genailab.infra.config.app import AppConfigReader
 from genailab.infra.exception.object import ObjectExistsError, ObjectNotFoundError
 from genailab.infra.persist.repo.file.fao import FAO
 from genailab.infra.persist.repo.object.dao import DAO
 from genailab.infra.persist.repo.object.rao import RAO
-from genailab.infra.utils.file.fileset import FileAttr, FileFormat
-from pyspark.sql import SparkSession
+from genailab.infra.utils.data.hash import HashService
+from genailab.infra.utils.file.copy import Copy
+from genailab.infra.utils.file.fileset import FileAttr, FileFormat, FileSet
+from pyspark.sql import DataFrame, SparkSession
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                        WRITE HANDLE                                              #
+# ------------------------------------------------------------------------------------------------ #
+class WriteHandle:
+    """Handle on a dataset being added to the repository in the background.
+
+    Args:
+        dataset (Dataset): The in-memory dataset being added.
+        future (Future): The future of the background write and registration.
+    """
+
+    def __init__(self, dataset: Dataset, future: Future) -> None:
+        self._dataset = dataset
+        self._future = future
+
+    @property
+    def dataset(self) -> Dataset:
+        """Returns the in-memory dataset. Its file attributes are set once the write completes."""
+        return self._dataset
+
+    def done(self) -> bool:
+        """Returns True if the write has completed or failed."""
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> Dataset:
+        """Waits for the write and registration to complete.
+
+        Args:
+            timeout (Optional[float]): Seconds to wait. Waits indefinitely if None.
+
+        Returns:
+            Dataset: The registered dataset.
+
+        Raises:
+            Exception: The exception raised by the background write, if it failed.
+        """
+        self._future.result(timeout=timeout)
+        return self._dataset
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -49,25 +99,72 @@ class DatasetRepo(Repo):
     environments. It ensures that files on disk are properly handled when a dataset is added,
     retrieved, deleted, or when the repository is reset.
 
+    Datasets may be added synchronously with `add`, or with `add_async`, which returns a
+    `WriteHandle` immediately and writes on a background thread. Until the write completes, the
+    in-memory dataset is served by `get` and `get_meta`, so later stages can consume it without
+    waiting for disk. Registration in the DAO and RAO happens only once the files are written,
+    and is rolled back together with the files if it fails. Failures are raised at the join
+    points: `WriteHandle.result`, `join`, and any later operation on the same dataset. Every
+    access to the DAO and RAO is made under the repository's lock, as the writer thread reads
+    and registers metadata while the caller goes on updating it.
+
     Args:
         location (str): The base directory for storing files.
         dao (DAO): The data access object used for persistence of dataset metadata.
         fao (FAO): File access object for file persistence.
         rao (RAO): Registry access object for maintaining the repository registry.
+        write_behind (bool): Whether stages should add their datasets with `add_async`.
+            Default is False.
+        full_fingerprint (bool): Whether the full content fingerprint of Parquet datasets is
+            computed when they are added. Otherwise only the footer fingerprint is recorded and
+            the full one is computed by the first `get_fingerprint` or `verify(full=True)`.
+            Default is False.
 
     """
 
     __ASSET_TYPE = AssetType.DATASET
 
-    def __init__(self, location: str, dao: DAO, fao: FAO, rao: RAO) -> None:
+    def __init__(
+        self,
+        location: str,
+        dao: DAO,
+        fao: FAO,
+        rao: RAO,
+        write_behind: bool = False,
+        full_fingerprint: bool = False,
+    ) -> None:
         super().__init__()  # base class assigns the value to self._dao
         self._location = location
         self._dao = dao
         self._fao = fao
         self._rao = rao
+        self._write_behind = write_behind
+        self._full_fingerprint = full_fingerprint
+        self._hash_service = HashService()
+        self._schemas = SchemaRegistry()
+        self._copy = Copy()
+
+        # Background writes and the metadata they register are serialized by a single writer.
+        self._lock = threading.RLock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Tuple[Dataset, Future]] = {}
 
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
+    def __getstate__(self) -> dict:
+        """Excludes the background writer, which datasets pickled with their repo can't carry."""
+        state = self.__dict__.copy()
+        for attr in ("_lock", "_writer", "_pending"):
+            state.pop(attr, None)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restores the repository with an idle background writer."""
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._writer = None
+        self._pending = {}
+
     @property
     def location(self) -> int:
         """Returns the base directory of the repository
@@ -84,12 +181,19 @@ class DatasetRepo(Repo):
         Returns:
             int: The count of datasets in the repository.
         """
-        return self._rao.count
+        with self._lock:
+            return self._rao.count
+
+    @property
+    def write_behind(self) -> bool:
+        """Returns True if stages should add their datasets with `add_async`."""
+        return self._write_behind
 
     @property
     def registry(self) -> pd.DataFrame:
         """Returns the repository registry."""
-        return self._rao.read_all()
+        with self._lock:
+            return self._rao.read_all()
 
     def add(self, dataset: Dataset, entity: str = None) -> Dataset:
         """Adds a Dataset dataset to the repository.
@@ -102,31 +206,107 @@ class DatasetRepo(Repo):
             Dataset: The dataset
         """
 
+        self._wait(asset_id=dataset.asset_id)
+
         # 1.  Update the Dataset's status to `PUBLISHED` if entity is not None.
         if isinstance(entity, str):
             dataset.publish(entity=entity)
 
-        # 2. Determine filepath.
-        filepath = self._get_filepath(asset_id=dataset.asset_id,
-                                      file_format=dataset.passport.file_format,
-                                      phase=dataset.phase)
+        return self._add(dataset=dataset)
 
-        # 3. Persist the DataFrame to file.
-        self._fao.create(
-            filepath=filepath,
-            file_format=dataset.passport.file_format,
-            dataframe=dataset.dataframe,
-            overwrite=False,
-        )
+    def add_async(
+        self,
+        dataset: Dataset,
+        entity: str = None,
+        on_registered: Optional[Callable[[Dataset], None]] = None,
+    ) -> WriteHandle:
+        """Adds a Dataset to the repository on a background thread.
+
+        Pandas dataframes are copied before returning, so the caller may go on modifying the
+        in-memory dataframe while it is written.
+
+        Args:
+            dataset (Dataset): The dataset object to be added to the repository.
+            entity (str): The class name adding the dataset.
+            on_registered (Optional[Callable[[Dataset], None]]): Called on the writer thread
+                with the registered dataset. Its exception is raised at the join points.
+
+        Returns:
+            WriteHandle: Handle on the in-memory dataset and the background write.
+        """
+        self._wait(asset_id=dataset.asset_id)
+
+        if isinstance(entity, str):
+            dataset.publish(entity=entity)
+
+        record = copy.copy(dataset)
+        if isinstance(dataset.dataframe, pd.DataFrame):
+            record.deserialize(dataframe=dataset.dataframe.copy())
+
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="repo-writer")
+            future = self._writer.submit(self._add_behind, dataset, record, on_registered)
+            self._pending[dataset.asset_id] = (dataset, future)
+        self._logger.debug(f"Writing dataset {dataset.asset_id} in the background.")
+        return WriteHandle(dataset=dataset, future=future)
+
+    def join(self) -> None:
+        """Waits for all background writes to complete.
+
+        Raises:
+            Exception: The first exception raised by a background write.
+        """
+        with self._lock:
+            asset_ids = list(self._pending)
+        errors = []
+        for asset_id in asset_ids:
+            try:
+                self._wait(asset_id=asset_id)
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            raise errors[0]
+
+    def add_file(self, dataset: Dataset, filepath: str, entity: str = None) -> Dataset:
+        """Adds a Dataset whose data has already been written to file outside the repository.
+
+        Used for datasets too large to materialize as a DataFrame, such as raw data ingested
+        directly from CSV to Parquet. The file or directory is moved into the repository and
+        the dataset is registered as if it had been added through `add`.
+
+        Args:
+            dataset (Dataset): The dataset object to be added to the repository.
+            filepath (str): Path to the file or directory containing the dataset's data.
+            entity (str): The class name adding the dataset.
+
+        Returns:
+            Dataset: The dataset
+        """
+        if not os.path.exists(filepath):
+            raise FileNotFoundError(f"The file {filepath} for dataset {dataset.asset_id} does not exist.")
+        self._wait(asset_id=dataset.asset_id)
+
+        # 1.  Update the Dataset's status to `PUBLISHED` if entity is not None.
+        if isinstance(entity, str):
+            dataset.publish(entity=entity)
+
+        # 2. Determine the repository filepath.
+        target = self._get_filepath(asset_id=dataset.asset_id,
+                                    file_format=dataset.passport.file_format,
+                                    phase=dataset.phase)
+        if os.path.exists(target):
+            raise FileExistsError(f"The file {target} for dataset {dataset.asset_id} already exists.")
 
-        # 4. Now that the file(s) have been persisted, add the fileset metadata object to the dataset
-        dataset = self._set_fileset(filepath=filepath, dataset=dataset)
+        # 3. Move the file(s) into the repository.
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.move(filepath, target)
 
-        # 5. Create the Dataset metadata object.
-        self._dao.create(asset=dataset)
+        # 4. Add the fileset metadata object to the dataset
+        dataset = self._set_fileset(filepath=target, dataset=dataset)
 
-        # 6. Add the Dataset to the registry
-        self._rao.create(asset=dataset)
+        # 5. Register the Dataset metadata object and the registry entry.
+        self._register(dataset=dataset, filepath=target)
 
         return dataset
 
@@ -154,15 +334,44 @@ class DatasetRepo(Repo):
         Note:
             This method uses `setattr` to update the internal `_data` attribute
             of the `Dataset`'s `data` object, ensuring immutability in the public API.
+            A dataset still being written by `add_async` is returned from memory when it holds
+            the requested dataframe type.
         """
+        # A dataset still being written is served from memory if it holds the requested type.
+        pending = self._get_pending(asset_id=asset_id)
+        if pending is not None:
+            dataset, future = pending
+            dftype = dftype or dataset.passport.dftype
+            spark_requested = dftype in (DFType.SPARK, DFType.SPARKNLP)
+            in_memory = (
+                isinstance(dataset.dataframe, DataFrame)
+                if spark_requested
+                else dftype == DFType.PANDAS and isinstance(dataset.dataframe, pd.DataFrame)
+            )
+            if in_memory:
+                if isinstance(entity, str):
+                    dataset.access(entity=entity)
+                    self._defer(asset_id=asset_id, future=future, task=self._update, dataset=dataset)
+                # Pandas callers get their own copy, as they would from a read.
+                if isinstance(dataset.dataframe, pd.DataFrame):
+                    served = copy.copy(dataset)
+                    served.deserialize(dataframe=dataset.dataframe.copy())
+                    return served
+                return dataset
+            self._wait(asset_id=asset_id)
+
         # 1. Obtain the dataset metadata object
-        dataset = self._dao.read(asset_id=asset_id)
+        with self._lock:
+            dataset = self._dao.read(asset_id=asset_id)
 
         # 2. If the dftype has not been provided, we'll use the dftype native to the dataset.
         dftype = dftype or dataset.passport.dftype
 
-        # 3. Read the DataFrame from file
-        df = self._fao.read(filepath=dataset.file.path, dftype=dftype, spark=spark)
+        # 3. Read the DataFrame from file, applying the declared schema of its phase and stage.
+        schema = self._schemas.get(phase=dataset.passport.phase, stage=dataset.passport.stage)
+        df = self._fao.read(
+            filepath=dataset.file.path, dftype=dftype, spark=spark, schema=schema
+        )
 
         # 4. Deserialize the dataframe
         dataset.deserialize(dataframe=df)
@@ -171,11 +380,8 @@ class DatasetRepo(Repo):
         if isinstance(entity, str):
             dataset.access(entity=entity)
 
-        # 6. Update the Dataset object metadata
-        self._dao.update(asset=dataset)
-
-        # Update the registry accordingly
-        self._rao.update(asset=dataset)
+        # 6. Update the Dataset object metadata and the registry accordingly.
+        self._update(dataset=dataset)
         return dataset
 
     def get_meta(
@@ -192,9 +398,31 @@ class DatasetRepo(Repo):
         Returns:
             DatasetPassport: The dataset's passport
         """
-        dataset_meta = self._dao.read(asset_id=asset_id)
+        pending = self._get_pending(asset_id=asset_id)
+        if pending is not None:
+            return pending[0]
+        with self._lock:
+            dataset_meta = self._dao.read(asset_id=asset_id)
         return dataset_meta
 
+    def get_columns(self, asset_id: str) -> List[str]:
+        """Returns the column names of a dataset from its file schema without reading the data.
+
+        Args:
+            asset_id (str): The identifier of the dataset.
+
+        Returns:
+            List[str]: The column names, including hive partition columns.
+        """
+        self._wait(asset_id=asset_id)
+        file = self.get_meta(asset_id=asset_id).file
+        file_format = {
+            FileFormat.CSV: "csv",
+            FileFormat.PARQUET: "parquet",
+            FileFormat.ARROW: "ipc",
+        }[file.format]
+        return ds.dataset(file.path, format=file_format, partitioning="hive").schema.names
+
     def get_asset_id(self, phase: PhaseDef, stage: StageDef, name: str) -> str:
         """Returns an asset id given the parameters
 
@@ -231,7 +459,7 @@ class DatasetRepo(Repo):
 
         """
         asset_id = self.get_asset_id(phase=phase, stage=stage, name=name)
-        if self._rao.exists(asset_id):
+        if self.exists(asset_id=asset_id):
             msg = f"ObjectExistsError: A Dataset already exists with id {asset_id}."
             self._logger.error(msg)
             raise ObjectExistsError(msg)
@@ -248,8 +476,11 @@ class DatasetRepo(Repo):
         Returns:
             None
         """
-        self._dao.update(asset=dataset)
-        self._rao.update(asset=dataset)
+        self._wait(asset_id=dataset.asset_id)
+        if dataset.file is None:
+            # Copies served while the dataset was written in the background lack its file attributes.
+            dataset.file = self.get_meta(asset_id=dataset.asset_id).file
+        self._update(dataset=dataset)
 
     def exists(self, asset_id: str) -> bool:
         """Evaluates existence of the designated dataset.
@@ -267,7 +498,91 @@ class DatasetRepo(Repo):
         Raises:
             DataIntegrityError if the dataset metadata exists and the file doesn't (or vice-versa).
         """
-        return self._rao.exists(asset_id=asset_id)
+        if self._get_pending(asset_id=asset_id) is not None:
+            return True
+        with self._lock:
+            return self._rao.exists(asset_id=asset_id)
+
+    def verify(self, asset_id: str, full: bool = False) -> bool:
+        """Verifies that the files of a dataset are unchanged since it was added.
+
+        By default, the footer fingerprint is recomputed from the Parquet footers and compared
+        with the one recorded at write time, which reads only file metadata. With `full=True`
+        the complete content fingerprint is recomputed instead. If none was recorded at write
+        time, the footers are verified and the full fingerprint of the unchanged files is
+        recorded for later verifications.
+
+        Args:
+            asset_id (str): The identifier for the dataset to verify.
+            full (bool): Whether to recompute the full content fingerprint. Default is False.
+
+        Returns:
+            bool: True if the recorded fingerprint matches the files on disk. False if the
+                files have changed, are missing, or no fingerprint was recorded.
+        """
+        self._wait(asset_id=asset_id)
+        meta = self.get_meta(asset_id=asset_id)
+        file = meta.file
+        if full and getattr(file, "fingerprint", None) is None:
+            return self.get_fingerprint(dataset=meta) is not None
+        # Datasets added before fingerprints were recorded have no such attributes.
+        expected = getattr(file, "fingerprint" if full else "footer_fingerprint", None)
+        if expected is None:
+            self._logger.debug(f"No fingerprint recorded for dataset {asset_id}.")
+            return False
+        try:
+            if full:
+                actual = self._hash_service.hash_file(filepath=file.path)
+            else:
+                actual = self._hash_service.hash_footer(filepath=file.path)
+        except FileNotFoundError:
+            self._logger.warning(f"Files for dataset {asset_id} not found at {file.path}.")
+            return False
+        if actual != expected:
+            self._logger.warning(f"Dataset {asset_id} files have changed since they were written.")
+            return False
+        return True
+
+    def get_fingerprint(self, dataset: Dataset) -> Optional[str]:
+        """Returns the full content fingerprint of a dataset's files, computing it at most once.
+
+        The footer fingerprint doesn't identify the content, as values may change without
+        changing the row counts, sizes and statistics in the footers. It is only used to check
+        that the files are unchanged since they were written, which reads just their metadata.
+        If no content fingerprint was recorded at write time, the files are hashed in full and
+        the fingerprint is recorded with the dataset, so later calls need only the footers.
+
+        The dataset's pending background write is not awaited, so the writer thread may call
+        this on the dataset it has just registered.
+
+        Args:
+            dataset (Dataset): The dataset or its metadata, with its file attributes.
+
+        Returns:
+            Optional[str]: The fingerprint, or None if the dataset has no files, they are
+                missing, or they have changed since they were written.
+        """
+        file = dataset.file
+        if file is None:
+            return None
+        try:
+            # Datasets added before footer fingerprints were recorded can't be checked.
+            expected = getattr(file, "footer_fingerprint", None)
+            actual = self._hash_service.hash_footer(filepath=file.path) if expected else None
+            if actual != expected:
+                self._logger.warning(
+                    f"Dataset {dataset.asset_id} files have changed since they were written."
+                )
+                return None
+            fingerprint = getattr(file, "fingerprint", None)
+            if fingerprint is None:
+                fingerprint = self._hash_service.hash_file(filepath=file.path)
+                file.fingerprint = fingerprint
+                self._record_fingerprint(asset_id=dataset.asset_id, file=file)
+        except FileNotFoundError:
+            self._logger.warning(f"Files for dataset {dataset.asset_id} not found at {file.path}.")
+            return None
+        return fingerprint
 
     #TODO Create a way to remove orphan datasets
     def remove(self, asset_id: str) -> None:
@@ -288,6 +603,8 @@ class DatasetRepo(Repo):
             does not exist or cannot be identified.
         """
 
+        self._wait(asset_id=asset_id)
+
         dataset_meta = None
         try:
             # Get the dataset metadata containing the dataframe's filepath.
@@ -313,11 +630,10 @@ class DatasetRepo(Repo):
                 self._logger.exception(msg)
                 raise Exception(msg)
 
-            # Remove the dataset metadata object from the repository
-            self._dao.delete(asset_id=asset_id)
-
-            # Remove the dataset from the registry
-            self._rao.delete(asset_id=asset_id)
+            # Remove the dataset metadata object and its registry entry from the repository
+            with self._lock:
+                self._dao.delete(asset_id=asset_id)
+                self._rao.delete(asset_id=asset_id)
             self._logger.debug(
                 f"Dataset {dataset_meta.asset_id}, including its file at {dataset_meta.file.path} has been removed from the repository."
             )
@@ -335,6 +651,7 @@ class DatasetRepo(Repo):
             ValueError: If any dataset's filepath does not exist or cannot be identified.
         """
         if AppConfigReader().get_environment().lower() == "test":
+            self.join()
             asset_ids = self.get_all(keys_only=True)
 
             self._logger.info(f"Datasets to be deleted: {self.count}")
@@ -349,6 +666,227 @@ class DatasetRepo(Repo):
             self._logger.error(msg)
             raise RuntimeError(msg)
 
+    def _add(self, dataset: Dataset) -> Dataset:
+        """Writes the dataset's files and registers the dataset once they are complete."""
+        # 2. Determine filepath.
+        filepath = self._get_filepath(asset_id=dataset.asset_id,
+                                      file_format=dataset.passport.file_format,
+                                      phase=dataset.phase)
+
+        try:
+            # 3. Persist the DataFrame to file, linking partitions unchanged from the source dataset.
+            partitions = self._write(filepath=filepath, dataset=dataset)
+
+            # 4. Now that the file(s) have been persisted, add the fileset metadata object to the dataset
+            dataset = self._set_fileset(filepath=filepath, dataset=dataset)
+            dataset.file.partitions = partitions
+        except Exception:
+            self._discard(filepath=filepath)
+            raise
+
+        # 5. Register the Dataset metadata object and the registry entry.
+        self._register(dataset=dataset, filepath=filepath)
+
+        return dataset
+
+    def _add_behind(
+        self,
+        dataset: Dataset,
+        record: Dataset,
+        on_registered: Optional[Callable[[Dataset], None]],
+    ) -> Dataset:
+        """Adds a dataset on the writer thread and attaches its file attributes to the caller's copy."""
+        try:
+            record = self._add(dataset=record)
+            dataset.file = record.file
+            # The copy written is no longer needed.
+            record.deserialize(dataframe=dataset.dataframe)
+            if on_registered is not None:
+                on_registered(record)
+        except Exception as e:
+            self._logger.exception(f"Background write of dataset {dataset.asset_id} failed.\n{e}")
+            raise
+        self._logger.debug(f"Background write of dataset {dataset.asset_id} complete.")
+        return record
+
+    def _register(self, dataset: Dataset, filepath: str) -> None:
+        """Creates the metadata object and registry entry together, or neither."""
+        with self._lock:
+            self._dao.create(asset=dataset)
+            try:
+                self._rao.create(asset=dataset)
+            except Exception:
+                self._dao.delete(asset_id=dataset.asset_id)
+                self._discard(filepath=filepath)
+                raise
+
+    def _discard(self, filepath: str) -> None:
+        """Removes the files of a dataset that failed to be added."""
+        if os.path.isdir(filepath):
+            shutil.rmtree(filepath, ignore_errors=True)
+        elif os.path.exists(filepath):
+            os.remove(filepath)
+
+    def _update(self, dataset: Dataset) -> None:
+        """Updates the metadata object and registry entry of a registered dataset."""
+        with self._lock:
+            self._dao.update(asset=dataset)
+            self._rao.update(asset=dataset)
+
+    def _record_fingerprint(self, asset_id: str, file: FileSet) -> None:
+        """Records the content fingerprint of a registered dataset's files in its metadata.
+
+        The metadata is read afresh, so changes made since the caller's copy was read are kept.
+        """
+        with self._lock:
+            if not self._rao.exists(asset_id=asset_id):
+                return
+            meta = self._dao.read(asset_id=asset_id)
+            if meta.file is None or meta.file.path != file.path:
+                return
+            meta.file.fingerprint = file.fingerprint
+            self._dao.update(asset=meta)
+            self._rao.update(asset=meta)
+
+    def _get_pending(self, asset_id: str) -> Optional[Tuple[Dataset, Future]]:
+        """Returns the in-memory dataset and future of a write in progress, if any."""
+        with self._lock:
+            pending = self._pending.get(asset_id)
+        if pending is None or pending[1].done():
+            return None
+        return pending
+
+    def _defer(self, asset_id: str, future: Future, task: Callable, **kwargs) -> None:
+        """Runs a metadata task on the writer thread once the pending write of a dataset completes."""
+
+        def run() -> None:
+            future.result()
+            task(**kwargs)
+
+        with self._lock:
+            pending = self._pending.get(asset_id)
+            if pending is not None:
+                self._pending[asset_id] = (pending[0], self._writer.submit(run))
+                return
+        run()
+
+    def _wait(self, asset_id: str) -> None:
+        """Waits for the background write of a dataset, raising its exception if it failed."""
+        with self._lock:
+            pending = self._pending.pop(asset_id, None)
+        if pending is not None:
+            pending[1].result()
+
+    def _write(self, filepath: str, dataset: Dataset) -> Optional[Dict[str, str]]:
+        """Writes the dataset's DataFrame, snapshotting partitions unchanged from its source.
+
+        Partitions of pandas datasets written as hive-partitioned Parquet are fingerprinted by
+        content and schema. Partitions whose fingerprint matches the same partition of the source
+        dataset would be written byte for byte as the source's files, so the source partition
+        directories are linked into the dataset instead, and only the remaining rows are written.
+
+        Args:
+            filepath (str): The path of the dataset's files.
+            dataset (Dataset): The dataset.
+
+        Returns:
+            Optional[Dict[str, str]]: Fingerprints of the dataset's partitions, keyed by
+                `column=value`, or None if the dataset is not partitioned or not a pandas dataset.
+        """
+        dataframe = dataset.dataframe
+        if (
+            not isinstance(dataframe, pd.DataFrame)
+            or dataset.passport.file_format != FileFormat.PARQUET
+        ):
+            self._fao.create(
+                filepath=filepath,
+                file_format=dataset.passport.file_format,
+                dataframe=dataframe,
+                overwrite=False,
+            )
+            return None
+
+        source = self._get_source_fileset(dataset=dataset)
+        column = None
+        unchanged = {}
+        if source is not None and source.partitions:
+            column = next(iter(source.partitions)).split("=", 1)[0]
+        partitions = (
+            self._get_partition_fingerprints(dataframe=dataframe, column=column)
+            if column in dataframe.columns
+            else None
+        )
+        if partitions:
+            directories = self._get_partition_directories(filepath=source.path)
+            unchanged = {
+                key: directories[key]
+                for key, fingerprint in partitions.items()
+                if source.partitions.get(key) == fingerprint and key in directories
+            }
+
+        # Write the rows of changed partitions, then link the unchanged partitions alongside them.
+        if unchanged:
+            values = [key.split("=", 1)[1] for key in unchanged]
+            dataframe = dataframe.loc[~dataframe[column].astype(str).isin(values)]
+        if len(dataframe) or not unchanged:
+            self._fao.create(
+                filepath=filepath,
+                file_format=dataset.passport.file_format,
+                dataframe=dataframe,
+                overwrite=False,
+            )
+        os.makedirs(filepath, exist_ok=True)
+        for key, directory in unchanged.items():
+            self._copy.snapshot(
+                source=directory, target=os.path.join(filepath, os.path.basename(directory))
+            )
+        if unchanged:
+            self._logger.debug(
+                f"Linked {len(unchanged)} of {len(partitions)} partitions of dataset "
+                f"{dataset.asset_id} from its source."
+            )
+
+        # Datasets without a partitioned source are fingerprinted by the layout just written.
+        if partitions is None and os.path.isdir(filepath):
+            directories = self._get_partition_directories(filepath=filepath)
+            column = next(iter(directories), "").split("=", 1)[0]
+            if column in dataset.dataframe.columns:
+                partitions = self._get_partition_fingerprints(
+                    dataframe=dataset.dataframe, column=column
+                )
+        return partitions
+
+    def _get_source_fileset(self, dataset: Dataset) -> Optional[FileSet]:
+        """Returns the fileset of the dataset's source dataset, if it is in the repository."""
+        source = dataset.passport.source
+        if source is None:
+            return None
+        # Runs on the writer thread while the caller may be updating the source's metadata, so
+        # the registration check and the read are made together under the lock.
+        with self._lock:
+            if not self._rao.exists(asset_id=source.asset_id):
+                return None
+            fileset = self._dao.read(asset_id=source.asset_id).file
+        if fileset is None or not os.path.isdir(fileset.path):
+            return None
+        return fileset
+
+    def _get_partition_fingerprints(self, dataframe: pd.DataFrame, column: str) -> Dict[str, str]:
+        """Fingerprints each partition of a DataFrame, keyed by `column=value`."""
+        return {
+            f"{column}={value}": self._hash_service.hash_dataframe(partition)
+            for value, partition in dataframe.groupby(column, observed=True, sort=False)
+        }
+
+    @staticmethod
+    def _get_partition_directories(filepath: str) -> Dict[str, str]:
+        """Returns the hive partition directories of a dataset, keyed by unescaped `column=value`."""
+        return {
+            unquote(entry.name): entry.path
+            for entry in os.scandir(filepath)
+            if entry.is_dir() and "=" in entry.name
+        }
+
     def _get_filepath(self, asset_id: str, file_format: FileFormat, phase: PhaseDef) -> str:
 
         try:
@@ -387,6 +925,11 @@ class DatasetRepo(Repo):
         file = FileAttr.get_fileset(
             filepath=filepath, file_format=dataset.passport.file_format
         )
+        # The footer fingerprint identifies Parquet files for cache validation from their
+        # metadata alone. Other formats have no footers, so their content is hashed in full.
+        file.footer_fingerprint = self._hash_service.hash_footer(filepath=filepath)
+        if self._full_fingerprint or dataset.passport.file_format != FileFormat.PARQUET:
+            file.fingerprint = self._hash_service.hash_file(filepath=filepath)
 
         dataset.file = file
         return dataset
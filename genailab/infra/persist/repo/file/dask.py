@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday September 22nd 2024 05:36:35 pm                                              #
-# Modified   : Friday January 31st 2025 03:49:49 am                                                #
+# Modified   : Monday October 19th 2026 06:41:07 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -20,12 +20,16 @@
 from __future__ import annotations
 
 import logging
+from typing import Optional
 
 import dask.dataframe as dd
 
+from genailab.core.schema import Schema
 from genailab.infra.exception.file import FileIOException
 from genailab.infra.persist.repo.file.base import DataFrameReader as BaseDataFrameReader
 from genailab.infra.persist.repo.file.base import DataFrameWriter as BaseDataFrameWriter
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.layout import ParquetLayout
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -38,13 +42,15 @@ class DaskDataFrameParquetReader(BaseDataFrameReader):
         self._kwargs = kwargs
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def read(self, filepath: str, **kwargs) -> dd.DataFrame:
+    def read(self, filepath: str, schema: Optional[Schema] = None, **kwargs) -> dd.DataFrame:
         """
         Reads a Parquet file into a Dask DataFrame.
 
         Args:
             filepath (str): The path to the Parquet file.
-            **kwargs: Additional keyword arguments passed to `dask.read_parquet`.
+            schema (Optional[Schema]): Declared schema of the dataset. Declared columns stored
+                with a different dtype are cast to the declared dtype.
+            **kwargs: Unused. Reader options are taken from the `read_kwargs` configuration.
 
         Returns:
             pd.DataFrame: A Dask DataFrame containing the dataframe from the Parquet file.
@@ -57,6 +63,13 @@ class DaskDataFrameParquetReader(BaseDataFrameReader):
             df = dd.read_parquet(path=filepath, **self._kwargs)
             msg = f"{self.__class__.__name__} read from {filepath}"
             self._logger.debug(msg)
+            if schema is not None:
+                dtypes = {
+                    column: dtype
+                    for column, dtype in schema.dtypes.items()
+                    if column in df.columns and str(df[column].dtype) != dtype
+                }
+                df = df.astype(dtypes) if dtypes else df
             return df
         except FileNotFoundError as e:
             msg = f"Exception occurred while reading a Parquet file from {filepath}. File does not exist.\n{e}"
@@ -72,10 +85,25 @@ class DaskDataFrameParquetReader(BaseDataFrameReader):
 #                                  DATAFRAME WRITERS                                               #
 # ------------------------------------------------------------------------------------------------ #
 class DaskDataFrameParquetWriter(BaseDataFrameWriter):
-    """Writes a dask DataFrame to a parquet file."""
+    """Writes a dask DataFrame to a parquet file.
 
-    def __init__(self, kwargs: dict) -> None:
+    Args:
+        kwargs (dict): Keyword arguments passed to `dask.DataFrame.to_parquet`.
+        layout (Optional[ParquetLayout]): Plans partition sizes, row order and row group sizes.
+            If None, the DataFrame is written as is.
+        encoding (Optional[ParquetEncoding]): Chooses the compression and encoding of each
+            column. If None, the compression in `kwargs` applies to all columns.
+    """
+
+    def __init__(
+        self,
+        kwargs: dict,
+        layout: Optional[ParquetLayout] = None,
+        encoding: Optional[ParquetEncoding] = None,
+    ) -> None:
         self._kwargs = kwargs
+        self._layout = layout
+        self._encoding = encoding
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     def write(
@@ -96,7 +124,20 @@ class DaskDataFrameParquetWriter(BaseDataFrameWriter):
         """
         self.validate_write(filepath, **self._kwargs)
         try:
-            dataframe.to_parquet(path=filepath, **self._kwargs)
+            kwargs = dict(self._kwargs)
+            partition_on = kwargs.get("partition_on")
+            if isinstance(partition_on, str):
+                partition_on = [partition_on]
+            if self._layout is not None:
+                dataframe, layout_kwargs = self._layout.plan_dask(
+                    dataframe=dataframe, partition_on=partition_on
+                )
+                kwargs.update(layout_kwargs)
+            if self._encoding is not None:
+                kwargs.update(
+                    self._encoding.plan_dask(dataframe=dataframe, partition_on=partition_on)
+                )
+            dataframe.to_parquet(path=filepath, **kwargs)
             msg = f"{self.__class__.__name__} wrote to {filepath}"
             self._logger.debug(msg)
         except Exception as e:
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/persist/repo/file/encoding.py                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:33:06 pm                                                #
+# Modified   : Monday October 19th 2026 08:00:18 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Parquet Column Encoding Policy Module"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+import dask.dataframe as dd
+import pandas as pd
+import pyarrow as pa
+from pyspark.sql import DataFrame
+from pyspark.sql.types import BooleanType, DoubleType, FloatType, TimestampType
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                  PARQUET ENCODING                                                #
+# ------------------------------------------------------------------------------------------------ #
+class ParquetEncoding:
+    """Chooses the compression and encoding of each column written by the Parquet writers.
+
+    Columns are classified by name and dtype, and each class is written with the encoding best
+    suited to its values:
+
+    - Text (`text_columns`): compressed at `text_compression_level`, never dictionary encoded.
+    - Categorical (`dictionary_columns` and pandas `category` columns): dictionary encoded.
+    - Dates: DELTA_BINARY_PACKED.
+    - Floats: BYTE_STREAM_SPLIT, which groups the bytes of each value so they compress well.
+    - Booleans: RLE.
+
+    Remaining columns keep the writer defaults. All columns are compressed with `compression`.
+
+    The pandas and Dask writers apply the policy column by column through pyarrow. Spark's
+    Parquet writer chooses encodings by writer version rather than by column, so Spark files
+    are written with the v2 writer, which delta encodes integer and timestamp columns and RLE
+    encodes booleans once dictionary encoding is disabled for them. Spark applies one
+    compression level to the whole file, so `text_compression_level` is used when a text column
+    is present, as text dominates the size of the data. Timestamps are written as INT64
+    microseconds, since INT96 timestamps cannot be delta encoded.
+
+    Args:
+        compression (str): Compression codec for all columns. Defaults to 'zstd'.
+        compression_level (Optional[int]): Compression level for non-text columns.
+        text_columns (Optional[List[str]]): Free-text columns.
+        text_compression_level (Optional[int]): Compression level for text columns.
+        dictionary_columns (Optional[List[str]]): Low-cardinality columns to dictionary encode.
+        delta_dates (bool): Whether date and timestamp columns are delta encoded.
+        byte_stream_split_floats (bool): Whether float columns are byte-stream-split encoded.
+        rle_booleans (bool): Whether boolean columns are RLE encoded.
+    """
+
+    def __init__(
+        self,
+        compression: str = "zstd",
+        compression_level: Optional[int] = 3,
+        text_columns: Optional[List[str]] = None,
+        text_compression_level: Optional[int] = 9,
+        dictionary_columns: Optional[List[str]] = None,
+        delta_dates: bool = True,
+        byte_stream_split_floats: bool = True,
+        rle_booleans: bool = True,
+    ) -> None:
+        self._compression = compression
+        self._compression_level = compression_level
+        self._text_columns = list(text_columns or [])
+        self._text_compression_level = text_compression_level
+        self._dictionary_columns = list(dictionary_columns or [])
+        self._delta_dates = delta_dates
+        self._byte_stream_split_floats = byte_stream_split_floats
+        self._rle_booleans = rle_booleans
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> ParquetEncoding:
+        """Creates a policy from the `io.encoding` configuration, using defaults if absent."""
+        return cls(**(config or {}))
+
+    # -------------------------------------------------------------------------------------------- #
+    def plan_pandas(
+        self, dataframe: pd.DataFrame, partition_cols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Returns the `to_parquet` keyword arguments that apply the policy to a pandas DataFrame.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to write.
+            partition_cols (Optional[List[str]]): Hive partition columns, which are not
+                written to the files.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to add to `to_parquet`.
+        """
+        return self._plan_pyarrow(dtypes=dataframe.dtypes, partition_cols=partition_cols)
+
+    def plan_dask(
+        self, dataframe: dd.DataFrame, partition_on: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Returns the `to_parquet` keyword arguments that apply the policy to a Dask DataFrame.
+
+        Args:
+            dataframe (dd.DataFrame): The DataFrame to write.
+            partition_on (Optional[List[str]]): Hive partition columns, which are not
+                written to the files.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to add to `to_parquet`.
+        """
+        return self._plan_pyarrow(dtypes=dataframe.dtypes, partition_cols=partition_on)
+
+    def plan_arrow(
+        self, schema: pa.Schema, partition_cols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Returns the Parquet write options that apply the policy to Arrow data of a schema.
+
+        Args:
+            schema (pa.Schema): The schema of the record batches to write.
+            partition_cols (Optional[List[str]]): Hive partition columns, which are not
+                written to the files.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to `ParquetFileFormat.make_write_options`.
+        """
+        dtypes = schema.empty_table().to_pandas().dtypes
+        return self._plan_pyarrow(dtypes=dtypes, partition_cols=partition_cols)
+
+    def plan_spark(self, dataframe: DataFrame) -> Dict[str, str]:
+        """Returns the DataFrameWriter options that apply the policy to a Spark DataFrame.
+
+        Args:
+            dataframe (DataFrame): The DataFrame to write.
+
+        Returns:
+            Dict[str, str]: The options to set on the DataFrameWriter.
+        """
+        fields = {field.name: field.dataType for field in dataframe.schema.fields}
+        text = [column for column in self._text_columns if column in fields]
+
+        options = {"compression": self._compression}
+        level = self._text_compression_level if text else self._compression_level
+        if level is not None:
+            options[f"parquet.compression.codec.{self._compression}.level"] = str(level)
+
+        for column in text:
+            options[f"parquet.enable.dictionary#{column}"] = "false"
+        for column in self._dictionary_columns:
+            if column in fields:
+                options[f"parquet.enable.dictionary#{column}"] = "true"
+
+        dates = [column for column, dtype in fields.items() if isinstance(dtype, TimestampType)]
+        booleans = [column for column, dtype in fields.items() if isinstance(dtype, BooleanType)]
+        v2_columns = (dates if self._delta_dates else []) + (booleans if self._rle_booleans else [])
+        if v2_columns:
+            options["parquet.writer.version"] = "v2"
+            for column in v2_columns:
+                options[f"parquet.enable.dictionary#{column}"] = "false"
+        if self._byte_stream_split_floats and any(
+            isinstance(dtype, (FloatType, DoubleType)) for dtype in fields.values()
+        ):
+            options["parquet.enable.byte.stream.split"] = "true"
+
+        self._logger.debug(f"Planned Spark Parquet encodings: {options}.")
+        return options
+
+    def plan_spark_conf(self, dataframe: DataFrame) -> Dict[str, str]:
+        """Returns the session settings the Spark writer needs while writing a DataFrame.
+
+        Spark takes the Parquet timestamp type from the session, overriding any writer option,
+        so the writer sets these for the duration of the write and then restores the session.
+
+        Args:
+            dataframe (DataFrame): The DataFrame to write.
+
+        Returns:
+            Dict[str, str]: The session settings to apply during the write.
+        """
+        if self._delta_dates and any(
+            isinstance(field.dataType, TimestampType) for field in dataframe.schema.fields
+        ):
+            return {"spark.sql.parquet.outputTimestampType": "TIMESTAMP_MICROS"}
+        return {}
+
+    # -------------------------------------------------------------------------------------------- #
+    def _plan_pyarrow(
+        self, dtypes: pd.Series, partition_cols: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Maps each written column to its pyarrow compression level and encoding."""
+        partition_cols = list(partition_cols or [])
+        compression_level = {}
+        column_encoding = {}
+        use_dictionary = []
+        for column, dtype in dtypes.items():
+            if column in partition_cols:
+                continue
+            encoding = self._get_encoding(column=column, dtype=dtype)
+            if column in self._text_columns:
+                level = self._text_compression_level
+            else:
+                level = self._compression_level
+            if level is not None:
+                compression_level[column] = level
+            if encoding is None:
+                use_dictionary.append(column)
+            else:
+                column_encoding[column] = encoding
+
+        kwargs = {
+            "compression": self._compression,
+            "use_dictionary": use_dictionary,
+            "column_encoding": column_encoding,
+        }
+        if compression_level:
+            kwargs["compression_level"] = compression_level
+        self._logger.debug(f"Planned pyarrow Parquet encodings: {kwargs}.")
+        return kwargs
+
+    def _get_encoding(self, column: str, dtype: Any) -> Optional[str]:
+        """Returns the non-dictionary encoding of a column, or None to dictionary encode it."""
+        if column in self._text_columns:
+            return "PLAIN"
+        if column in self._dictionary_columns or isinstance(dtype, pd.CategoricalDtype):
+            return None
+        if self._delta_dates and pd.api.types.is_datetime64_any_dtype(dtype):
+            return "DELTA_BINARY_PACKED"
+        if self._byte_stream_split_floats and pd.api.types.is_float_dtype(dtype):
+            return "BYTE_STREAM_SPLIT"
+        if self._rle_booleans and pd.api.types.is_bool_dtype(dtype):
+            return "RLE"
+        return None
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday December 26th 2024 02:21:28 pm                                             #
-# Modified   : Friday January 31st 2025 04:37:38 am                                                #
+# Modified   : Monday October 19th 2026 08:03:31 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -19,6 +19,7 @@
 """DataFrame IO Factory Module"""
 import logging
 
+import pyarrow as pa
 from genailab.core.dtypes import DFType
 from genailab.infra.persist.repo.file.base import (
     DataFrameReader,
@@ -29,7 +30,11 @@ from genailab.infra.persist.repo.file.dask import (
     DaskDataFrameParquetReader,
     DaskDataFrameParquetWriter,
 )
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.layout import ParquetLayout
 from genailab.infra.persist.repo.file.pandas import (
+    PandasDataFrameArrowReader,
+    PandasDataFrameArrowWriter,
     PandasDataFrameCSVReader,
     PandasDataFrameCSVWriter,
     PandasDataFrameParquetReader,
@@ -50,12 +55,16 @@ class DataFrameIOFactory(IOFactory):
 
     Args:
         config (dict): A nested dictionary containing `read_kwargs` and `write_kwargs`
-                       for each `dftype` and `file_format` combination.
+                       for each `dftype` and `file_format` combination, and the Parquet
+                       `layout` and column `encoding` shared by the Parquet writers.
+                       The pandas Parquet `io_threads` option sizes pyarrow's process-wide
+                       IO thread pool, so it is applied once, when the factory is created.
     """
 
     __reader_map = {
         "pandas_csv": PandasDataFrameCSVReader,
         "pandas_parquet": PandasDataFrameParquetReader,
+        "pandas_arrow": PandasDataFrameArrowReader,
         "spark_csv": SparkDataFrameCSVReader,
         "spark_parquet": SparkDataFrameParquetReader,
         "sparknlp_parquet": SparkDataFrameParquetReader,
@@ -64,6 +73,7 @@ class DataFrameIOFactory(IOFactory):
     __writer_map = {
         "pandas_csv": PandasDataFrameCSVWriter,
         "pandas_parquet": PandasDataFrameParquetWriter,
+        "pandas_arrow": PandasDataFrameArrowWriter,
         "spark_csv": SparkDataFrameCSVWriter,
         "spark_parquet": SparkDataFrameParquetWriter,
         "sparknlp_parquet": SparkDataFrameParquetWriter,
@@ -72,6 +82,17 @@ class DataFrameIOFactory(IOFactory):
 
     def __init__(self, config: dict) -> None:
         self._config = config
+        self._set_io_threads()
+
+    def _set_io_threads(self) -> None:
+        """Sizes pyarrow's IO thread pool from the pandas Parquet `read_kwargs`, if set."""
+        try:
+            io_threads = self._config["pandas"]["parquet"]["read_kwargs"].get("io_threads")
+        except (KeyError, TypeError, AttributeError):
+            return
+        if io_threads and io_threads != pa.io_thread_count():
+            logging.debug(f"Setting the pyarrow IO thread count to {io_threads}")
+            pa.set_io_thread_count(io_threads)
 
     def get_reader(
         self, dftype: DFType, file_format: FileFormat = FileFormat.PARQUET
@@ -123,6 +144,12 @@ class DataFrameIOFactory(IOFactory):
             logging.debug(f"Requesting a {key} writer from the DataFrameIOFactory")
             writer = self.__writer_map[key]
             kwargs = self._config[dftype.value][file_format.value]["write_kwargs"]
+            if file_format == FileFormat.PARQUET:
+                return writer(
+                    kwargs,
+                    layout=ParquetLayout.from_config(self._config.get("layout")),
+                    encoding=ParquetEncoding.from_config(self._config.get("encoding")),
+                )
             return writer(kwargs)
         except KeyError as e:
             raise ValueError(
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday December 26th 2024 04:10:40 pm                                             #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -20,10 +20,12 @@
 import logging
 import os
 import shutil
-from typing import Optional, Union
+from typing import Iterator, List, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
 from genailab.core.dtypes import DFType
+from genailab.core.schema import Schema
 from genailab.infra.persist.repo.base import DAL
 from genailab.infra.persist.repo.file.factory import DataFrameIOFactory
 from genailab.infra.utils.file.fileset import FileFormat
@@ -105,6 +107,7 @@ class FAO(DAL):
         dftype: DFType,
         file_format: Optional[FileFormat] = None,
         spark: Optional[SparkSession] = None,
+        schema: Optional[Schema] = None,
     ) -> DataFrame:
         """
         Reads a dataset from the specified file path with the given format and type.
@@ -114,6 +117,8 @@ class FAO(DAL):
             dftype (DFType): The type of the dataframe (e.g., PANDAS, SPARK).
             spark (Optional[SparkSession]): A Spark session, required for Spark-based
                 operations. Defaults to None.
+            schema (Optional[Schema]): Declared schema applied by the reader instead of
+                inferring types. Defaults to None.
 
         Returns:
             DataFrame: The loaded dataset as a Pandas or Spark dataframe.
@@ -127,7 +132,52 @@ class FAO(DAL):
             dftype=dftype,
             file_format=file_format,
         )
-        return reader.read(filepath=filepath, spark=spark)
+        return reader.read(filepath=filepath, spark=spark, schema=schema)
+
+    def iter_batches(
+        self,
+        filepath: str,
+        file_format: Optional[FileFormat] = None,
+        schema: Optional[Schema] = None,
+        batch_size: Optional[int] = None,
+        columns: Optional[List[str]] = None,
+        arrow: bool = False,
+    ) -> Iterator[Union[pd.DataFrame, pa.RecordBatch]]:
+        """
+        Streams a dataset from the specified file path as pandas DataFrames or Arrow batches.
+
+        Args:
+            filepath (str): The path to the dataset file or directory.
+            file_format (Optional[FileFormat]): The file format. Defaults to Parquet.
+            schema (Optional[Schema]): Declared schema applied to pandas batches. Defaults to None.
+            batch_size (Optional[int]): Maximum number of rows per batch. Defaults to the
+                reader's configured batch size.
+            columns (Optional[List[str]]): Columns to read. Defaults to all columns.
+            arrow (bool): Whether to yield Arrow record batches rather than pandas DataFrames.
+                Defaults to False.
+
+        Yields:
+            Union[pd.DataFrame, pa.RecordBatch]: The dataset, one batch of rows at a time.
+
+        Raises:
+            ValueError: If the reader for the file format cannot stream batches.
+        """
+        file_format = file_format or FileFormat.PARQUET
+
+        reader = self._iofactory.get_reader(
+            dftype=DFType.PANDAS,
+            file_format=file_format,
+        )
+        if not hasattr(reader, "iter_batches"):
+            raise ValueError(f"Streaming is not supported for {file_format.value} files.")
+        if arrow:
+            yield from reader.iter_record_batches(
+                filepath=filepath, batch_size=batch_size, columns=columns
+            )
+        else:
+            yield from reader.iter_batches(
+                filepath=filepath, schema=schema, batch_size=batch_size, columns=columns
+            )
 
     def exists(self, filepath: str) -> bool:
         """
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/persist/repo/file/ingest.py                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:42:38 pm                                                #
+# Modified   : Monday October 19th 2026 06:42:38 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""CSV Ingest Module"""
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+
+from genailab.core.schema import Schema
+from genailab.infra.exception.file import FileIOException
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.layout import ParquetLayout
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      CSV INGESTOR                                                #
+# ------------------------------------------------------------------------------------------------ #
+class CSVIngestor:
+    """Converts raw CSV dumps to partitioned Parquet datasets in a streaming fashion.
+
+    The CSV file is parsed block by block with `pyarrow.csv`, using multiple threads per block,
+    directly into the declared types of the dataset schema. Record batches are written to a
+    hive-partitioned Parquet dataset as they are parsed, so memory is bounded by a few blocks
+    plus one buffered row group per open partition, regardless of the size of the file. Files
+    are written with the configured Parquet layout row limits and column encoding policy.
+
+    Args:
+        config (Dict[str, Any]): The `io` configuration. Ingest options are read from
+            `io.ingest`, and the Parquet layout and encoding from `io.layout` and
+            `io.encoding`:
+            - block_size (int): Bytes of CSV parsed per block. Defaults to 64 MB.
+            - use_threads (bool): Whether blocks are parsed and converted in parallel.
+            - newlines_in_values (bool): Whether quoted values may contain newlines.
+            - encoding (str): Character encoding of the CSV files. Defaults to utf8.
+            - partition_cols (List[str]): Hive partition columns.
+    """
+
+    def __init__(self, config: Dict[str, Any]) -> None:
+        ingest = config.get("ingest") or {}
+        self._block_size = ingest.get("block_size", 67108864)
+        self._use_threads = ingest.get("use_threads", True)
+        self._newlines_in_values = ingest.get("newlines_in_values", True)
+        self._encoding = ingest.get("encoding", "utf8")
+        self._partition_cols: List[str] = list(ingest.get("partition_cols") or [])
+        self._layout = ParquetLayout.from_config(config.get("layout"))
+        self._parquet_encoding = ParquetEncoding.from_config(config.get("encoding"))
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def ingest(self, source: str, destination: str, schema: Optional[Schema] = None) -> int:
+        """Converts a CSV file, or a directory of CSV files, to a hive-partitioned Parquet dataset.
+
+        Args:
+            source (str): Path to the CSV file or to a directory of CSV files sharing a header.
+            destination (str): Directory of the Parquet dataset. Must not exist.
+            schema (Optional[Schema]): Declared schema of the dataset. Columns absent from the
+                schema are typed by inference on the first block.
+
+        Returns:
+            int: The number of rows ingested.
+
+        Raises:
+            FileNotFoundError: If the source file does not exist.
+            FileExistsError: If the destination already exists.
+            FileIOException: If any other exception occurs while ingesting the file.
+        """
+        sources = self._get_sources(source=source)
+        if os.path.exists(destination):
+            raise FileExistsError(f"The ingest destination {destination} already exists.")
+        try:
+            reader = self._open(source=sources[0], schema=schema)
+            first = next(iter(reader), None)
+            if first is None:
+                raise ValueError(f"The CSV file {sources[0]} contains no rows.")
+
+            rows = 0
+
+            def batches() -> Iterator[pa.RecordBatch]:
+                nonlocal rows
+                readers = itertools.chain(
+                    [itertools.chain([first], reader)],
+                    (self._open(source=path, schema=schema) for path in sources[1:]),
+                )
+                for batch in itertools.chain.from_iterable(readers):
+                    rows += batch.num_rows
+                    yield batch
+
+            partitioning = None
+            if self._partition_cols:
+                partitioning = ds.partitioning(
+                    pa.schema([reader.schema.field(column) for column in self._partition_cols]),
+                    flavor="hive",
+                )
+            file_format = ds.ParquetFileFormat()
+            file_options = file_format.make_write_options(
+                write_page_index=self._layout.page_index,
+                **self._parquet_encoding.plan_arrow(
+                    schema=reader.schema, partition_cols=self._partition_cols
+                ),
+            )
+            ds.write_dataset(
+                pa.RecordBatchReader.from_batches(reader.schema, batches()),
+                destination,
+                format=file_format,
+                file_options=file_options,
+                partitioning=partitioning,
+                basename_template="part-{i}.parquet",
+                existing_data_behavior="error",
+                **self._layout.plan_arrow(batch=first),
+            )
+            self._logger.debug(f"Ingested {rows} rows from {source} to {destination}.")
+            return rows
+        except Exception as e:
+            msg = f"Exception occurred while ingesting CSV file {source} to {destination}.\n{e}"
+            raise FileIOException(msg, e) from e
+
+    def _get_sources(self, source: str) -> List[str]:
+        """Returns the CSV files at the source path."""
+        if os.path.isdir(source):
+            sources = sorted(str(path) for path in Path(source).glob("*.csv"))
+            if sources:
+                return sources
+        elif os.path.isfile(source):
+            return [source]
+        raise FileNotFoundError(f"No CSV file(s) found at {source}.")
+
+    def _open(self, source: str, schema: Optional[Schema]) -> pacsv.CSVStreamingReader:
+        """Opens a streaming reader that parses the CSV into the declared column types."""
+        column_types = {}
+        if schema is not None:
+            column_types = {field.name: field.type for field in schema.arrow_schema}
+        return pacsv.open_csv(
+            source,
+            read_options=pacsv.ReadOptions(
+                block_size=self._block_size,
+                use_threads=self._use_threads,
+                encoding=self._encoding,
+            ),
+            parse_options=pacsv.ParseOptions(newlines_in_values=self._newlines_in_values),
+            convert_options=pacsv.ConvertOptions(column_types=column_types),
+        )
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/persist/repo/file/layout.py                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:29:55 pm                                                #
+# Modified   : Monday October 19th 2026 07:59:17 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Parquet Layout Planner Module"""
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+import dask.dataframe as dd
+import pandas as pd
+import pyarrow as pa
+from pyspark.sql import DataFrame
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                     PARQUET LAYOUT                                               #
+# ------------------------------------------------------------------------------------------------ #
+class ParquetLayout:
+    """Plans the physical layout of Parquet datasets for the pandas, Spark and Dask writers.
+
+    The planner turns byte-size targets into the row counts each engine understands, sorts rows
+    within partitions so row group min/max statistics are selective, and produces the writer
+    options that carry the plan. Sizes are measured on the in-memory (uncompressed)
+    representation of the data, so files on disk are smaller than the targets by roughly the
+    compression ratio.
+
+    - Pandas: rows are sorted and written with `row_group_size` and, for partitioned datasets,
+      `max_rows_per_file`, so a skewed partition is split over several files.
+    - Spark: the DataFrame is range-partitioned on the partition and sort keys into
+      `ceil(size / target_file_size)` tasks and sorted within each. Large partitions are spread
+      over several files while small ones stay in a single file. Row groups are sized with
+      `parquet.block.size` and bloom filters are written for `bloom_filter_columns`. The size
+      is the optimizer's estimate for the plan, so planning does not evaluate the DataFrame;
+      for file sources it is the size of the files, not of the rows in memory.
+    - Dask: partitions are resized to the target file size and sorted, and row groups are sized
+      from the bytes per row of the first partition.
+
+    Bloom filters are written by the Spark writer only; pyarrow does not yet write them, so the
+    pandas and Dask writers write page indexes instead when `page_index` is set.
+
+    Args:
+        target_file_size (int): Target in-memory size of each file in bytes. Defaults to 512 MB.
+        target_row_group_size (int): Target in-memory size of each row group in bytes.
+            Defaults to 128 MB.
+        sort_by (Optional[List[str]]): Columns by which rows are sorted within partitions.
+            Columns absent from a DataFrame are ignored.
+        bloom_filter_columns (Optional[List[str]]): Columns for which Spark writes bloom filters.
+        bloom_filter_ndv (int): Expected number of distinct values per bloom filter.
+        page_index (bool): Whether pyarrow writers write column and offset page indexes.
+    """
+
+    def __init__(
+        self,
+        target_file_size: int = 536870912,
+        target_row_group_size: int = 134217728,
+        sort_by: Optional[List[str]] = None,
+        bloom_filter_columns: Optional[List[str]] = None,
+        bloom_filter_ndv: int = 1000000,
+        page_index: bool = True,
+    ) -> None:
+        self._target_file_size = target_file_size
+        self._target_row_group_size = target_row_group_size
+        self._sort_by = list(sort_by or [])
+        self._bloom_filter_columns = list(bloom_filter_columns or [])
+        self._bloom_filter_ndv = bloom_filter_ndv
+        self._page_index = page_index
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> ParquetLayout:
+        """Creates a layout from the `io.layout` configuration, using defaults if absent."""
+        return cls(**(config or {}))
+
+    # -------------------------------------------------------------------------------------------- #
+    def plan_pandas(
+        self, dataframe: pd.DataFrame, partition_cols: Optional[List[str]] = None
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """Sorts a pandas DataFrame and returns it with the `to_parquet` layout arguments.
+
+        Args:
+            dataframe (pd.DataFrame): The DataFrame to write.
+            partition_cols (Optional[List[str]]): Hive partition columns, if any.
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, Any]]: The sorted DataFrame and the keyword arguments
+                to add to `to_parquet`.
+        """
+        keys = self._get_sort_keys(columns=dataframe.columns, partition_cols=partition_cols)
+        if keys:
+            dataframe = dataframe.sort_values(by=keys, kind="stable", ignore_index=True)
+
+        bytes_per_row = self._bytes_per_row(
+            size=dataframe.memory_usage(deep=True).sum(), rows=len(dataframe)
+        )
+        rows_per_row_group = self._rows(size=self._target_row_group_size, bytes_per_row=bytes_per_row)
+        kwargs = {"row_group_size": rows_per_row_group, "write_page_index": self._page_index}
+        if partition_cols:
+            kwargs["max_rows_per_file"] = max(
+                self._rows(size=self._target_file_size, bytes_per_row=bytes_per_row),
+                rows_per_row_group,
+            )
+        self._logger.debug(f"Planned pandas Parquet layout: sort by {keys}, {kwargs}.")
+        return dataframe, kwargs
+
+    def plan_spark(
+        self, dataframe: DataFrame, partition_cols: Optional[List[str]] = None
+    ) -> Tuple[DataFrame, Dict[str, Any]]:
+        """Range-partitions and sorts a Spark DataFrame and returns the writer options.
+
+        Args:
+            dataframe (DataFrame): The DataFrame to write.
+            partition_cols (Optional[List[str]]): Hive partition columns, if any.
+
+        Returns:
+            Tuple[DataFrame, Dict[str, Any]]: The planned DataFrame and the options to set on
+                the DataFrameWriter.
+        """
+        size = self._plan_size(dataframe=dataframe)
+        if size is None:
+            num_files = dataframe.rdd.getNumPartitions()
+        else:
+            num_files = max(1, math.ceil(size / self._target_file_size))
+
+        keys = self._get_sort_keys(columns=dataframe.columns, partition_cols=partition_cols)
+        if keys:
+            dataframe = dataframe.repartitionByRange(num_files, *keys).sortWithinPartitions(*keys)
+        else:
+            dataframe = dataframe.repartition(num_files)
+
+        options = {"parquet.block.size": str(self._target_row_group_size)}
+        for column in self._bloom_filter_columns:
+            if column in dataframe.columns:
+                options[f"parquet.bloom.filter.enabled#{column}"] = "true"
+                options[f"parquet.bloom.filter.expected.ndv#{column}"] = str(self._bloom_filter_ndv)
+        self._logger.debug(
+            f"Planned Spark Parquet layout: {num_files} files, sort by {keys}, {options}."
+        )
+        return dataframe, options
+
+    @staticmethod
+    def _plan_size(dataframe: DataFrame) -> Optional[int]:
+        """Returns the optimizer's size estimate for a Spark DataFrame, or None if it has none.
+
+        The estimate comes from the statistics of the optimized logical plan, that is the sizes
+        of the source files or in-memory relations propagated through the plan, so no job runs.
+        Plans the optimizer cannot size report `spark.sql.defaultSizeInBytes`, which is
+        effectively unbounded; those keep their current partitioning.
+        """
+        plan = dataframe._jdf.queryExecution().optimizedPlan()
+        size = int(plan.stats().sizeInBytes().toString())
+        default = int(dataframe.sparkSession.conf.get("spark.sql.defaultSizeInBytes"))
+        return None if size >= default else size
+
+    def plan_dask(
+        self, dataframe: dd.DataFrame, partition_on: Optional[List[str]] = None
+    ) -> Tuple[dd.DataFrame, Dict[str, Any]]:
+        """Resizes and sorts the partitions of a Dask DataFrame and returns the layout arguments.
+
+        Args:
+            dataframe (dd.DataFrame): The DataFrame to write.
+            partition_on (Optional[List[str]]): Hive partition columns, if any.
+
+        Returns:
+            Tuple[dd.DataFrame, Dict[str, Any]]: The planned DataFrame and the keyword arguments
+                to add to `to_parquet`.
+        """
+        sample = dataframe.get_partition(0).compute()
+        bytes_per_row = self._bytes_per_row(
+            size=sample.memory_usage(deep=True).sum(), rows=len(sample)
+        )
+        dataframe = dataframe.repartition(partition_size=self._target_file_size)
+
+        keys = self._get_sort_keys(columns=dataframe.columns, partition_cols=partition_on)
+        if keys:
+            dataframe = dataframe.map_partitions(
+                lambda df: df.sort_values(by=keys, kind="stable"), meta=dataframe._meta
+            )
+        kwargs = {
+            "row_group_size": self._rows(size=self._target_row_group_size, bytes_per_row=bytes_per_row),
+            "write_page_index": self._page_index,
+        }
+        self._logger.debug(f"Planned Dask Parquet layout: sort by {keys}, {kwargs}.")
+        return dataframe, kwargs
+
+    def plan_arrow(self, batch: pa.RecordBatch) -> Dict[str, Any]:
+        """Returns the `pyarrow.dataset.write_dataset` row limits for a stream of record batches.
+
+        Streams are written as they arrive, so rows are not sorted. Row counts are derived
+        from the bytes per row of the first batch.
+
+        Args:
+            batch (pa.RecordBatch): The first record batch of the stream.
+
+        Returns:
+            Dict[str, Any]: The keyword arguments to add to `write_dataset`.
+        """
+        bytes_per_row = self._bytes_per_row(size=batch.nbytes, rows=batch.num_rows)
+        rows_per_row_group = self._rows(size=self._target_row_group_size, bytes_per_row=bytes_per_row)
+        kwargs = {
+            "min_rows_per_group": rows_per_row_group,
+            "max_rows_per_group": rows_per_row_group,
+            "max_rows_per_file": max(
+                self._rows(size=self._target_file_size, bytes_per_row=bytes_per_row),
+                rows_per_row_group,
+            ),
+        }
+        self._logger.debug(f"Planned Arrow Parquet layout: {kwargs}.")
+        return kwargs
+
+    def sort_arrow(self, table: pa.Table) -> pa.Table:
+        """Sorts an Arrow table by the sort columns present in it, keeping ties in order.
+
+        Args:
+            table (pa.Table): The table to sort, typically the rows of one file.
+
+        Returns:
+            pa.Table: The sorted table.
+        """
+        keys = self._get_sort_keys(columns=table.column_names, partition_cols=None)
+        if not keys:
+            return table
+        return table.sort_by([(key, "ascending") for key in keys])
+
+    @property
+    def page_index(self) -> bool:
+        """Returns whether pyarrow writers write page indexes."""
+        return self._page_index
+
+    # -------------------------------------------------------------------------------------------- #
+    def _get_sort_keys(self, columns: List[str], partition_cols: Optional[List[str]]) -> List[str]:
+        """Returns the partition columns followed by the sort columns present in the data."""
+        keys = []
+        for column in list(partition_cols or []) + self._sort_by:
+            if column in columns and column not in keys:
+                keys.append(column)
+        return keys
+
+    def _bytes_per_row(self, size: float, rows: int) -> float:
+        return size / rows if rows else 1.0
+
+    def _rows(self, size: int, bytes_per_row: float) -> int:
+        return max(1, int(size // max(bytes_per_row, 1.0)))
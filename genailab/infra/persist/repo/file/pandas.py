@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday September 22nd 2024 05:36:35 pm                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 08:03:31 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -20,9 +20,16 @@
 from __future__ import annotations
 
 import logging
+import os
+from typing import Iterator, Optional
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as pafs
+import pyarrow.ipc as ipc
 from genailab.core.dtypes import DTYPES
+from genailab.core.schema import Schema
 from genailab.infra.exception.file import FileIOException
 from genailab.infra.persist.repo.file.base import (
     DataFrameReader as BaseDataFrameReader,
@@ -30,25 +37,47 @@ from genailab.infra.persist.repo.file.base import (
 from genailab.infra.persist.repo.file.base import (
     DataFrameWriter as BaseDataFrameWriter,
 )
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.layout import ParquetLayout
 
 
 # ------------------------------------------------------------------------------------------------ #
 #                                    DATAFRAME READERS                                             #
 # ------------------------------------------------------------------------------------------------ #
 class PandasDataFrameParquetReader(BaseDataFrameReader):
-    """A reader class for loading dataframe into Pandas DataFrames from parquet files."""
+    """A reader class for loading dataframe into Pandas DataFrames from parquet files.
+
+    Files and hive-partitioned directories are read through `pyarrow.dataset`, which scans
+    fragments in parallel and, with `pre_buffer`, coalesces and prefetches the column chunk
+    reads of each row group, so cold loads keep every core and a deep SSD queue busy. Partition
+    columns are returned as pandas categoricals, as are the `dictionary_columns`, without
+    decoding their values to strings first. Large datasets can be streamed batch by batch
+    with `iter_batches`.
+
+    Args:
+        kwargs (dict): Reader options from the `read_kwargs` configuration:
+            - use_threads (bool): Whether to scan and convert in parallel. Defaults to True.
+            - pre_buffer (bool): Whether to prefetch column chunks. Defaults to True.
+            - batch_size (int): Maximum number of rows per record batch.
+            - batch_readahead (int): Number of batches to read ahead within a file.
+            - fragment_readahead (int): Number of files to read ahead.
+            - io_threads (int): Size of pyarrow's IO thread pool. The pool is process-wide,
+              so the DataFrameIOFactory sets it once on creation. Defaults to pyarrow's.
+            - dictionary_columns (list): Columns to read as categoricals.
+    """
 
     def __init__(self, kwargs: dict) -> None:
         self._kwargs = kwargs
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def read(self, filepath: str, **kwargs) -> pd.DataFrame:
+    def read(self, filepath: str, schema: Optional[Schema] = None, **kwargs) -> pd.DataFrame:
         """
-        Reads a Parquet file into a Pandas DataFrame.
+        Reads a Parquet file or hive-partitioned directory into a Pandas DataFrame.
 
         Args:
             filepath (str): The path to the Parquet file.
-            **kwargs: Additional keyword arguments passed to `pandas.read_parquet`.
+            schema (Optional[Schema]): Declared schema of the dataset. Defaults to DTYPES.
+            **kwargs: Optional `columns` and `filter` expression to push down to the scan.
 
         Returns:
             pd.DataFrame: A Pandas DataFrame containing the dataframe from the Parquet file.
@@ -57,11 +86,72 @@ class PandasDataFrameParquetReader(BaseDataFrameReader):
             FileNotFoundError: If the specified Parquet file does not exist.
             FileIOException: If any other exception occurs while reading the file.
         """
+        use_threads = self._kwargs.get("use_threads", True)
         try:
-            df = pd.read_parquet(filepath, **self._kwargs)
+            table = self._get_dataset(filepath=filepath).to_table(
+                **self._get_scan_kwargs(**kwargs)
+            )
+            # self_destruct frees each Arrow column once converted, halving peak memory.
+            df = table.to_pandas(split_blocks=True, self_destruct=True, use_threads=use_threads)
+            del table
             msg = f"{self.__class__.__name__} read from {filepath}"
             self._logger.debug(msg)
-            return df.astype(DTYPES)
+            return _cast(df=df, schema=schema)
+        except FileNotFoundError as e:
+            msg = f"Exception occurred while reading a Parquet file from {filepath}. File does not exist.\n{e}"
+            raise FileNotFoundError(msg)
+        except Exception as e:
+            msg = (
+                f"Exception occurred while reading a Parquet file from {filepath}.\n{e}"
+            )
+            raise FileIOException(msg, e) from e
+
+    def iter_batches(
+        self, filepath: str, schema: Optional[Schema] = None, **kwargs
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Streams a Parquet file or hive-partitioned directory as Pandas DataFrames.
+
+        Only `batch_readahead` batches per file and `fragment_readahead` files are held in
+        memory at a time, so datasets larger than memory can be processed incrementally.
+
+        Args:
+            filepath (str): The path to the Parquet file.
+            schema (Optional[Schema]): Declared schema of the dataset. Defaults to DTYPES.
+            **kwargs: Optional `columns` and `filter` expression to push down to the scan, and
+                a `batch_size` overriding the configured one.
+
+        Yields:
+            pd.DataFrame: One DataFrame per record batch of at most `batch_size` rows.
+
+        Raises:
+            FileNotFoundError: If the specified Parquet file does not exist.
+            FileIOException: If any other exception occurs while reading the file.
+        """
+        use_threads = self._kwargs.get("use_threads", True)
+        for batch in self.iter_record_batches(filepath=filepath, **kwargs):
+            df = batch.to_pandas(split_blocks=True, use_threads=use_threads)
+            yield _cast(df=df, schema=schema)
+
+    def iter_record_batches(self, filepath: str, **kwargs) -> Iterator[pa.RecordBatch]:
+        """
+        Streams a Parquet file or hive-partitioned directory as Arrow record batches.
+
+        Args:
+            filepath (str): The path to the Parquet file.
+            **kwargs: Optional `columns` and `filter` expression to push down to the scan, and
+                a `batch_size` overriding the configured one.
+
+        Yields:
+            pa.RecordBatch: Record batches of at most `batch_size` rows.
+
+        Raises:
+            FileNotFoundError: If the specified Parquet file does not exist.
+            FileIOException: If any other exception occurs while reading the file.
+        """
+        try:
+            dataset = self._get_dataset(filepath=filepath)
+            yield from dataset.to_batches(**self._get_scan_kwargs(**kwargs))
         except FileNotFoundError as e:
             msg = f"Exception occurred while reading a Parquet file from {filepath}. File does not exist.\n{e}"
             raise FileNotFoundError(msg)
@@ -71,6 +161,33 @@ class PandasDataFrameParquetReader(BaseDataFrameReader):
             )
             raise FileIOException(msg, e) from e
 
+    def _get_dataset(self, filepath: str) -> ds.Dataset:
+        """Opens the file or directory as a dataset with the configured Parquet scan options."""
+        file_format = ds.ParquetFileFormat(
+            read_options=ds.ParquetReadOptions(
+                dictionary_columns=self._kwargs.get("dictionary_columns")
+            ),
+            default_fragment_scan_options=ds.ParquetFragmentScanOptions(
+                pre_buffer=self._kwargs.get("pre_buffer", True)
+            ),
+        )
+        partitioning = None
+        if os.path.isdir(filepath):
+            partitioning = ds.HivePartitioning.discover(infer_dictionary=True)
+        return ds.dataset(filepath, format=file_format, partitioning=partitioning)
+
+    def _get_scan_kwargs(self, **kwargs) -> dict:
+        """Combines the configured scan options with the columns, filter and batch size of a read."""
+        scan_kwargs = {
+            key: self._kwargs[key]
+            for key in ("use_threads", "batch_size", "batch_readahead", "fragment_readahead")
+            if self._kwargs.get(key) is not None
+        }
+        for key in ("columns", "filter", "batch_size"):
+            if kwargs.get(key) is not None:
+                scan_kwargs[key] = kwargs[key]
+        return scan_kwargs
+
 
 # ------------------------------------------------------------------------------------------------ #
 class PandasDataFrameCSVReader(BaseDataFrameReader):
@@ -80,13 +197,16 @@ class PandasDataFrameCSVReader(BaseDataFrameReader):
         self._kwargs = kwargs
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def read(self, filepath: str, **kwargs) -> pd.DataFrame:
+    def read(self, filepath: str, schema: Optional[Schema] = None, **kwargs) -> pd.DataFrame:
         """
         Reads a CSV file into a Pandas DataFrame.
 
         Args:
             filepath (str): The path to the CSV file.
-            **kwargs: Additional keyword arguments passed to `pandas.read_csv`.
+            schema (Optional[Schema]): Declared schema of the dataset. If provided, its dtypes
+                replace the configured `dtype` and `parse_dates`, so columns are parsed
+                directly into their declared types.
+            **kwargs: Unused. Reader options are taken from the `read_kwargs` configuration.
 
         Returns:
             pd.DataFrame: A Pandas DataFrame containing the dataframe from the CSV file.
@@ -96,10 +216,13 @@ class PandasDataFrameCSVReader(BaseDataFrameReader):
             FileIOException: If any other exception occurs while reading the file.
         """
         try:
-            df = pd.read_csv(filepath, **self._kwargs)
+            kwargs = dict(self._kwargs)
+            if schema is not None:
+                kwargs.update(self._get_schema_kwargs(filepath=filepath, schema=schema))
+            df = pd.read_csv(filepath, **kwargs)
             msg = f"{self.__class__.__name__} read from {filepath}"
             self._logger.debug(msg)
-            return df.astype(DTYPES)
+            return _cast(df=df, schema=schema)
 
         except FileNotFoundError as e:
             msg = f"Exception occurred while reading a CSV file from {filepath}. File does not exist.\n{e}"
@@ -108,15 +231,100 @@ class PandasDataFrameCSVReader(BaseDataFrameReader):
             msg = f"Exception occurred while reading a CSV file from {filepath}.\n{e}"
             raise FileIOException(msg, e) from e
 
+    def _get_schema_kwargs(self, filepath: str, schema: Schema) -> dict:
+        """Returns the `dtype` and `parse_dates` arguments for the declared columns in the file."""
+        header = pd.read_csv(filepath, nrows=0, encoding=self._kwargs.get("encoding")).columns
+        dtypes = schema.select(columns=list(header)).dtypes
+        parse_dates = [c for c, dtype in dtypes.items() if dtype.startswith("datetime64")]
+        return {
+            "dtype": {c: dtype for c, dtype in dtypes.items() if c not in parse_dates},
+            "parse_dates": parse_dates,
+        }
+
+
+# ------------------------------------------------------------------------------------------------ #
+class PandasDataFrameArrowReader(BaseDataFrameReader):
+    """A reader class for loading Arrow IPC (Feather V2) files into Pandas DataFrames.
+
+    Files are memory-mapped rather than read into memory. When the file was written
+    uncompressed, column buffers are handed to pandas without copying wherever the
+    column types allow, so intermediate datasets load in roughly the time it takes
+    to map the file.
+    """
+
+    def __init__(self, kwargs: dict) -> None:
+        self._kwargs = kwargs
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def read(self, filepath: str, schema: Optional[Schema] = None, **kwargs) -> pd.DataFrame:
+        """
+        Reads an Arrow IPC file or hive-partitioned directory into a Pandas DataFrame.
+
+        Args:
+            filepath (str): The path to the Arrow IPC file or partitioned directory.
+            schema (Optional[Schema]): Declared schema of the dataset. Defaults to DTYPES.
+            **kwargs: Unused. Reader options are taken from the `read_kwargs` configuration:
+                - memory_map (bool): Whether to memory-map the file(s). Defaults to True.
+                - use_threads (bool): Whether to convert columns in parallel. Defaults to True.
+
+        Returns:
+            pd.DataFrame: A Pandas DataFrame containing the dataframe from the Arrow IPC file.
+
+        Raises:
+            FileNotFoundError: If the specified Arrow IPC file does not exist.
+            FileIOException: If any other exception occurs while reading the file.
+        """
+        memory_map = self._kwargs.get("memory_map", True)
+        use_threads = self._kwargs.get("use_threads", True)
+        try:
+            if os.path.isdir(filepath):
+                dataset = ds.dataset(
+                    filepath,
+                    format="ipc",
+                    partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+                    filesystem=pafs.LocalFileSystem(use_mmap=memory_map),
+                )
+                table = dataset.to_table(use_threads=use_threads)
+            else:
+                source = pa.memory_map(filepath, "r") if memory_map else pa.OSFile(filepath, "rb")
+                with source:
+                    table = ipc.open_file(source).read_all()
+            # split_blocks avoids consolidating columns into 2D blocks, which would copy them.
+            df = table.to_pandas(split_blocks=True, use_threads=use_threads)
+            msg = f"{self.__class__.__name__} read from {filepath}"
+            self._logger.debug(msg)
+            return _cast(df=df, schema=schema)
+        except FileNotFoundError as e:
+            msg = f"Exception occurred while reading an Arrow IPC file from {filepath}. File does not exist.\n{e}"
+            raise FileNotFoundError(msg)
+        except Exception as e:
+            msg = f"Exception occurred while reading an Arrow IPC file from {filepath}.\n{e}"
+            raise FileIOException(msg, e) from e
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                  DATAFRAME WRITERS                                               #
 # ------------------------------------------------------------------------------------------------ #
 class PandasDataFrameParquetWriter(BaseDataFrameWriter):
-    """Writes a pandas DataFrame to a parquet file."""
+    """Writes a pandas DataFrame to a parquet file.
 
-    def __init__(self, kwargs: dict) -> None:
+    Args:
+        kwargs (dict): Keyword arguments passed to `pandas.DataFrame.to_parquet`.
+        layout (Optional[ParquetLayout]): Plans row order, row group and file sizes. If None,
+            the DataFrame is written as is.
+        encoding (Optional[ParquetEncoding]): Chooses the compression and encoding of each
+            column. If None, the compression in `kwargs` applies to all columns.
+    """
+
+    def __init__(
+        self,
+        kwargs: dict,
+        layout: Optional[ParquetLayout] = None,
+        encoding: Optional[ParquetEncoding] = None,
+    ) -> None:
         self._kwargs = kwargs
+        self._layout = layout
+        self._encoding = encoding
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     def write(
@@ -139,7 +347,19 @@ class PandasDataFrameParquetWriter(BaseDataFrameWriter):
         """
         self.validate_write(filepath=filepath, overwrite=overwrite, **self._kwargs)
         try:
-            dataframe.to_parquet(filepath, **self._kwargs)
+            kwargs = dict(self._kwargs)
+            if self._layout is not None:
+                dataframe, layout_kwargs = self._layout.plan_pandas(
+                    dataframe=dataframe, partition_cols=kwargs.get("partition_cols")
+                )
+                kwargs.update(layout_kwargs)
+            if self._encoding is not None:
+                kwargs.update(
+                    self._encoding.plan_pandas(
+                        dataframe=dataframe, partition_cols=kwargs.get("partition_cols")
+                    )
+                )
+            dataframe.to_parquet(filepath, **kwargs)
             msg = f"{self.__class__.__name__} wrote to {filepath}"
             self._logger.debug(msg)
         except Exception as e:
@@ -183,3 +403,80 @@ class PandasDataFrameCSVWriter(BaseDataFrameWriter):
         except Exception as e:
             msg = f"Exception occurred while creating a CSV file at {filepath}.\n{e}"
             raise FileIOException(msg, e) from e
+
+
+# ------------------------------------------------------------------------------------------------ #
+class PandasDataFrameArrowWriter(BaseDataFrameWriter):
+    """Writes a pandas DataFrame to an Arrow IPC (Feather V2) file."""
+
+    def __init__(self, kwargs: dict) -> None:
+        self._kwargs = kwargs
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def write(
+        self,
+        dataframe: pd.DataFrame,
+        filepath: str,
+        overwrite: bool = False,
+    ) -> None:
+        """
+        Writes the dataframe to an Arrow IPC file at the designated filepath.
+
+        Args:
+            dataframe (pd.DataFrame): The Pandas DataFrame to write to the Arrow IPC file.
+            filepath (str): The path where the Arrow IPC file will be saved.
+            overwrite (bool): Whether to overwrite existing dataframe. Defaults to False.
+            **kwargs: Writer options are taken from the `write_kwargs` configuration:
+                - compression (str): None for uncompressed, zero-copy readable files, or
+                  'lz4' / 'zstd' to trade read-time CPU for disk. Defaults to None.
+                - index (bool): Whether to persist the DataFrame index. Defaults to False.
+                - partition_cols (list): Optional hive partitioning columns. When provided,
+                  the filepath is written as a directory of IPC files.
+
+        Raises:
+            FileIOException: If an error occurs while writing the Arrow IPC file.
+        """
+        self.validate_write(filepath=filepath, overwrite=overwrite, **self._kwargs)
+        compression = self._kwargs.get("compression", None)
+        partition_cols = self._kwargs.get("partition_cols", None)
+        try:
+            table = pa.Table.from_pandas(
+                dataframe, preserve_index=self._kwargs.get("index", False)
+            )
+            if partition_cols:
+                ds.write_dataset(
+                    table,
+                    base_dir=filepath,
+                    format="ipc",
+                    partitioning=partition_cols,
+                    partitioning_flavor="hive",
+                    file_options=ds.IpcFileFormat().make_write_options(
+                        compression=compression
+                    ),
+                    existing_data_behavior="delete_matching",
+                )
+            else:
+                options = ipc.IpcWriteOptions(compression=compression)
+                with pa.OSFile(filepath, "wb") as sink:
+                    with ipc.new_file(sink, table.schema, options=options) as writer:
+                        writer.write_table(table)
+            msg = f"{self.__class__.__name__} wrote to {filepath}"
+            self._logger.debug(msg)
+        except Exception as e:
+            msg = f"Exception occurred while creating an Arrow IPC file at {filepath}.\n{e}"
+            raise FileIOException(msg, e) from e
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _cast(df: pd.DataFrame, schema: Optional[Schema] = None) -> pd.DataFrame:
+    """Casts only the columns whose dtype differs from the schema, leaving zero-copy columns intact.
+
+    Without a declared schema, columns are cast to DTYPES.
+    """
+    declared = schema.dtypes if schema is not None else DTYPES
+    dtypes = {
+        column: dtype
+        for column, dtype in declared.items()
+        if column in df.columns and str(df[column].dtype) != dtype
+    }
+    return df.astype(dtypes) if dtypes else df
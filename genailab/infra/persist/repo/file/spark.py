@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday September 22nd 2024 05:36:35 pm                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 08:00:18 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -19,8 +19,13 @@
 """Spark File Access Object Module"""
 from __future__ import annotations
 
+import csv
 import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
 
+from genailab.core.schema import Schema
 from genailab.infra.exception.file import FileIOException
 from genailab.infra.persist.repo.file.base import (
     DataFrameReader as BaseDataFrameReader,
@@ -28,7 +33,10 @@ from genailab.infra.persist.repo.file.base import (
 from genailab.infra.persist.repo.file.base import (
     DataFrameWriter as BaseDataFrameWriter,
 )
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.layout import ParquetLayout
 from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql import functions as F
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -45,14 +53,19 @@ class SparkDataFrameParquetReader(BaseDataFrameReader):
         self,
         filepath: str,
         spark: SparkSession,
+        schema: Optional[Schema] = None,
     ) -> DataFrame:
         """
         Reads a Parquet file into a Spark DataFrame.
 
+        Types are taken from the Parquet footers, so no inference pass runs. Declared columns
+        stored with a different type are cast to the declared type; other columns are
+        returned as stored.
+
         Args:
             filepath (str): The path to the Parquet file.
             spark (SparkSession): The Spark session to use for reading the file.
-            **kwargs: Additional keyword arguments passed to Spark's `read.parquet` method.
+            schema (Optional[Schema]): Declared schema of the dataset.
 
         Returns:
             DataFrame: A PySpark DataFrame containing the dataframe from the Parquet file.
@@ -67,7 +80,7 @@ class SparkDataFrameParquetReader(BaseDataFrameReader):
             self._logger.debug(msg)
             if "__index_level_0__" in dataframe.columns:
                 dataframe = dataframe.drop("__index_level_0__")
-            return dataframe
+            return _cast(dataframe=dataframe, schema=schema)
         except FileNotFoundError as e:
             msg = f"Exception occurred while reading a Parquet file from {filepath}. File does not exist.\n{e}"
             raise FileNotFoundError(msg)
@@ -90,14 +103,19 @@ class SparkDataFrameCSVReader(BaseDataFrameReader):
         self,
         filepath: str,
         spark: SparkSession,
+        schema: Optional[Schema] = None,
     ) -> DataFrame:
         """
         Reads a CSV file into a Spark DataFrame.
 
+        If a schema is declared, the file is parsed directly into the declared types, in the
+        order of the header, and `inferSchema` is ignored, saving a full pass over the file.
+        Columns in the header but not in the schema are read as strings.
+
         Args:
             filepath (str): The path to the CSV file.
             spark (SparkSession): The Spark session to use for reading the file.
-            **kwargs: Additional keyword arguments passed to Spark's `read.csv` method.
+            schema (Optional[Schema]): Declared schema of the dataset.
 
         Returns:
             DataFrame: A PySpark DataFrame containing the dataframe from the CSV file.
@@ -107,7 +125,12 @@ class SparkDataFrameCSVReader(BaseDataFrameReader):
             FileIOException: If any other exception occurs while reading the file.
         """
         try:
-            dataframe = spark.read.csv(filepath, **self._kwargs)
+            kwargs = dict(self._kwargs)
+            header = self._read_header(filepath=filepath) if schema is not None else None
+            if header:
+                kwargs.pop("inferSchema", None)
+                kwargs["schema"] = schema.select(columns=header, default="string").struct_type
+            dataframe = spark.read.csv(filepath, **kwargs)
             msg = f"{self.__class__.__name__} read from{filepath}"
             self._logger.debug(msg)
             if "__index_level_0__" in dataframe.columns:
@@ -120,15 +143,48 @@ class SparkDataFrameCSVReader(BaseDataFrameReader):
             msg = f"Exception occurred while reading a CSV file from {filepath}.\n{e}"
             raise FileIOException(msg, e) from e
 
+    def _read_header(self, filepath: str) -> Optional[list]:
+        """Returns the column names in the header of a local CSV file or directory of files."""
+        if not self._kwargs.get("header", False):
+            return None
+        if os.path.isdir(filepath):
+            files = sorted(
+                os.path.join(filepath, name)
+                for name in os.listdir(filepath)
+                if name.endswith(".csv")
+            )
+            if not files:
+                return None
+            filepath = files[0]
+        if not os.path.isfile(filepath):
+            return None
+        with open(filepath, newline="", encoding=self._kwargs.get("encoding", "utf-8")) as file:
+            return next(csv.reader(file), None)
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                   DATAFRAME WRITERS                                              #
 # ------------------------------------------------------------------------------------------------ #
 class SparkDataFrameParquetWriter(BaseDataFrameWriter):
-    """Writes a spark DataFrame to a parquet file."""
+    """Writes a spark DataFrame to a parquet file.
 
-    def __init__(self, kwargs: dict) -> None:
+    Args:
+        kwargs (dict): Write mode and partition columns for the DataFrameWriter.
+        layout (Optional[ParquetLayout]): Plans file count, row order, row group sizes and
+            bloom filters. If None, the DataFrame is written as is.
+        encoding (Optional[ParquetEncoding]): Chooses the compression and encodings. If None,
+            Spark's defaults apply.
+    """
+
+    def __init__(
+        self,
+        kwargs: dict,
+        layout: Optional[ParquetLayout] = None,
+        encoding: Optional[ParquetEncoding] = None,
+    ) -> None:
         self._kwargs = kwargs
+        self._layout = layout
+        self._encoding = encoding
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     def write(
@@ -159,31 +215,56 @@ class SparkDataFrameParquetWriter(BaseDataFrameWriter):
 
         # Construct pyspark write command based upon kwargs
         try:
-            if mode and partition_cols:
-                dataframe.write.mode(mode).partitionBy(partition_cols).parquet(filepath)
-                self._logger.debug(
-                    f"Writing spark DataFrame to partitioned parquet file at {filepath}"
+            options = {}
+            settings = {}
+            if self._layout is not None:
+                dataframe, options = self._layout.plan_spark(
+                    dataframe=dataframe, partition_cols=partition_cols
                 )
-            elif mode:
-                dataframe.write.mode(mode).parquet(filepath)
-                self._logger.debug(
-                    f"Writing spark DataFrame to parquet file at {filepath}"
-                )
-            elif partition_cols:
-                dataframe.write.partitionBy(partition_cols).parquet(filepath)
+            if self._encoding is not None:
+                options.update(self._encoding.plan_spark(dataframe=dataframe))
+                settings = self._encoding.plan_spark_conf(dataframe=dataframe)
+            writer = dataframe.write.options(**options)
+            if mode:
+                writer = writer.mode(mode)
+            if partition_cols:
+                writer = writer.partitionBy(partition_cols)
                 self._logger.debug(
                     f"Writing spark DataFrame to partitioned parquet file at {filepath}"
                 )
             else:
-                dataframe.write.parquet(filepath)
                 self._logger.debug(
                     f"Writing spark DataFrame to parquet file at {filepath}"
                 )
+            with session_conf(spark=dataframe.sparkSession, settings=settings):
+                writer.parquet(filepath)
         except Exception as e:
             msg = f"Exception occurred while writing a Parquet file at {filepath}.\nKeyword Arguments: {self._kwargs}"
             raise FileIOException(msg, e) from e
 
 
+# ------------------------------------------------------------------------------------------------ #
+@contextmanager
+def session_conf(spark: SparkSession, settings: Dict[str, str]) -> Iterator[None]:
+    """Applies settings to a shared Spark session and restores the previous values on exit.
+
+    Args:
+        spark (SparkSession): The session.
+        settings (Dict[str, str]): The settings to apply.
+    """
+    previous = {key: spark.conf.get(key, None) for key in settings}
+    for key, value in settings.items():
+        spark.conf.set(key, value)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                spark.conf.unset(key)
+            else:
+                spark.conf.set(key, value)
+
+
 # ------------------------------------------------------------------------------------------------ #
 class SparkDataFrameCSVWriter(BaseDataFrameWriter):
     """Writes a spark DataFrame to a csv file."""
@@ -217,3 +298,17 @@ class SparkDataFrameCSVWriter(BaseDataFrameWriter):
         except Exception as e:
             msg = f"Exception occurred while writing a CSV file to {filepath}.\nKeyword Arguments: {self._kwargs}"
             raise FileIOException(msg, e) from e
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _cast(dataframe: DataFrame, schema: Optional[Schema] = None) -> DataFrame:
+    """Casts declared columns whose type differs from the schema, leaving others as read."""
+    if schema is None:
+        return dataframe
+    declared = {field.name: field.dataType for field in schema.struct_type.fields}
+    casts = {
+        field.name: F.col(field.name).cast(declared[field.name])
+        for field in dataframe.schema.fields
+        if field.name in declared and field.dataType != declared[field.name]
+    }
+    return dataframe.withColumns(casts) if casts else dataframe
@@ -11,12 +11,13 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday September 22nd 2024 07:41:04 pm                                              #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:08:34 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 """Dataset DAL Module"""
+import copy
 import logging
 import os
 import shelve
@@ -233,11 +234,13 @@ class DAO(DAL):
             ObjectIOException: If an unknown exception occurs during creation.
         """
 
-        df = asset.serialize()
+        # The dataframe is stripped from a shallow copy, leaving the asset usable by other threads.
+        record = copy.copy(asset)
+        record.serialize()
 
         try:
             with shelve.open(self._db_path) as db:
-                db[asset.asset_id] = asset
+                db[asset.asset_id] = record
         except FileNotFoundError as e:
             msg = f"The object database was not found at {self._db_path}.\n{e}"
             self._logger.exception(msg)
@@ -246,11 +249,3 @@ class DAO(DAL):
             msg = f"Unknown exception occurred while creating asset_id: {asset.asset_id}.\n{e}"
             self._logger.exception(msg)
             raise ObjectIOException(msg, e) from e
-
-        # Ensure that the dataframe is not None before deserializing
-        if df is not None:
-            asset.deserialize(dataframe=df)
-        else:
-            self._logger.error(
-                "Attempted to deserialize with a None dataframe. Asset deserialization may be incomplete."
-            )
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/service/spark/files.py                                              #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:30:59 pm                                                #
+# Modified   : Monday October 19th 2026 07:30:59 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Spark Files Module"""
+import os
+
+from pyspark import SparkFiles
+
+
+# ------------------------------------------------------------------------------------------------ #
+def get_file(filepath: str) -> str:
+    """Returns the local path of a file distributed to the executors, or the path itself.
+
+    Files listed under `spark.files` in the configuration are added to the sessions of the
+    SparkSessionPool with `SparkContext.addFile`, and copied to every executor. Within a task,
+    the copy is resolved by file name with `SparkFiles`. Outside Spark, or if the file wasn't
+    distributed, the given path is returned.
+
+    Args:
+        filepath (str): The path of the file, as configured.
+
+    Returns:
+        str: The path of the local copy of the file, or `filepath`.
+    """
+    try:
+        local_path = SparkFiles.get(os.path.basename(filepath))
+    except Exception:
+        # No active SparkContext on the driver.
+        return filepath
+    return local_path if os.path.exists(local_path) else filepath
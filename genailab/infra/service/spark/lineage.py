@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /genailab/infra/service/spark/lineage.py                                            #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:59:26 pm                                                #
+# Modified   : Monday October 19th 2026 08:35:17 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+"""Spark Lineage Module"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, Optional
+
+from pyspark import StorageLevel
+from pyspark.sql import DataFrame
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                      LINEAGE MANAGER                                             #
+# ------------------------------------------------------------------------------------------------ #
+class LineageManager:
+    """Keeps the logical plan of a Spark task chain shallow.
+
+    Every `withColumn` or `filter` a task applies is appended to the logical plan, and Spark
+    analyzes the whole plan again for each new transformation, so driver time grows with plan
+    depth. After each task the manager measures the plan depth (its number of nodes) and width
+    (its number of columns). It truncates the lineage when the depth the plan has gained, or the
+    number of tasks run, since the last truncation reaches its threshold. Columns beyond `spark.sql.codegen.maxFields`
+    disable whole-stage codegen; when `max_fields` is set the manager raises that limit to
+    cover the plan width.
+
+    Truncation modes are "local_checkpoint", which materializes the dataframe on the executors
+    and replaces its lineage, "checkpoint", which does the same reliably in the session's
+    checkpoint directory, and "persist", which caches the dataframe at `storage_level`. Persisting
+    leaves the logical plan as it is, which is why depth is measured from the last truncation.
+
+    Args:
+        enabled (bool): Whether lineage control is active. Defaults to True.
+        interval (int): Truncate after this many tasks. 0 truncates on depth only. Defaults to 10.
+        max_depth (int): Truncate once the plan has gained this many nodes since the last
+            truncation. Defaults to 100.
+        max_fields (Optional[int]): Upper bound to which `spark.sql.codegen.maxFields` may be
+            raised for wide plans. None leaves the session setting untouched. Defaults to None.
+        mode (str): Truncation mode. Defaults to "local_checkpoint".
+        storage_level (str): Storage level for the "persist" mode. Defaults to "MEMORY_AND_DISK".
+    """
+
+    __modes = ("local_checkpoint", "checkpoint", "persist")
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        interval: int = 10,
+        max_depth: int = 100,
+        max_fields: Optional[int] = None,
+        mode: str = "local_checkpoint",
+        storage_level: str = "MEMORY_AND_DISK",
+    ) -> None:
+        if mode not in self.__modes:
+            raise ValueError(f"Unsupported lineage mode '{mode}'. Expected one of {list(self.__modes)}.")
+        self._enabled = enabled
+        self._interval = interval
+        self._max_depth = max_depth
+        self._max_fields = max_fields
+        self._mode = mode
+        self._storage_level = getattr(StorageLevel, storage_level)
+
+        self._tasks = 0
+        self._base_depth = 0
+        self._saving = 0.0
+        self._persisted: Optional[DataFrame] = None
+        self._report: Dict[str, float] = {}
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    @property
+    def report(self) -> Dict[str, float]:
+        """Returns the lineage statistics of the current task chain.
+
+        Returns:
+            Dict[str, float]: The number of truncations, the maximum plan depth and width,
+                the seconds spent truncating and the estimated analysis seconds saved.
+        """
+        return dict(self._report)
+
+    def reset(self) -> None:
+        """Starts a new task chain, releasing any dataframe persisted by the previous one."""
+        if self._persisted is not None:
+            self._persisted.unpersist()
+            self._persisted = None
+        self._tasks = 0
+        self._base_depth = 0
+        self._saving = 0.0
+        self._report = {
+            "truncations": 0,
+            "max_depth": 0,
+            "max_width": 0,
+            "truncation_time": 0.0,
+            "analysis_time_saved": 0.0,
+        }
+
+    def control(self, dataframe: DataFrame) -> DataFrame:
+        """Measures the plan after a task and truncates its lineage when due.
+
+        Args:
+            dataframe (DataFrame): The dataframe returned by the task.
+
+        Returns:
+            DataFrame: The dataframe, with truncated lineage if a threshold was reached.
+        """
+        if not self._enabled or not isinstance(dataframe, DataFrame):
+            return dataframe
+        if not self._report:
+            self.reset()
+
+        self._tasks += 1
+        # Each truncation spares every later transformation the re-analysis of the old plan.
+        self._report["analysis_time_saved"] += self._saving
+
+        depth = self._depth(dataframe)
+        width = len(dataframe.columns)
+        self._report["max_depth"] = max(self._report["max_depth"], depth)
+        self._report["max_width"] = max(self._report["max_width"], width)
+        self._set_max_fields(dataframe=dataframe, width=width)
+
+        grown = depth - self._base_depth
+        if grown < self._max_depth and (self._interval <= 0 or self._tasks < self._interval):
+            return dataframe
+
+        start = time.perf_counter()
+        before = self._analysis_time(dataframe)
+        dataframe = self._truncate(dataframe)
+        after = self._analysis_time(dataframe)
+        self._saving += max(before - after, 0.0)
+        self._tasks = 0
+        self._base_depth = self._depth(dataframe)
+        self._report["truncations"] += 1
+        self._report["truncation_time"] += time.perf_counter() - start
+        self._logger.debug(
+            f"Truncated a plan of depth {depth} and width {width} by {self._mode}. "
+            f"Analysis time per transformation fell from {before:.3f}s to {after:.3f}s."
+        )
+        return dataframe
+
+    def _truncate(self, dataframe: DataFrame) -> DataFrame:
+        """Replaces the lineage of the dataframe according to the mode."""
+        if self._mode == "local_checkpoint":
+            return dataframe.localCheckpoint(eager=True)
+        if self._mode == "checkpoint":
+            return dataframe.checkpoint(eager=True)
+        persisted = dataframe.persist(self._storage_level)
+        persisted.count()
+        if self._persisted is not None:
+            self._persisted.unpersist()
+        self._persisted = persisted
+        return persisted
+
+    def _set_max_fields(self, dataframe: DataFrame, width: int) -> None:
+        """Raises the whole-stage codegen field limit to cover the plan width."""
+        conf = dataframe.sparkSession.conf
+        current = int(conf.get("spark.sql.codegen.maxFields", "100"))
+        if width <= current:
+            return
+        if self._max_fields is None or width > self._max_fields:
+            self._logger.warning(
+                f"The plan has {width} columns, more than spark.sql.codegen.maxFields ({current}). "
+                "Whole-stage code generation is disabled for it."
+            )
+            return
+        conf.set("spark.sql.codegen.maxFields", str(width))
+        self._logger.debug(f"Raised spark.sql.codegen.maxFields from {current} to {width}.")
+
+    @staticmethod
+    def _depth(dataframe: DataFrame) -> int:
+        """Returns the number of nodes in the logical plan of the dataframe."""
+        return dataframe._jdf.queryExecution().logical().treeString().count("\n")
+
+    @staticmethod
+    def _analysis_time(dataframe: DataFrame) -> float:
+        """Returns the seconds Spark takes to analyze a projection of the dataframe."""
+        start = time.perf_counter()
+        dataframe.select("*")
+        return time.perf_counter() - start
@@ -11,21 +11,31 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Tuesday September 24th 2024 12:50:08 am                                             #
-# Modified   : Wednesday January 29th 2025 09:07:51 pm                                             #
+# Modified   : Monday October 19th 2026 08:05:21 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 import atexit
 import logging
+import math
 import os
+import re
+import shutil
+import tempfile
+import threading
 import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import Dict
+from pathlib import Path
+from typing import Dict, List, Optional
+import psutil
 import sparknlp
 
 from genailab.core.dstruct import NestedNamespace
 from genailab.core.dtypes import DFType
+from genailab.infra.utils.data.dataframe import DatasetSizeThreshold
 from pyspark.sql import SparkSession
 
 # ------------------------------------------------------------------------------------------------ #
@@ -35,6 +45,8 @@ logging.getLogger("pyspark").setLevel(logging.ERROR)
 logging.getLogger("com.johnsnowlabs").setLevel(logging.ERROR)
 logging.getLogger("org.apache.spark").setLevel(logging.ERROR)
 logging.getLogger("org.apache.hadoop").setLevel(logging.ERROR)
+# Directories left out of the package archive shipped to cluster executors.
+ARCHIVE_EXCLUDES = ("__pycache__", ".pytest_cache", ".mypy_cache", ".ipynb_checkpoints")
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -61,23 +73,49 @@ class SparkSessionPool:
     with configurable settings. It ensures efficient reuse of sessions and integrates
     cleanup via shutdown handlers.
 
+    Sessions are tuned to the machine and the data they process. On creation they use the Kryo
+    serializer and, if `offheap_fraction` is set, off-heap memory sized as a share of RAM. Before
+    a session is handed out, its shuffle partitions, advisory partition size and Arrow batch
+    size are set from the size of the stage's input with `tune`. With `warm_start`, `warm`
+    creates a session on a background thread, so JVM startup overlaps the configuration and
+    metadata work of building a stage; the session is awaited when it is first requested.
+
+    Sessions run on the configured `master`: `local[*]` by default, a standalone cluster such as
+    `spark://host:7077`, or `local-cluster[N,C,M]`, which starts N executors with C cores and
+    M MB each on this machine. The configured `files`, such as model binaries, are distributed
+    to the executors with `SparkContext.addFile`, and on clusters the genailab package is too.
+    The package is zipped once per process, without bytecode caches, and the archive is
+    removed when all sessions are stopped.
+
     Args:
-        spark_config (Dict): Configuration for Spark, including memory allocation,
-            Parquet block size, and retry attempts.
+        spark_config (Dict): Configuration for Spark, including the master URL, executor
+            instances, cores and memory, memory allocation, Parquet block size, retry
+            attempts, warm start, the off-heap memory fraction, the target Arrow batch size
+            in bytes and the files distributed to the executors.
 
     Properties:
         spark (SparkSession): Lazily initializes and returns a Spark session.
         sparknlp (SparkSession): Lazily initializes and returns a Spark NLP session.
+        settings (Dict[str, str]): The tuned settings of the sessions.
 
     Methods:
+        warm: Starts creating a session on a background thread.
+        tune: Tunes the runtime settings of the sessions to the size of the input.
         stop: Stops any active Spark or Spark NLP sessions.
         get_spark_session: Retrieves a Spark session based on the specified type.
     """
 
+    _archive: Optional[str] = None  # Package archive shared by the sessions of this process
+    _archive_lock = threading.Lock()
+
     def __init__(self, spark_config: Dict) -> None:
         self._spark_config = NestedNamespace(spark_config)
         self._spark = None  # Spark Session
         self._sparknlp = None  # Spark NLP Session
+        self._pending: Dict[bool, Future] = {}  # Sessions being created, keyed by nlp
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._runtime_settings: Dict[str, str] = {}
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     @property
@@ -88,7 +126,7 @@ class SparkSessionPool:
             SparkSession: The Spark session.
         """
         if self._spark is None:
-            self._spark = self._get_or_create(nlp=False)
+            self._spark = self._await(nlp=False)
         return self._spark
 
     @property
@@ -99,7 +137,7 @@ class SparkSessionPool:
             SparkSession: The Spark NLP session.
         """
         if self._sparknlp is None:
-            self._sparknlp = self._get_or_create(nlp=True)
+            self._sparknlp = self._await(nlp=True)
         return self._sparknlp
 
     @property
@@ -113,14 +151,113 @@ class SparkSessionPool:
         if session == "":
             return "No Active Spark Session"
 
-    def stop(self) -> None:
-        """Stops any active Spark or Spark NLP sessions."""
-        if self._sparknlp is not None:
-            self._sparknlp.stop()
-            self._sparknlp = None
-        if self._spark is not None:
-            self._spark.stop()
-            self._spark = None
+    @property
+    def master(self) -> str:
+        """Returns the master URL of the sessions. Defaults to local[*]."""
+        return getattr(self._spark_config, "master", None) or "local[*]"
+
+    @property
+    def local(self) -> bool:
+        """Returns True if the executors run in the driver's process, sharing its files and path."""
+        return self.master == "local" or self.master.startswith("local[")
+
+    @property
+    def files(self) -> List[str]:
+        """Returns the paths of the files, such as models, distributed to the executors."""
+        return list(getattr(self._spark_config, "files", None) or [])
+
+    @property
+    def settings(self) -> Dict[str, str]:
+        """Returns the tuned settings of the sessions.
+
+        Returns:
+            Dict[str, str]: The settings set on creation and the runtime settings from the
+                last call to `tune`.
+        """
+        return {**self._static_settings(), **self._runtime_settings}
+
+    def warm(self, dftype: DFType = DFType.SPARK) -> None:
+        """Starts creating a session on a background thread if warm start is enabled.
+
+        Sessions of the other type are stopped, as both can't share a JVM. Does nothing if the
+        session is running or being created.
+
+        Args:
+            dftype (DFType): Type of DataFrame, either spark or sparknlp.
+        """
+        if not getattr(self._spark_config, "warm_start", False):
+            return
+        nlp = dftype != DFType.SPARK
+        self.stop(keep=dftype)
+        with self._lock:
+            if (self._sparknlp if nlp else self._spark) is not None or nlp in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="spark-warm-start"
+                )
+            self._logger.debug(f"Warming up a {dftype.value} session.")
+            self._pending[nlp] = self._executor.submit(self._get_or_create, nlp=nlp)
+
+    def tune(self, input_size: Optional[int], num_rows: Optional[int] = None) -> Dict[str, str]:
+        """Tunes the runtime settings of the sessions to the size of the input.
+
+        Shuffle partitions are sized like the partitions of the DatasetSizeThreshold the input
+        falls in, with at least one per core. The Arrow batch size is the number of rows that
+        fit in `arrow_batch_size` bytes. Settings are applied to running sessions and to the
+        sessions handed out later.
+
+        Args:
+            input_size (Optional[int]): In-memory size of the input in bytes. If None, the
+                Spark defaults are kept.
+            num_rows (Optional[int]): Number of rows of the input.
+
+        Returns:
+            Dict[str, str]: The runtime settings.
+        """
+        settings: Dict[str, str] = {}
+        if input_size:
+            partition_size = DatasetSizeThreshold.get_partition_size(
+                df_size=input_size
+            ).partition_size
+            num_cores = psutil.cpu_count(logical=True) or 1
+            partitions = min(max(num_cores, math.ceil(input_size / partition_size)), 10000)
+            settings["spark.sql.shuffle.partitions"] = str(partitions)
+            settings["spark.sql.adaptive.advisoryPartitionSizeInBytes"] = str(partition_size)
+            if num_rows:
+                batch_size = getattr(self._spark_config, "arrow_batch_size", None) or 16 * 1024**2
+                records = int(batch_size / (input_size / num_rows))
+                settings["spark.sql.execution.arrow.maxRecordsPerBatch"] = str(
+                    min(max(records, 1000), 1000000)
+                )
+        self._runtime_settings = settings
+        for session in (self._spark, self._sparknlp):
+            if session is not None:
+                self._apply(session)
+        self._logger.debug(f"Tuned Spark settings for an input of {input_size} bytes: {settings}")
+        return settings
+
+    def stop(self, keep: Optional[DFType] = None) -> None:
+        """Stops any active Spark or Spark NLP sessions.
+
+        Once no session is kept, the package archive shipped to cluster executors is removed.
+
+        Args:
+            keep (Optional[DFType]): Type of the session to keep running, if any.
+        """
+        keep_nlp = None if keep is None else keep != DFType.SPARK
+        if keep_nlp is not True:
+            self._discard(nlp=True)
+            if self._sparknlp is not None:
+                self._sparknlp.stop()
+                self._sparknlp = None
+        if keep_nlp is not False:
+            self._discard(nlp=False)
+            if self._spark is not None:
+                self._spark.stop()
+                self._spark = None
+        if keep is None:
+            self._remove_archive()
 
     def get_spark_session(self, dftype: DFType = DFType.SPARK) -> SparkSession:
         """Retrieves a Spark session based on dataframe type.
@@ -129,12 +266,84 @@ class SparkSessionPool:
             dftype (DFType): Type of DataFrame, either spark or sparknlp.
 
         Returns:
-            SparkSession: The requested Spark session.
+            SparkSession: The requested Spark session, with the tuned runtime settings.
         """
         if dftype == DFType.SPARK:
-            return self.spark
+            session = self.spark
         else:
-            return self.sparknlp
+            session = self.sparknlp
+        self._apply(session)
+        self._logger.info(f"Spark session settings: {self.settings}")
+        return session
+
+    def _await(self, nlp: bool) -> SparkSession:
+        """Returns the session being warmed up, or creates one."""
+        with self._lock:
+            future = self._pending.pop(nlp, None)
+        if future is not None:
+            return future.result()
+        return self._get_or_create(nlp=nlp)
+
+    def _discard(self, nlp: bool) -> None:
+        """Stops a session that is being warmed up."""
+        with self._lock:
+            future = self._pending.pop(nlp, None)
+        if future is not None:
+            try:
+                future.result().stop()
+            except RuntimeError as e:
+                self._logger.warning(f"Discarded a session that failed to warm up.\n{e}")
+
+    def _apply(self, session: SparkSession) -> None:
+        """Sets the runtime settings on a session."""
+        for key, value in self._runtime_settings.items():
+            session.conf.set(key, value)
+
+    def _static_settings(self) -> Dict[str, str]:
+        """Returns the settings fixed when a session is created.
+
+        Returns:
+            Dict[str, str]: The master, executor, serializer and off-heap memory settings.
+        """
+        settings = {
+            "spark.master": self.master,
+            **self._executor_settings(),
+            "spark.serializer": "org.apache.spark.serializer.KryoSerializer",
+            "spark.kryoserializer.buffer.max": "512m",
+        }
+        offheap_fraction = getattr(self._spark_config, "offheap_fraction", None) or 0
+        offheap_size = int(psutil.virtual_memory().total * offheap_fraction)
+        if offheap_size > 0:
+            settings["spark.memory.offHeap.enabled"] = "true"
+            settings["spark.memory.offHeap.size"] = str(offheap_size)
+        return settings
+
+    def _executor_settings(self) -> Dict[str, str]:
+        """Returns the executor count, cores and memory settings.
+
+        Executor memory defaults to the worker memory of `local-cluster[N,C,M]` masters, which
+        start N workers with C cores and M MB each, and to the driver memory otherwise. On
+        standalone clusters, the cores of all executors are requested with `spark.cores.max`.
+
+        Returns:
+            Dict[str, str]: The executor settings.
+        """
+        executor = getattr(self._spark_config, "executor", None)
+        instances = getattr(executor, "instances", None)
+        cores = getattr(executor, "cores", None)
+        memory = getattr(executor, "memory", None)
+        local_cluster = re.fullmatch(r"local-cluster\[(\d+),\s*(\d+),\s*(\d+)\]", self.master)
+        if memory is None and local_cluster:
+            memory = f"{local_cluster.group(3)}m"
+
+        settings = {"spark.executor.memory": str(memory or self._spark_config.memory)}
+        if instances is not None:
+            settings["spark.executor.instances"] = str(instances)
+        if cores is not None:
+            settings["spark.executor.cores"] = str(cores)
+        if instances is not None and cores is not None and not self.local:
+            settings["spark.cores.max"] = str(instances * cores)
+        return settings
 
     def _get_or_create(self, nlp: bool = False) -> SparkSession:
         """Creates or retrieves a Spark or Spark NLP session.
@@ -157,9 +366,58 @@ class SparkSessionPool:
                 parquet_block_size=self._spark_config.parquet_block_size,
                 retries=self._spark_config.retries,
             )
+        self._distribute(session=spark_session)
         atexit.register(shutdown, spark_session)
         return spark_session
 
+    def _distribute(self, session: SparkSession) -> None:
+        """Ships the configured files, and the genailab package to clusters, to the executors.
+
+        Files are added with `SparkContext.addFile` and resolved on the executors with
+        `SparkFiles`. On clusters, the genailab package is zipped and added to the executors'
+        Python path, so task and strategy classes referenced by UDFs can be unpickled there.
+        """
+        for filepath in self.files:
+            if os.path.exists(filepath):
+                session.sparkContext.addFile(os.path.abspath(filepath))
+            else:
+                self._logger.warning(f"Unable to distribute {filepath} to the executors. File not found.")
+        if not self.local:
+            archive = self._package_archive()
+            session.sparkContext.addPyFile(archive)
+            self._logger.debug(f"Shipped {archive} to the executors.")
+
+    @classmethod
+    def _package_archive(cls) -> str:
+        """Zips the genailab package once per process, leaving out bytecode and tool caches.
+
+        Returns:
+            str: Path of the archive.
+        """
+        with cls._archive_lock:
+            if cls._archive is None or not os.path.exists(cls._archive):
+                package = Path(__file__).resolve().parents[3]
+                archive = Path(tempfile.mkdtemp(prefix="genailab-")) / f"{package.name}.zip"
+                with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                    for root, dirs, files in os.walk(package):
+                        dirs[:] = sorted(d for d in dirs if d not in ARCHIVE_EXCLUDES)
+                        for name in sorted(files):
+                            if name.endswith((".pyc", ".pyo")):
+                                continue
+                            filepath = Path(root) / name
+                            zf.write(filepath, arcname=filepath.relative_to(package.parent))
+                cls._archive = str(archive)
+                atexit.register(cls._remove_archive)
+            return cls._archive
+
+    @classmethod
+    def _remove_archive(cls) -> None:
+        """Removes the package archive and its temporary directory, if one was built."""
+        with cls._archive_lock:
+            if cls._archive is not None:
+                shutil.rmtree(os.path.dirname(cls._archive), ignore_errors=True)
+                cls._archive = None
+
     def _create_session(
         self, memory: str, parquet_block_size: int, retries: int
     ) -> SparkSession:
@@ -185,12 +443,10 @@ class SparkSessionPool:
                 self._logger.debug(
                     f"Creating a Spark session. log4j Configuration: {log4j_conf_path}"
                 )
-                spark = (
+                builder = (
                     SparkSession.builder.appName("genailab")
-                    .master("local[*]")
                     .config("spark.sql.session.timeZone", "UTC")
                     .config("spark.driver.memory", memory)
-                    .config("spark.executor.memory", memory)
                     .config("spark.sql.codegen.maxFields", 200)
                     .config("spark.sql.adaptive.enabled", "true")
                     .config("spark.sql.parquet.block.size", parquet_block_size)
@@ -207,8 +463,10 @@ class SparkSessionPool:
                         "spark.executor.extraJavaOptions",
                         f"-Dlog4j.configurationFile={log4j_conf_path}",
                     )
-                    .getOrCreate()
                 )
+                for key, value in self._static_settings().items():
+                    builder = builder.config(key, value)
+                spark = builder.getOrCreate()
                 spark.sparkContext.setLogLevel("ERROR")
                 return spark
             except Exception as e:
@@ -248,7 +506,7 @@ class SparkSessionPool:
                 self._logger.debug(
                     f"Creating a Spark NLP session. log4j Configuration: {log4j_conf_path}"
                 )
-                spark=sparknlp.start()
+                spark = sparknlp.start(memory=memory, params=self._static_settings())
                 # spark = (
                 #     SparkSession.builder.appName("genai-lab-nlp")
                 #     .master("local[*]")
@@ -11,144 +11,347 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday May 29th 2024 12:30:01 am                                                 #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 07:46:54 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 """DataFrame Conversion Module"""
+import atexit
 import logging
 import os
 import shutil
-from typing import Optional
+import tempfile
+from typing import Any, Dict, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 import psutil  # For system memory info
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from genailab.core.dtypes import DATASET_SCHEMA, DFType
+from genailab.core.schema import Schema
 from genailab.infra.service.spark.pool import SparkSessionPool
-from pyspark.sql import DataFrame
+from pyspark.sql import DataFrame, SparkSession
+from pyspark.sql.pandas.types import to_arrow_schema
+from pyspark.sql.types import StructType, TimestampType
 
 
 # ------------------------------------------------------------------------------------------------ #
-class DataFrameConverter:
-    """Pandas and Spark DataFrame conversion with automatic optimization."""
+#                                  SPARK TO PANDAS                                                 #
+# ------------------------------------------------------------------------------------------------ #
+class SparkToPandasConverter:
+    """Streams a Spark DataFrame to pandas as Arrow record batches, without disk IO.
 
-    def __init__(self, spark_session_pool: SparkSessionPool) -> None:
-        self._spark_session_pool = spark_session_pool
+    Each Spark partition is converted to Arrow record batches on the executors with
+    `mapInArrow`, and each batch is shipped to the driver serialized in the Arrow IPC format.
+    The driver pulls one partition at a time with `toLocalIterator`, prefetching the next, so
+    batches can be converted to pandas as they arrive rather than after a full collect.
+
+    Types are mapped explicitly rather than left to pandas inference. Timestamps are converted
+    to naive wall-clock times in the Spark session time zone, as `toPandas` does, and each
+    column named in `schema` is cast to its dtype in Arrow before conversion, so categorical
+    columns arrive dictionary encoded and dates at the declared resolution.
+
+    Args:
+        schema (Optional[Dict[str, Any]]): Maps column names to pandas dtypes. Defaults to
+            DATASET_SCHEMA. Columns absent from the schema keep their Arrow types.
+        max_memory (Optional[int]): Ceiling in bytes on the Arrow data `to_pandas` may hold.
+            If exceeded, a MemoryError is raised before the driver runs out of memory.
+            Defaults to None, for no ceiling.
+        prefetch (bool): Whether to fetch the next partition while the current one is
+            converted. Defaults to True.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Dict[str, Any]] = None,
+        max_memory: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> None:
+        self._schema = DATASET_SCHEMA if schema is None else schema
+        self._max_memory = max_memory
+        self._prefetch = prefetch
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
-    def _estimate_row_size(self, sdf: DataFrame, sample_size: float = 0.01) -> int:
-        """Estimate the average row size in bytes (including handling text columns)."""
-        self._logger.debug(
-            f"Estimating row size by sampling {sample_size*100}% of the DataFrame"
+    def to_pandas(self, sdf: DataFrame) -> pd.DataFrame:
+        """Converts a Spark DataFrame to a pandas DataFrame.
+
+        Args:
+            sdf (DataFrame): The Spark DataFrame to convert.
+
+        Returns:
+            pd.DataFrame: The converted pandas DataFrame.
+
+        Raises:
+            MemoryError: If the data exceeds `max_memory`.
+        """
+        batches = []
+        nbytes = 0
+        for batch in self.iter_batches(sdf=sdf):
+            nbytes += batch.nbytes
+            if self._max_memory is not None and nbytes > self._max_memory:
+                raise MemoryError(
+                    f"Converting the Spark DataFrame to pandas exceeded the memory ceiling of "
+                    f"{self._max_memory} bytes. Use iter_pandas to process it in chunks."
+                )
+            batches.append(batch)
+        if batches:
+            table = pa.Table.from_batches(batches)
+        else:
+            table = self._get_arrow_schema(sdf=sdf).empty_table()
+        del batches
+        table = self._apply_schema(table=table)
+        self._logger.debug(f"Converted {table.num_rows} rows ({nbytes} bytes) to pandas.")
+        # self_destruct frees each Arrow column once converted, halving peak memory.
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def iter_pandas(self, sdf: DataFrame) -> Iterator[pd.DataFrame]:
+        """Streams a Spark DataFrame as pandas DataFrames, one per Arrow record batch.
+
+        Categorical columns are encoded per chunk, so their categories may differ from one
+        chunk to the next.
+
+        Args:
+            sdf (DataFrame): The Spark DataFrame to convert.
+
+        Yields:
+            pd.DataFrame: A chunk of at most `spark.sql.execution.arrow.maxRecordsPerBatch` rows.
+        """
+        for batch in self.iter_batches(sdf=sdf):
+            table = self._apply_schema(table=pa.Table.from_batches([batch]))
+            yield table.to_pandas(split_blocks=True, self_destruct=True)
+
+    def iter_batches(self, sdf: DataFrame) -> Iterator[pa.RecordBatch]:
+        """Streams the Arrow record batches of a Spark DataFrame to the driver in partition order.
+
+        Args:
+            sdf (DataFrame): The Spark DataFrame to convert.
+
+        Yields:
+            pa.RecordBatch: The record batches as produced by Spark.
+        """
+        serialized = sdf.mapInArrow(_serialize_batches, "batch binary")
+        for row in serialized.toLocalIterator(prefetchPartitions=self._prefetch):
+            with pa.ipc.open_stream(pa.py_buffer(row.batch)) as reader:
+                yield from reader
+
+    def _get_arrow_schema(self, sdf: DataFrame) -> pa.Schema:
+        """Returns the Arrow schema of the batches Spark produces for a DataFrame."""
+        schema = to_arrow_schema(sdf.schema)
+        timezone = sdf.sparkSession.conf.get("spark.sql.session.timeZone")
+        return pa.schema(
+            [
+                field.with_type(pa.timestamp(field.type.unit, tz=timezone))
+                if pa.types.is_timestamp(field.type) and field.type.tz
+                else field
+                for field in schema
+            ]
         )
-        sample_df = (
-            sdf.sample(withReplacement=False, fraction=sample_size)
-            .limit(1000)
-            .toPandas()
+
+    def _apply_schema(self, table: pa.Table) -> pa.Table:
+        """Converts timestamps to wall-clock times and casts columns to their declared dtypes."""
+        for i, field in enumerate(table.schema):
+            column = table.column(i)
+            if pa.types.is_timestamp(field.type) and field.type.tz:
+                column = pc.local_timestamp(column)
+            dtype = self._schema.get(field.name)
+            if dtype is not None:
+                column = self._cast(column=column, dtype=dtype)
+            if column.type != field.type:
+                table = table.set_column(i, field.name, column)
+        return table
+
+    def _cast(self, column: pa.ChunkedArray, dtype: Any) -> pa.ChunkedArray:
+        """Casts an Arrow column to the Arrow type that converts to the given pandas dtype."""
+        if str(dtype) == "category":
+            if pa.types.is_dictionary(column.type):
+                return column
+            return column.dictionary_encode()
+        if str(dtype) in ("str", "string", "object"):
+            return column.cast(pa.string())
+        return column.cast(pa.from_numpy_dtype(np.dtype(dtype)))
+
+
+# ------------------------------------------------------------------------------------------------ #
+def _serialize_batches(batches: Iterator[pa.RecordBatch]) -> Iterator[pa.RecordBatch]:
+    """Serializes each record batch of a partition to a single Arrow IPC binary value.
+
+    Runs on the executors via `mapInArrow`.
+    """
+    for batch in batches:
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array([sink.getvalue().to_pybytes()], type=pa.binary())], names=["batch"]
         )
-        row_size = 0
-        for col in sample_df.columns:
-            if pd.api.types.is_numeric_dtype(sample_df[col]):
-                row_size += 8
-            elif pd.api.types.is_string_dtype(sample_df[col]):
-                avg_string_length = sample_df[col].str.len().mean()
-                row_size += avg_string_length * 1.2
-        return row_size
-
-    def _determine_conversion_method(
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                  PANDAS TO SPARK                                                 #
+# ------------------------------------------------------------------------------------------------ #
+class PandasToSparkConverter:
+    """Converts a pandas DataFrame to Spark with a declared schema, in bounded Arrow chunks.
+
+    The Spark schema is derived from `schema` rather than inferred from the data, so no
+    inference pass runs and types do not drift between runs. Columns absent from `schema` are
+    typed from their pandas dtypes.
+
+    Frames smaller than `spill_threshold` are handed to `createDataFrame` as Arrow record
+    batches of at most `batch_size` rows. Larger frames would be copied whole into the driver
+    JVM that way, so they are instead written `batch_size` rows at a time to a Parquet file in
+    `staging_dir` and read back by the executors. Staging files back the lazily evaluated
+    DataFrame, so they are kept until the Python process exits.
+
+    Args:
+        schema (Optional[Dict[str, Any]]): Maps column names to pandas dtypes. Defaults to
+            DATASET_SCHEMA.
+        batch_size (int): Maximum number of rows per Arrow record batch. Defaults to 10,000.
+        spill_threshold (int): In-memory size in bytes above which frames are staged through
+            a Parquet file. Defaults to 1 GB.
+        staging_dir (Optional[str]): Directory for staging files. Defaults to the system
+            temporary directory.
+    """
+
+    def __init__(
         self,
-        sdf: DataFrame,
-        memory_fraction: float = 0.8,
-        parquet_threshold: int = 500 * 1024 * 1024,
-    ) -> str:
-        """
-        Determines whether to use direct conversion or Parquet-based conversion based on dataset size.
+        schema: Optional[Dict[str, Any]] = None,
+        batch_size: int = 10000,
+        spill_threshold: int = 1073741824,
+        staging_dir: Optional[str] = None,
+    ) -> None:
+        self._schema = DATASET_SCHEMA if schema is None else schema
+        self._batch_size = batch_size
+        self._spill_threshold = spill_threshold
+        self._staging_dir = staging_dir
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
+
+    def to_spark(self, pdf: pd.DataFrame, spark: SparkSession) -> DataFrame:
+        """Converts a pandas DataFrame to a Spark DataFrame.
 
         Args:
-            sdf (DataFrame): The Spark DataFrame.
-            memory_fraction (float): Fraction of available memory to use for estimation.
-            parquet_threshold (int): Threshold in bytes above which Parquet-based conversion is preferred.
+            pdf (pd.DataFrame): The pandas DataFrame to convert.
+            spark (SparkSession): The session in which to create the Spark DataFrame.
 
         Returns:
-            str: 'toPandas' or 'parquet' indicating the best conversion method.
+            DataFrame: The converted Spark DataFrame.
         """
-        total_rows = sdf.count()
-        row_size_estimate = self._estimate_row_size(sdf)
-        total_size_estimate = total_rows * row_size_estimate
-        available_memory = psutil.virtual_memory().available * memory_fraction
+        struct = self.get_struct_type(pdf=pdf)
+        size = pdf.memory_usage(deep=True).sum()
+        if size > self._spill_threshold:
+            return self._stage(pdf=pdf, spark=spark, struct=struct)
+        self._logger.debug(f"Converting {size} bytes to Spark in batches of {self._batch_size}.")
+        # The session is shared, so the Arrow settings apply only to this conversion.
+        # createDataFrame serializes the frame eagerly, so they can be restored once it returns.
+        settings = {
+            "spark.sql.execution.arrow.pyspark.enabled": "true",
+            "spark.sql.execution.arrow.maxRecordsPerBatch": str(self._batch_size),
+        }
+        previous = {key: spark.conf.get(key, None) for key in settings}
+        for key, value in settings.items():
+            spark.conf.set(key, value)
+        try:
+            return spark.createDataFrame(pdf, schema=struct)
+        finally:
+            for key, value in previous.items():
+                if value is None:
+                    spark.conf.unset(key)
+                else:
+                    spark.conf.set(key, value)
+
+    def get_struct_type(self, pdf: pd.DataFrame) -> StructType:
+        """Returns the Spark schema of a pandas DataFrame, preferring the declared dtypes."""
+        dtypes = {column: self._schema.get(column, pdf[column].dtype) for column in pdf.columns}
+        return Schema(dtypes=dtypes).struct_type
+
+    def _stage(self, pdf: pd.DataFrame, spark: SparkSession, struct: StructType) -> DataFrame:
+        """Writes the frame to a staging Parquet file in bounded batches and reads it in Spark."""
+        staging_dir = tempfile.mkdtemp(prefix="pandas_to_spark_", dir=self._staging_dir)
+        atexit.register(shutil.rmtree, staging_dir, True)
+        filepath = os.path.join(staging_dir, "data.parquet")
+        self._logger.debug(f"Staging {len(pdf)} rows for Spark at {filepath}.")
+
+        # Naive timestamps are wall-clock times in the session time zone, as in createDataFrame.
+        timezone = spark.conf.get("spark.sql.session.timeZone")
+        timestamps = [f.name for f in struct.fields if isinstance(f.dataType, TimestampType)]
+        arrow_schema = to_arrow_schema(struct)
+        with pq.ParquetWriter(filepath, schema=arrow_schema, compression="zstd") as writer:
+            for start in range(0, len(pdf), self._batch_size):
+                chunk = pdf.iloc[start : start + self._batch_size]
+                for column in timestamps:
+                    if getattr(chunk[column].dt, "tz", None) is None:
+                        chunk = chunk.assign(
+                            **{
+                                column: chunk[column].dt.tz_localize(
+                                    timezone, ambiguous="NaT", nonexistent="shift_forward"
+                                )
+                            }
+                        )
+                writer.write_batch(
+                    pa.RecordBatch.from_pandas(chunk, schema=arrow_schema, preserve_index=False)
+                )
+        return spark.read.schema(struct).parquet(filepath)
 
-        self._logger.debug(
-            f"Dataset size estimate: {total_size_estimate / (1024 * 1024)} MB"
-        )
-        self._logger.debug(f"Available memory: {available_memory / (1024 * 1024)} MB")
-
-        if (
-            total_size_estimate < available_memory
-            and total_size_estimate < parquet_threshold
-        ):
-            self._logger.debug("Using direct .toPandas() conversion.")
-            return "toPandas"
-        else:
-            self._logger.debug("Using Parquet-based conversion.")
-            return "parquet"
+
+# ------------------------------------------------------------------------------------------------ #
+#                                 DATAFRAME CONVERTER                                              #
+# ------------------------------------------------------------------------------------------------ #
+class DataFrameConverter:
+    """Pandas and Spark DataFrame conversion with automatic optimization."""
+
+    def __init__(self, spark_session_pool: SparkSessionPool) -> None:
+        self._spark_session_pool = spark_session_pool
+        self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     def to_pandas(
         self,
         sdf: DataFrame,
-        use_arrow: bool = False,
         memory_fraction: float = 0.8,
-        parquet_threshold: int = 500 * 1024 * 1024,
+        schema: Optional[Dict[str, Any]] = None,
     ) -> pd.DataFrame:
         """
-        Converts a Spark DataFrame to a Pandas DataFrame, automatically choosing the best approach.
+        Converts a Spark DataFrame to a Pandas DataFrame by streaming Arrow record batches.
 
         Args:
             sdf (DataFrame): The Spark DataFrame to convert.
-            use_arrow (bool): Whether to use Apache Arrow for optimized conversion.
-            memory_fraction (float): Fraction of available memory to use for determining partitions.
-            parquet_threshold (int): Size threshold in bytes for deciding when to use Parquet-based conversion.
+            memory_fraction (float): Fraction of available memory the converted data may use.
+            schema (Optional[Dict[str, Any]]): Maps column names to pandas dtypes. Defaults to
+                DATASET_SCHEMA.
 
         Returns:
             pd.DataFrame: The converted Pandas DataFrame.
         """
-        conversion_method = self._determine_conversion_method(
-            sdf, memory_fraction, parquet_threshold
-        )
+        max_memory = int(psutil.virtual_memory().available * memory_fraction)
+        self._logger.debug(f"Converting to pandas with a ceiling of {max_memory} bytes.")
+        converter = SparkToPandasConverter(schema=schema, max_memory=max_memory)
+        return converter.to_pandas(sdf=sdf)
 
-        if conversion_method == "toPandas":
-            if use_arrow:
-                self._logger.debug("Attempting conversion using Apache Arrow.")
-                spark = sdf.sql_ctx.sparkSession
-                spark.conf.set("spark.sql.execution.arrow.pyspark.enabled", "true")
-                try:
-                    return sdf.toPandas()
-                except Exception as e:
-                    self._logger.error(
-                        f"Arrow conversion failed: {e}, falling back to partition-based conversion."
-                    )
-            else:
-                return sdf.toPandas()
-        else:
-            # Save as Parquet and read back using Pandas
-            temp_parquet_path = "temp_dir/temp_data.parquet"
-            os.makedirs(os.path.dirname(temp_parquet_path))
-            self._logger.debug(
-                f"Saving Spark DataFrame as Parquet to temporary file: {temp_parquet_path}"
-            )
-            sdf.write.mode("overwrite").parquet(temp_parquet_path)
-            self._logger.debug("Reading Parquet data back into Pandas.")
-            pdf = pd.read_parquet(temp_parquet_path)
-            self._logger.debug("Removing temporary Parquet file.")
-            shutil.rmtree(os.path.dirname(temp_parquet_path))
-            return pdf
-
-    def to_spark(self, pdf: pd.DataFrame, nlp: Optional[str] = None) -> DataFrame:
-        """Convert a Pandas DataFrame to a Spark DataFrame with logging."""
+    def to_spark(
+        self,
+        pdf: pd.DataFrame,
+        nlp: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> DataFrame:
+        """Converts a Pandas DataFrame to a Spark DataFrame with a declared schema.
+
+        Args:
+            pdf (pd.DataFrame): The Pandas DataFrame to convert.
+            nlp (bool): Whether to create the DataFrame in the Spark NLP session.
+            schema (Optional[Dict[str, Any]]): Maps column names to pandas dtypes. Defaults to
+                DATASET_SCHEMA.
+
+        Returns:
+            DataFrame: The converted Spark DataFrame.
+        """
         self._logger.debug("Starting Pandas to Spark DataFrame conversion.")
-        spark_session = self._spark_session_pool.get_or_create(nlp=nlp)
+        spark_session = self._spark_session_pool.get_spark_session(
+            dftype=DFType.SPARKNLP if nlp else DFType.SPARK
+        )
 
         try:
-            return spark_session.createDataFrame(pdf)
+            return PandasToSparkConverter(schema=schema).to_spark(pdf=pdf, spark=spark_session)
         except Exception as e:
             msg = f"Exception occurred while converting Pandas DataFrame to Spark DataFrame: {e}"
             self._logger.exception(msg)
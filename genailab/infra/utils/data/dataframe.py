@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Friday September 20th 2024 04:35:45 pm                                              #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 07:25:54 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -156,6 +156,74 @@ class PySparkDataFrameMemoryFootprintEstimator:
         return sample_size
 
 
+# ------------------------------------------------------------------------------------------------ #
+class PandasDataFrameMemoryFootprintEstimator:
+    """
+    Estimates the memory footprint of a pandas DataFrame using a log-based sampling strategy.
+
+    Measuring the deep memory usage of object columns touches every string, so only a sample
+    of rows is measured and the average row size is extrapolated.
+    """
+
+    def estimate_memory_size(self, df: pd.DataFrame) -> int:
+        """
+        Estimates the total memory footprint of a pandas DataFrame in bytes.
+
+        Args:
+            df (pd.DataFrame): The pandas DataFrame to estimate the memory size for.
+
+        Returns:
+            int: The estimated memory size in bytes.
+        """
+        return int(self.estimate_row_size(df=df) * len(df))
+
+    def estimate_row_size(self, df: pd.DataFrame) -> float:
+        """
+        Estimates the average memory footprint of a row of a pandas DataFrame in bytes.
+
+        Args:
+            df (pd.DataFrame): The pandas DataFrame to estimate the row size for.
+
+        Returns:
+            float: The estimated average row size in bytes.
+        """
+        total_rows = len(df)
+        if total_rows == 0:
+            return 0.0
+
+        # Calculate optimal sample size based on total rows
+        sample_size = min(self._calculate_sample_size(total_rows=total_rows), total_rows)
+
+        # Take sample from the DataFrame
+        sample_df = df.sample(n=sample_size, random_state=0) if sample_size < total_rows else df
+
+        # Calculate the average row size (in bytes)
+        return float(sample_df.memory_usage(deep=True, index=False).sum()) / len(sample_df)
+
+    def _calculate_sample_size(
+        self,
+        total_rows: int,
+        base: int = 10,
+        scaling_factor: int = 500,
+        min_sample_rows: int = 1000,
+    ) -> int:
+        """
+        Calculates a log-based sample size.
+
+        Args:
+            total_rows (int): Total number of rows in the DataFrame.
+            base (int): Base of the logarithm. Defaults to 10.
+            scaling_factor (int): Multiplier to scale the sample size. Defaults to 500.
+            min_sample_rows (int): Minimum sample size. Defaults to 1000.
+
+        Returns:
+            int: The calculated sample size.
+        """
+        log_rows = math.log(max(total_rows, 1), base)  # Avoid log(0) by using max(1)
+        sample_size = max(int(log_rows * scaling_factor), min_sample_rows)
+        return sample_size
+
+
 # ------------------------------------------------------------------------------------------------ #
 class DatasetSizeThreshold(Enum):
     """Manages the relationship between maximum dataset size and partition size."""
@@ -185,8 +253,8 @@ class Optimizer:
         self, df: pd.DataFrame, adjust: float = 1.0
     ) -> Tuple[int, float]:
 
-        # Obtain dataframe size
-        df_size = df.memory_usage(deep=True).sum()
+        # Estimate the dataframe size from a sample of rows rather than measuring every string
+        df_size = PandasDataFrameMemoryFootprintEstimator().estimate_memory_size(df=df)
 
         # Determine the partition size based on dataset size thresholds
         partition_enum = DatasetSizeThreshold.get_partition_size(df_size=df_size)
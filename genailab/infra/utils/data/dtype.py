@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday May 29th 2024 04:23:05 am                                                 #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 07:46:36 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -47,7 +47,8 @@ class CastPandas:
         """
         for column, dtype in datatypes.items():
             if column in data.columns:
-                data[column] = data[column].astype(dtype)
+                if data[column].dtype != dtype:
+                    data[column] = data[column].astype(dtype)
             else:
                 msg = f"Column {column} not found in DataFrame"
                 self._logger.exception(msg)
@@ -84,8 +85,13 @@ class CastPySpark:
         structtype = StructType(fields)
 
         # Create a list of columns with the desired data types
+        current = {field.name: field.dataType for field in data.schema.fields}
         casted_columns = []
         for column in structtype:
+            # Columns already of the target type, e.g. read with a declared schema, are kept
+            if current.get(column.name) == column.dataType:
+                casted_columns.append(col(column.name))
+                continue
             # Otherwise, cast to the target data type
             casted_col = col(column.name).cast(column.dataType).alias(column.name)
             casted_columns.append(casted_col)
@@ -11,33 +11,80 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday October 13th 2024 01:35:20 am                                                #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 06:23:48 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
-# ================================================================================================ #
-import hashlib
+"""Dataset Fingerprint Module"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xxhash
 from pyspark.sql import DataFrame as SparkDataFrame
+from pyspark.sql import functions as F
 
 
+# ------------------------------------------------------------------------------------------------ #
+#                                      HASH SERVICE                                                #
 # ------------------------------------------------------------------------------------------------ #
 class HashService:
-    def __init__(self, num_rows: int = 5):
-        """
-        Initializes the HashService with the number of rows to consider for hashing.
+    """Computes full-content fingerprints for datasets in memory and on disk.
 
-        :param num_rows: Number of rows to sample from the DataFrame for hashing.
-        """
-        self.num_rows = num_rows
+    Every fingerprint covers the complete content of the dataset, not a sample, and the work is
+    split into independent units that are hashed in parallel with xxHash (XXH3-128):
+
+    - Pandas DataFrames are converted to Arrow record batches of ``chunk_size`` rows and the
+      Arrow buffers of each batch are hashed directly, without serialization.
+    - Spark DataFrames are hashed on the executors with Spark's native ``xxhash64``, aggregated
+      with order-independent reductions so the result does not depend on partitioning.
+    - Files on disk are hashed per Parquet row group, reading only the column chunk byte ranges
+      recorded in the footer. Other file formats are hashed in fixed-size blocks.
+
+    ``hash_footer`` produces a much cheaper fingerprint from Parquet footers alone (row counts,
+    column chunk sizes and statistics). It reads a few kilobytes per file and is used to verify
+    that a dataset on disk is unchanged since its content fingerprint was recorded.
 
+    Fingerprints are engine specific: a pandas and a Spark DataFrame holding the same data do not
+    produce the same ``hash_dataframe`` value. Use ``hash_file`` to compare datasets across
+    engines.
+
+    Args:
+        chunk_size (int): Number of rows per Arrow record batch when hashing pandas DataFrames.
+            Defaults to 65,536.
+        block_size (int): Size in bytes of the blocks read when hashing files. Row groups
+            larger than this are streamed through the hasher in blocks. Defaults to 8 MiB.
+        max_workers (Optional[int]): Maximum number of hashing threads. Defaults to the number
+            of CPUs.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 65536,
+        block_size: int = 8 * 1024 * 1024,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self._chunk_size = chunk_size
+        self._block_size = block_size
+        self._max_workers = max_workers or os.cpu_count() or 1
+
+    # -------------------------------------------------------------------------------------------- #
+    #                                      DATAFRAMES                                              #
+    # -------------------------------------------------------------------------------------------- #
     def hash_dataframe(self, df) -> str:
-        """
-        Hashes the metadata of a DataFrame, supports both Pandas and Spark DataFrames.
+        """Computes a full-content fingerprint for a pandas or Spark DataFrame.
+
+        Args:
+            df (Union[pd.DataFrame, SparkDataFrame]): The DataFrame to fingerprint.
 
-        :param df: DataFrame (Pandas or Spark) to hash.
-        :return: Hash string representing the DataFrame's metadata.
+        Returns:
+            str: Hexadecimal fingerprint of the DataFrame's schema and content.
+
+        Raises:
+            ValueError: If the DataFrame type is not supported.
         """
         if isinstance(df, pd.DataFrame):
             return self._hash_pandas_dataframe(df)
@@ -49,35 +96,218 @@ class HashService:
             )
 
     def _hash_pandas_dataframe(self, df: pd.DataFrame) -> str:
+        """Fingerprints a pandas DataFrame from the Arrow buffers of its row chunks.
+
+        Each chunk is converted to an Arrow record batch and hashed on a worker thread. The chunk
+        digests are combined in row order together with the schema.
+
+        Args:
+            df (pd.DataFrame): Pandas DataFrame to hash.
+
+        Returns:
+            str: Hexadecimal fingerprint.
         """
-        Generates a hash for a Pandas DataFrame based on its metadata.
+        bounds = [
+            (start, min(start + self._chunk_size, len(df)))
+            for start in range(0, len(df), self._chunk_size)
+        ]
+        schema = pa.Schema.from_pandas(df, preserve_index=False).remove_metadata()
+
+        def hash_chunk(bound: Tuple[int, int]) -> bytes:
+            batch = pa.RecordBatch.from_pandas(
+                df.iloc[bound[0] : bound[1]], schema=schema, preserve_index=False
+            )
+            hasher = xxhash.xxh3_128()
+            for column in batch.columns:
+                self._update_with_array(hasher=hasher, array=column)
+            return hasher.digest()
+
+        digests = self._map(hash_chunk, bounds)
+
+        hasher = xxhash.xxh3_128(schema.to_string().encode("utf-8"))
+        hasher.update(str(len(df)).encode("utf-8"))
+        for digest in digests:
+            hasher.update(digest)
+        return hasher.hexdigest()
+
+    def _hash_spark_dataframe(self, df: SparkDataFrame) -> str:
+        """Fingerprints a Spark DataFrame on the executors.
 
-        :param df: Pandas DataFrame to hash.
-        :return: Hash string.
+        Rows are hashed with Spark's ``xxhash64`` and reduced with a count, an overflow-free sum
+        and a bitwise XOR, all of which are independent of row order and partitioning.
+
+        Args:
+            df (SparkDataFrame): Spark DataFrame to hash.
+
+        Returns:
+            str: Hexadecimal fingerprint.
         """
-        # Collect metadata
-        metadata = (
-            str(df.shape)
-            + str(df.columns.tolist())
-            + str(df.head(self.num_rows).values)
+        row_hash = F.xxhash64(*[F.col(f"`{column}`") for column in df.columns]).alias("h")
+        summary = (
+            df.select(row_hash)
+            .agg(
+                F.count(F.lit(1)).alias("n"),
+                F.sum(F.col("h").cast("decimal(38,0)")).alias("s"),
+                F.expr("bit_xor(h)").alias("x"),
+            )
+            .collect()[0]
         )
+        hasher = xxhash.xxh3_128(df.schema.simpleString().encode("utf-8"))
+        hasher.update(f"{summary['n']}|{summary['s']}|{summary['x']}".encode("utf-8"))
+        return hasher.hexdigest()
 
-        # Generate hash
-        return hashlib.md5(metadata.encode("utf-8")).hexdigest()
+    def _update_with_array(self, hasher: xxhash.xxh3_128, array: pa.Array) -> None:
+        """Feeds the buffers of an Arrow array, including dictionaries, into the hasher."""
+        for buffer in array.buffers():
+            if buffer is not None:
+                hasher.update(memoryview(buffer))
+        if isinstance(array, pa.DictionaryArray):
+            self._update_with_array(hasher=hasher, array=array.dictionary)
 
-    def _hash_spark_dataframe(self, df: SparkDataFrame) -> str:
+    # -------------------------------------------------------------------------------------------- #
+    #                                        FILES                                                 #
+    # -------------------------------------------------------------------------------------------- #
+    def hash_file(self, filepath: str) -> str:
+        """Computes a full-content fingerprint for a file or directory of files.
+
+        Parquet files are split into one unit of work per row group; other files are split into
+        fixed-size blocks. All units are hashed in parallel and combined in file order. Partition
+        directory names are part of the fingerprint, file names are not, so datasets written by
+        Spark with random part-file names still fingerprint identically.
+
+        Args:
+            filepath (str): Path to a file or a directory containing a partitioned dataset.
+
+        Returns:
+            str: Hexadecimal fingerprint.
+
+        Raises:
+            FileNotFoundError: If the filepath does not exist.
         """
-        Generates a hash for a Spark DataFrame based on its schema and first few rows.
+        files = self._list_files(filepath=filepath)
+        ranges = []
+        for path in files:
+            ranges.extend(self._get_ranges(path=path))
+
+        digests = self._map(self._hash_range, ranges)
+
+        hasher = xxhash.xxh3_128()
+        for (path, _, _), digest in zip(ranges, digests):
+            hasher.update(self._relative_dir(root=filepath, path=path).encode("utf-8"))
+            hasher.update(digest)
+        return hasher.hexdigest()
 
-        :param df: Spark DataFrame to hash.
-        :return: Hash string.
+    def hash_footer(self, filepath: str) -> str:
+        """Computes a metadata-only fingerprint from Parquet footers.
+
+        The fingerprint covers the schema, row counts, and the size and statistics of every
+        column chunk. Non-Parquet files contribute only their size. Only footers are read, so
+        this is cheap enough to run every time a cached dataset is validated.
+
+        Args:
+            filepath (str): Path to a file or a directory containing a partitioned dataset.
+
+        Returns:
+            str: Hexadecimal fingerprint.
+
+        Raises:
+            FileNotFoundError: If the filepath does not exist.
         """
-        # Collect metadata: schema and sample rows
-        schema_str = str(df.schema)
-        rows_str = str(df.limit(self.num_rows).collect())
+        files = self._list_files(filepath=filepath)
+        summaries = self._map(self._summarize_footer, files)
+
+        hasher = xxhash.xxh3_128()
+        for path, summary in zip(files, summaries):
+            hasher.update(self._relative_dir(root=filepath, path=path).encode("utf-8"))
+            hasher.update(summary.encode("utf-8"))
+        return hasher.hexdigest()
+
+    def _list_files(self, filepath: str) -> List[str]:
+        """Lists the data files for a path in a stable order, skipping marker and hidden files."""
+        if os.path.isfile(filepath):
+            return [filepath]
+        if not os.path.isdir(filepath):
+            raise FileNotFoundError(f"File {filepath} does not exist.")
+        files = []
+        for root, dirs, names in os.walk(filepath):
+            dirs[:] = sorted(d for d in dirs if not d.startswith((".", "_")))
+            files.extend(
+                os.path.join(root, name)
+                for name in sorted(names)
+                if not name.startswith((".", "_"))
+            )
+        return files
+
+    def _get_ranges(self, path: str) -> List[Tuple[str, int, int]]:
+        """Returns the (path, offset, length) byte ranges to hash for a file."""
+        if path.endswith(".parquet"):
+            metadata = pq.read_metadata(path)
+            ranges = []
+            for i in range(metadata.num_row_groups):
+                row_group = metadata.row_group(i)
+                start, end = None, 0
+                for j in range(row_group.num_columns):
+                    column = row_group.column(j)
+                    offset = column.data_page_offset
+                    if column.has_dictionary_page and column.dictionary_page_offset:
+                        offset = min(offset, column.dictionary_page_offset)
+                    start = offset if start is None else min(start, offset)
+                    end = max(end, offset + column.total_compressed_size)
+                if start is not None:
+                    ranges.append((path, start, end - start))
+            return ranges
+        size = os.path.getsize(path)
+        return [
+            (path, offset, min(self._block_size, size - offset))
+            for offset in range(0, size, self._block_size)
+        ]
+
+    def _hash_range(self, byte_range: Tuple[str, int, int]) -> bytes:
+        """Hashes a byte range of a file, streaming it in blocks."""
+        path, offset, length = byte_range
+        hasher = xxhash.xxh3_128()
+        with open(path, "rb") as file:
+            file.seek(offset)
+            while length > 0:
+                block = file.read(min(self._block_size, length))
+                if not block:
+                    break
+                hasher.update(block)
+                length -= len(block)
+        return hasher.digest()
+
+    def _summarize_footer(self, path: str) -> str:
+        """Summarizes the footer of a Parquet file, or the size of any other file."""
+        if not path.endswith(".parquet"):
+            return str(os.path.getsize(path))
+        metadata = pq.read_metadata(path)
+        parts = [metadata.schema.to_arrow_schema().remove_metadata().to_string()]
+        parts.append(str(metadata.num_rows))
+        for i in range(metadata.num_row_groups):
+            row_group = metadata.row_group(i)
+            parts.append(f"{row_group.num_rows}:{row_group.total_byte_size}")
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                stats = column.statistics
+                stats = (
+                    f"{stats.null_count}:{stats.min}:{stats.max}"
+                    if stats is not None and stats.has_min_max
+                    else ""
+                )
+                parts.append(
+                    f"{column.path_in_schema}:{column.total_compressed_size}:{stats}"
+                )
+        return "|".join(parts)
 
-        # Combine schema and rows metadata
-        metadata = schema_str + rows_str
+    def _relative_dir(self, root: str, path: str) -> str:
+        """Returns the directory of a file relative to the dataset root, e.g. a partition."""
+        if os.path.isfile(root):
+            return ""
+        return os.path.relpath(os.path.dirname(path), root)
 
-        # Generate hash
-        return hashlib.md5(metadata.encode("utf-8")).hexdigest()
+    def _map(self, fn, items: list) -> list:
+        """Applies fn to items on a thread pool, preserving order."""
+        if len(items) <= 1 or self._max_workers == 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self._max_workers, len(items))) as executor:
+            return list(executor.map(fn, items))
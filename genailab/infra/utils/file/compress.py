@@ -11,16 +11,203 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Sunday April 28th 2024 12:15:31 am                                                  #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 07:47:39 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 """File Compression Module"""
+import io
 import logging
 import os
+import struct
 import tarfile
 import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Optional
+
+# ------------------------------------------------------------------------------------------------ #
+# Block gzip members carry their total size in a 'GL' extra subfield, as BGZF does, so a reader can
+# find member boundaries without inflating. Tools unaware of the subfield ignore it.
+GZIP_MAGIC = b"\x1f\x8b"
+BLOCK_HEADER = struct.Struct("<4sIBBHBBHI")  # magic+cm+flg, mtime, xfl, os, xlen, si1, si2, slen, size
+BLOCK_TRAILER = struct.Struct("<II")  # crc32, isize
+BLOCK_SUBFIELD = (ord("G"), ord("L"))
+BLOCK_OVERHEAD = BLOCK_HEADER.size + BLOCK_TRAILER.size
+# Extensions of formats that are already compressed and gain nothing from being deflated again.
+COMPRESSED_EXTENSIONS = (".parquet", ".gz", ".tgz", ".zst", ".zip", ".bz2", ".xz", ".npz", ".png", ".jpg")
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                  BLOCK GZIP WRITER                                               #
+# ------------------------------------------------------------------------------------------------ #
+class BlockGzipWriter(io.RawIOBase):
+    """Write-only stream that compresses blocks of data into gzip members in parallel.
+
+    Data written to the stream is cut into fixed size blocks, each compressed into an independent
+    gzip member by a thread pool. zlib releases the GIL, so blocks compress on all cores. Members
+    are written in order as they complete, and at most two blocks per worker are in flight, which
+    bounds memory without staging the whole archive. Concatenated gzip members are a valid gzip
+    file, readable by gzip, tar and any other standard tool.
+
+    Args:
+        fileobj (io.BufferedIOBase): The binary stream to which members are written.
+        block_size (int): Uncompressed bytes per member. Defaults to 4 MB.
+        compresslevel (int): zlib compression level. Defaults to 6, as gzip.
+        max_workers (Optional[int]): Compression threads. Defaults to the number of CPUs.
+    """
+
+    def __init__(
+        self,
+        fileobj: io.BufferedIOBase,
+        block_size: int = 4194304,
+        compresslevel: int = 6,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        super().__init__()
+        self._fileobj = fileobj
+        self._block_size = block_size
+        self._compresslevel = compresslevel
+        max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._max_pending = 2 * max_workers
+        self._pending: Deque[Future] = deque()
+        self._buffer = bytearray()
+        self._members = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            self._submit(bytes(self._buffer[: self._block_size]))
+            del self._buffer[: self._block_size]
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            # An empty stream still needs one member to be a valid gzip file.
+            if self._buffer or not self._members:
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._fileobj.write(self._pending.popleft().result())
+        finally:
+            self._executor.shutdown()
+            super().close()
+
+    def _submit(self, block: bytes) -> None:
+        self._pending.append(self._executor.submit(self._compress, block))
+        self._members += 1
+        while len(self._pending) > self._max_pending or (
+            self._pending and self._pending[0].done()
+        ):
+            self._fileobj.write(self._pending.popleft().result())
+
+    def _compress(self, block: bytes) -> bytes:
+        compressor = zlib.compressobj(self._compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+        deflated = compressor.compress(block) + compressor.flush()
+        header = BLOCK_HEADER.pack(
+            GZIP_MAGIC + b"\x08\x04",  # deflate, FEXTRA
+            0,
+            0,
+            255,
+            8,
+            *BLOCK_SUBFIELD,
+            4,
+            len(deflated) + BLOCK_OVERHEAD,
+        )
+        trailer = BLOCK_TRAILER.pack(zlib.crc32(block), len(block) & 0xFFFFFFFF)
+        return header + deflated + trailer
+
+
+# ------------------------------------------------------------------------------------------------ #
+#                                  BLOCK GZIP READER                                               #
+# ------------------------------------------------------------------------------------------------ #
+class BlockGzipReader(io.RawIOBase):
+    """Read-only stream that inflates the members of a block gzip file in parallel.
+
+    Member sizes are read from the 'GL' header subfield written by `BlockGzipWriter`, so members
+    are read sequentially but inflated concurrently, with a bounded number in flight.
+
+    Args:
+        fileobj (io.BufferedIOBase): The binary stream containing block gzip members.
+        max_workers (Optional[int]): Decompression threads. Defaults to the number of CPUs.
+    """
+
+    def __init__(self, fileobj: io.BufferedIOBase, max_workers: Optional[int] = None) -> None:
+        super().__init__()
+        self._fileobj = fileobj
+        max_workers = max_workers or os.cpu_count() or 1
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._max_pending = 2 * max_workers
+        self._pending: Deque[Future] = deque()
+        self._buffer = memoryview(b"")
+        self._eof = False
+
+    @staticmethod
+    def is_block_gzip(filepath: str) -> bool:
+        """Returns True if the file starts with a block gzip member."""
+        with open(filepath, "rb") as file:
+            header = file.read(BLOCK_HEADER.size)
+        return BlockGzipReader._get_member_size(header) is not None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            self._fill()
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown()
+            super().close()
+
+    def _fill(self) -> None:
+        while not self._eof and len(self._pending) < self._max_pending:
+            header = self._fileobj.read(BLOCK_HEADER.size)
+            if not header:
+                self._eof = True
+                break
+            size = self._get_member_size(header)
+            if size is None:
+                raise zlib.error("Not a block gzip member.")
+            member = self._fileobj.read(size - BLOCK_HEADER.size)
+            if len(member) != size - BLOCK_HEADER.size:
+                raise EOFError("Truncated block gzip member.")
+            self._pending.append(self._executor.submit(self._decompress, member))
+
+    @staticmethod
+    def _decompress(member: bytes) -> bytes:
+        block = zlib.decompress(member[: -BLOCK_TRAILER.size], -zlib.MAX_WBITS)
+        crc, isize = BLOCK_TRAILER.unpack(member[-BLOCK_TRAILER.size :])
+        if zlib.crc32(block) != crc or len(block) & 0xFFFFFFFF != isize:
+            raise zlib.error("CRC check failed for block gzip member.")
+        return block
+
+    @staticmethod
+    def _get_member_size(header: bytes) -> Optional[int]:
+        if len(header) < BLOCK_HEADER.size:
+            return None
+        magic, _, _, _, xlen, si1, si2, slen, size = BLOCK_HEADER.unpack(header)
+        if magic != GZIP_MAGIC + b"\x08\x04" or xlen != 8 or (si1, si2) != BLOCK_SUBFIELD:
+            return None
+        return size if slen == 4 else None
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -30,6 +217,16 @@ class TarGzHandler:
     """
     A class to handle .tar.gz file operations such as extracting and compressing directories or single files.
 
+    Archives are written as block gzip, compressed in parallel and streamed to disk, and archives
+    written this way are extracted with parallel decompression. The output is a standard .tar.gz
+    file. Other .tar.gz files are extracted serially.
+
+    Args:
+        block_size (int): Uncompressed bytes per gzip member. Defaults to 4 MB.
+        compresslevel (int): zlib compression level. Defaults to 6.
+        max_workers (Optional[int]): Compression threads. Defaults to the number of CPUs.
+        parallel (bool): Whether to compress and extract in parallel. Defaults to True.
+
     Example:
         # To extract a .tar.gz file:
         handler = TarGzHandler()
@@ -42,7 +239,17 @@ class TarGzHandler:
         handler.compress_file('/path/to/file', '/path/to/file.tar.gz')
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        block_size: int = 4194304,
+        compresslevel: int = 6,
+        max_workers: Optional[int] = None,
+        parallel: bool = True,
+    ) -> None:
+        self._block_size = block_size
+        self._compresslevel = compresslevel
+        self._max_workers = max_workers
+        self._parallel = parallel
         self._logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
 
     def extract(self, tar_gz_path, extract_dir):
@@ -58,13 +265,21 @@ class TarGzHandler:
         """
         os.makedirs(extract_dir, exist_ok=True)
         try:
-            with tarfile.open(tar_gz_path, "r:gz") as tar:
-                tar.extractall(path=extract_dir)
-                print(f"Extracted {tar_gz_path} to {extract_dir}")
+            if self._parallel and BlockGzipReader.is_block_gzip(tar_gz_path):
+                with open(tar_gz_path, "rb") as file, BlockGzipReader(
+                    file, max_workers=self._max_workers
+                ) as reader, tarfile.open(
+                    fileobj=io.BufferedReader(reader, buffer_size=self._block_size), mode="r|"
+                ) as tar:
+                    tar.extractall(path=extract_dir)
+            else:
+                with tarfile.open(tar_gz_path, "r:gz") as tar:
+                    tar.extractall(path=extract_dir)
+            print(f"Extracted {tar_gz_path} to {extract_dir}")
         except FileNotFoundError as e:
             self._logger.exception(f"Error extracting {tar_gz_path}: {e}")
             raise
-        except tarfile.TarError as e:
+        except (tarfile.TarError, zlib.error) as e:
             self._logger.exception(f"Error extracting {tar_gz_path}: {e}")
             raise
 
@@ -80,9 +295,8 @@ class TarGzHandler:
             tarfile.TarError: If there is an error during compression.
         """
         try:
-            with tarfile.open(tar_gz_path, "w:gz") as tar:
-                tar.add(directory_path, arcname=os.path.basename(directory_path))
-                print(f"Compressed {directory_path} into {tar_gz_path}")
+            self._compress(path=directory_path, tar_gz_path=tar_gz_path)
+            print(f"Compressed {directory_path} into {tar_gz_path}")
         except FileNotFoundError as e:
             self._logger.exception(
                 f"Error compressing {directory_path} into {tar_gz_path}: {e}"
@@ -107,9 +321,8 @@ class TarGzHandler:
         """
         os.makedirs(os.path.dirname(tar_gz_path), exist_ok=True)
         try:
-            with tarfile.open(tar_gz_path, "w:gz") as tar:
-                tar.add(filepath, arcname=os.path.basename(filepath))
-                print(f"Compressed {filepath} into {tar_gz_path}")
+            self._compress(path=filepath, tar_gz_path=tar_gz_path)
+            print(f"Compressed {filepath} into {tar_gz_path}")
         except FileNotFoundError as e:
             self._logger.exception(
                 f"Error compressing {filepath} into {tar_gz_path}: {e}"
@@ -121,25 +334,69 @@ class TarGzHandler:
             )
             raise
 
+    def _compress(self, path: str, tar_gz_path: str) -> None:
+        """Adds a file or directory to a new .tar.gz archive."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{path} does not exist.")
+        if not self._parallel:
+            with tarfile.open(tar_gz_path, "w:gz", compresslevel=self._compresslevel) as tar:
+                tar.add(path, arcname=os.path.basename(path))
+            return
+        with open(tar_gz_path, "wb") as file, BlockGzipWriter(
+            file,
+            block_size=self._block_size,
+            compresslevel=self._compresslevel,
+            max_workers=self._max_workers,
+        ) as writer, tarfile.open(fileobj=writer, mode="w|") as tar:
+            tar.add(path, arcname=os.path.basename(path))
+
 
 # ------------------------------------------------------------------------------------------------ #
 #                                  ZIP FILE HANDLER                                                #
 # ------------------------------------------------------------------------------------------------ #
 class ZipFileHandler:
-    def __init__(self):
-        """Initialize the ZipFileHandler with no arguments."""
-        pass
+    def __init__(self, max_workers: Optional[int] = None, store_compressed: bool = True):
+        """Initialize the ZipFileHandler.
+
+        Args:
+            max_workers (Optional[int]): Extraction threads. Defaults to the number of CPUs.
+            store_compressed (bool): Whether files in already compressed formats, such as
+                Parquet, are stored rather than deflated again. Defaults to True.
+        """
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._store_compressed = store_compressed
 
     def extract(self, zippath, extract_to):
         """
         Extracts the contents of the zip file to the specified directory.
 
+        Members are split across threads, each reading the archive through its own handle.
+
         Args:
             zippath (str): The path to the zip file to extract.
             extract_to (str): The directory to extract the contents to.
+
+        Raises:
+            ValueError: If a member would be extracted outside `extract_to`.
         """
         with zipfile.ZipFile(zippath, "r") as zip_ref:
-            zip_ref.extractall(extract_to)
+            members = zip_ref.namelist()
+        root = os.path.realpath(extract_to)
+        targets = [os.path.realpath(os.path.join(root, member)) for member in members]
+        for member, target in zip(members, targets):
+            if os.path.commonpath([root, target]) != root:
+                raise ValueError(f"Member {member} of {zippath} is outside {extract_to}.")
+        # Directories are created up front, so threads don't race to create them.
+        for target in targets:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        workers = max(1, min(self._max_workers, len(members)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._extract_members, zippath, members[i::workers], extract_to)
+                for i in range(workers)
+            ]
+            for future in futures:
+                future.result()
         print(f"Extracted {zippath} to {extract_to}")
 
     def compress_file(self, filepath, zippath):
@@ -151,7 +408,9 @@ class ZipFileHandler:
             zippath (str): The path to the zip file to create.
         """
         with zipfile.ZipFile(zippath, "w", zipfile.ZIP_DEFLATED) as zip_ref:
-            zip_ref.write(filepath, os.path.basename(filepath))
+            zip_ref.write(
+                filepath, os.path.basename(filepath), compress_type=self._get_compress_type(filepath)
+            )
         print(f"Compressed {filepath} into {zippath}")
 
     def compress_directory(self, directory, zippath):
@@ -167,5 +426,19 @@ class ZipFileHandler:
                 for file in files:
                     filepath = os.path.join(root, file)
                     arcname = os.path.relpath(filepath, directory)
-                    zip_ref.write(filepath, arcname)
+                    zip_ref.write(
+                        filepath, arcname, compress_type=self._get_compress_type(filepath)
+                    )
         print(f"Compressed {directory} into {zippath}")
+
+    def _get_compress_type(self, filepath: str) -> int:
+        """Stores files that are already compressed and deflates the rest."""
+        if self._store_compressed and filepath.lower().endswith(COMPRESSED_EXTENSIONS):
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    @staticmethod
+    def _extract_members(zippath: str, members: list, extract_to: str) -> None:
+        with zipfile.ZipFile(zippath, "r") as zip_ref:
+            for member in members:
+                zip_ref.extract(member, extract_to)
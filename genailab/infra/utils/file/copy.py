@@ -11,19 +11,29 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday December 18th 2024 04:54:28 pm                                            #
-# Modified   : Sunday January 26th 2025 10:41:24 pm                                                #
+# Modified   : Monday October 19th 2026 06:52:26 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 import os
 import shutil
+import sys
+
+# Linux ioctl that clones a file's extents into another file on copy-on-write filesystems such as
+# Btrfs and XFS.
+FICLONE = 0x40049409
 
 
 # ------------------------------------------------------------------------------------------------ #
 class Copy:
     """
     A utility class for copying Parquet and CSV files or directories, with validation and optional overwrite functionality.
+
+    `snapshot` produces copies that share storage with the source: each file is cloned with a
+    reflink where the filesystem supports it, hard linked where source and target share a
+    filesystem, and copied otherwise. Snapshotted files must be treated as immutable, since a
+    hard linked file modified in place changes every link to it.
     """
 
     def __call__(self, source: str, target: str, overwrite: bool = False):
@@ -81,6 +91,67 @@ class Copy:
             msg = f"Unexpected error in Copy.file.\n{e}"
             raise Exception(msg)
 
+    def snapshot(self, source: str, target: str, overwrite: bool = False) -> None:
+        """
+        Snapshots a file or directory from the source to the target location without copying bytes
+        where the filesystem allows.
+
+        Args:
+            source (str): The path to the source file or directory.
+            target (str): The path to the target file or directory.
+            overwrite (bool, optional): Whether to overwrite the target if it already exists. Defaults to False.
+
+        Raises:
+            FileExistsError: If the target exists and `overwrite` is False.
+            ValueError: If the source is not a file or directory, or the source and target are incompatible.
+            Exception: If an unexpected error occurs during the snapshot operation.
+        """
+        if not os.path.exists(source):
+            raise ValueError(f"Path {source} is not a directory or file.")
+        self._validate(source=source, target=target, overwrite=overwrite)
+        try:
+            if os.path.isdir(target):
+                shutil.rmtree(target)
+            elif os.path.exists(target):
+                os.remove(target)
+            if os.path.isdir(source):
+                shutil.copytree(source, target, copy_function=self.link)
+            else:
+                self.link(source, target)
+        except Exception as e:
+            msg = f"Unexpected error in Copy.snapshot.\n{e}"
+            raise Exception(msg)
+
+    @staticmethod
+    def link(source: str, target: str) -> str:
+        """
+        Links a file to the target path with a reflink, a hard link, or a copy, whichever the
+        filesystem supports first. Has the signature of a `shutil.copytree` copy function.
+
+        Args:
+            source (str): The path to the source file.
+            target (str): The path to the target file, which must not exist.
+
+        Returns:
+            str: The target path.
+        """
+        if sys.platform.startswith("linux"):
+            import fcntl
+
+            try:
+                with open(source, "rb") as src, open(target, "xb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, target)
+                return target
+            except OSError:
+                if os.path.exists(target):
+                    os.remove(target)
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+        return target
+
     def _validate(self, source: str, target: str, overwrite: bool = False) -> None:
         """
         Validates the parameters for the copy operation.
@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Wednesday December 25th 2024 10:50:08 pm                                            #
-# Modified   : Sunday January 26th 2025 10:38:16 pm                                                #
+# Modified   : Monday October 19th 2026 06:53:53 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
@@ -21,10 +21,12 @@ from __future__ import annotations
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import pyarrow.parquet as pq
 from genailab.core.dstruct import DataClass
 from genailab.infra.utils.data.format import format_size
 from genailab.infra.utils.date_time.format import ThirdDateFormatter
@@ -42,6 +44,7 @@ logger = logging.getLogger(f"{__name__}")
 class FileFormat(Enum):
     CSV = ("csv", ".csv")
     PARQUET = ("parquet", ".parquet")
+    ARROW = ("arrow", ".arrow")
     PICKLE = ("pickle", ".pkl")
 
     @classmethod
@@ -71,7 +74,11 @@ class FileFormat(Enum):
 # ------------------------------------------------------------------------------------------------ #
 @dataclass(config=dict(arbitrary_types_allowed=True))
 class FileSet(DataClass):
-    """Encapsulates File level metadata."""
+    """Encapsulates File level metadata.
+
+    Row, row group and per-column compressed size statistics are gathered from Parquet footers
+    when the fileset is created, so they are available without reading the data.
+    """
 
     path: str
     name: str
@@ -82,6 +89,12 @@ class FileSet(DataClass):
     accessed: Optional[datetime] = None
     modified: Optional[datetime] = None
     size: Optional[int] = None
+    fingerprint: Optional[str] = None
+    footer_fingerprint: Optional[str] = None
+    partitions: Optional[Dict[str, str]] = None
+    num_rows: Optional[int] = None
+    num_row_groups: Optional[int] = None
+    column_sizes: Optional[Dict[str, int]] = None
 
 
 # ------------------------------------------------------------------------------------------------ #
@@ -102,16 +115,22 @@ class FileAttr:
 
         """
         try:
+            # A single walk yields both the file count and the total size.
+            files = FileAttr.list_files(filepath=filepath)
+            stats = {}
+            if file_format == FileFormat.PARQUET:
+                stats = FileAttr.get_parquet_stats(filepaths=[path for path, _ in files])
             return FileSet(
                 path=filepath,
                 name=os.path.basename(filepath),
                 format=file_format,
                 isdir=FileAttr.isdir(filepath=filepath),
-                file_count=FileAttr.get_count(filepath=filepath),
+                file_count=len(files),
                 created=FileAttr.file_created(filepath=filepath),
                 accessed=FileAttr.file_last_accessed(filepath=filepath),
                 modified=FileAttr.file_last_modified(filepath=filepath),
-                size=FileAttr.get_size(path=filepath, in_bytes=True),
+                size=sum(size for _, size in files),
+                **stats,
             )
         except FileNotFoundError as e:
             logger.warning(f"File not found at {filepath}.\n{e}")
@@ -129,6 +148,73 @@ class FileAttr:
                 format=file_format,
             )
 
+    # -------------------------------------------------------------------------------------------- #
+    @staticmethod
+    def list_files(filepath: str) -> List[Tuple[str, int]]:
+        """Lists the files at a path with their sizes, in path order.
+
+        Args:
+            filepath (str): The path to a file or directory.
+
+        Returns:
+            List[Tuple[str, int]]: The path and size in bytes of each file.
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+        """
+        if os.path.isfile(filepath):
+            return [(filepath, os.path.getsize(filepath))]
+        if not os.path.isdir(filepath):
+            raise FileNotFoundError(f"The path {filepath} does not exist.")
+        files = []
+        with os.scandir(filepath) as it:
+            for entry in sorted(it, key=lambda entry: entry.name):
+                if entry.is_file():
+                    files.append((entry.path, entry.stat().st_size))
+                elif entry.is_dir():
+                    files.extend(FileAttr.list_files(filepath=entry.path))
+        return files
+
+    # -------------------------------------------------------------------------------------------- #
+    @staticmethod
+    def get_parquet_stats(
+        filepaths: List[str], max_workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Aggregates row, row group and column size statistics from Parquet footers.
+
+        Footers are read in parallel, a few kilobytes per file. Hidden files and files prefixed
+        with an underscore, such as Spark's `_SUCCESS` markers and checksums, are skipped.
+
+        Args:
+            filepaths (List[str]): The paths of the files in a dataset.
+            max_workers (Optional[int]): Maximum number of threads reading footers. Defaults to
+                the number of CPUs.
+
+        Returns:
+            Dict[str, Any]: The total rows `num_rows`, total row groups `num_row_groups`, and
+                compressed bytes per column `column_sizes`.
+        """
+        filepaths = [
+            path for path in filepaths if not os.path.basename(path).startswith((".", "_"))
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+            footers = list(executor.map(pq.read_metadata, filepaths))
+
+        column_sizes: Dict[str, int] = {}
+        for footer in footers:
+            for i in range(footer.num_row_groups):
+                row_group = footer.row_group(i)
+                for j in range(row_group.num_columns):
+                    column = row_group.column(j)
+                    column_sizes[column.path_in_schema] = (
+                        column_sizes.get(column.path_in_schema, 0) + column.total_compressed_size
+                    )
+        return {
+            "num_rows": sum(footer.num_rows for footer in footers),
+            "num_row_groups": sum(footer.num_row_groups for footer in footers),
+            "column_sizes": column_sizes,
+        }
+
     # -------------------------------------------------------------------------------------------- #
     @staticmethod
     def get_file_size(filepath: str) -> int:
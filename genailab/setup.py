@@ -11,20 +11,26 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Saturday September 14th 2024 06:28:52 am                                            #
-# Modified   : Monday January 27th 2025 02:18:39 pm                                                #
+# Modified   : Monday October 19th 2026 06:44:33 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2024 John James                                                                 #
 # ================================================================================================ #
 import logging
+import os
+import shutil
 import sys
-from typing import Type
+from pathlib import Path
+from typing import Optional, Type
+
+import pandas as pd
 
 from dependency_injector.wiring import inject
 from genailab.asset.dataset.builder import DatasetBuilder
 from genailab.asset.dataset.config import DatasetConfig
 from genailab.container import GenAILabContainer
 from genailab.core.dtypes import DFType
+from genailab.core.schema import SchemaRegistry
 from genailab.infra.config.app import AppConfigReader
 from genailab.infra.utils.file.fileset import FileFormat
 
@@ -38,8 +44,19 @@ def load_data(
     container: GenAILabContainer,
     force: bool = False,
     config_reader_cls: Type[AppConfigReader] = AppConfigReader,
+    source_filepath: Optional[str] = None,
 ):
-    """Reads the data, creates a Dataset object, and loads it into the repository"""
+    """Reads the data, creates a Dataset object, and loads it into the repository
+
+    CSV sources are streamed to partitioned Parquet by the CSV ingestor and registered without
+    being materialized in memory. Parquet sources are read with Spark.
+
+    Args:
+        container (GenAILabContainer): The wired dependency container.
+        force (bool): Whether to replace an existing dataset.
+        config_reader_cls (Type[AppConfigReader]): The configuration reader class.
+        source_filepath (Optional[str]): Overrides the source filepath in the setup config.
+    """
 
     # Obtain repository, file access, and spark dependencies.
     repo = container.io.repo()
@@ -63,15 +80,40 @@ def load_data(
     if force and repo.exists(asset_id=asset_id):
         repo.remove(asset_id=asset_id)
 
-    if not repo.exists(asset_id=asset_id):
+    source_filepath = source_filepath or config["source_filepath"]
+    schema = SchemaRegistry().get(phase=dataset_config.phase, stage=dataset_config.stage)
+
+    if not repo.exists(asset_id=asset_id) and _is_csv(source_filepath, config):
+        # Stream the CSV file(s) to Parquet in a staging area within the repository, so the
+        # ingested dataset is moved, rather than copied, into place.
+        staging = Path(repo.location) / ".staging" / asset_id
+        shutil.rmtree(staging, ignore_errors=True)
+        try:
+            container.io.ingestor().ingest(
+                source=source_filepath, destination=str(staging), schema=schema
+            )
+            # Construct a Dataset object whose data lives in the ingested Parquet files
+            dataset = (
+                DatasetBuilder()
+                .from_config(config=dataset_config)
+                .dataframe(pd.DataFrame())
+                .creator("AppVoCAI")
+                .build()
+            )
+            # Move the Parquet files into the repository and register the dataset
+            dataset = repo.add_file(dataset=dataset, filepath=str(staging), entity="GenAILabSetup")
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    elif not repo.exists(asset_id=asset_id):
         # Obtain a spark session which will be used to read the source data
         spark = spark_session_pool.spark
-        # Load the PySpark DataFrame
+        # Load the PySpark DataFrame with the declared schema of the dataset
         dataframe = fao.read(
-            filepath=config["source_filepath"],
+            filepath=source_filepath,
             dftype=DFType.SPARK,
             file_format=FileFormat.PARQUET,
             spark=spark,
+            schema=schema,
         )
         # Construct a Dataset object
         dataset = (
@@ -91,6 +133,16 @@ def load_data(
     )
 
 
+# ------------------------------------------------------------------------------------------------ #
+def _is_csv(source_filepath: str, config: dict) -> bool:
+    """Returns True if the source is a CSV file or a directory of CSV files."""
+    if config.get("source_format") == "csv":
+        return True
+    if os.path.isdir(source_filepath):
+        return any(name.endswith(".csv") for name in os.listdir(source_filepath))
+    return source_filepath.endswith(".csv")
+
+
 # ------------------------------------------------------------------------------------------------ #
 def wire_container():
     container = GenAILabContainer()
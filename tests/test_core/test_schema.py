@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_core/test_schema.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:40:57 pm                                                #
+# Modified   : Monday October 19th 2026 06:40:57 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pyspark.sql.types import ShortType, StringType, TimestampType
+
+from genailab.core.flow import PhaseDef, StageDef
+from genailab.core.schema import REVIEW_SCHEMA, Schema, SchemaRegistry
+from genailab.infra.persist.repo.file.pandas import PandasDataFrameCSVReader
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+@pytest.mark.schema
+class TestSchema:  # pragma: no cover
+    # ============================================================================================ #
+    def test_schema(self, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        registry = SchemaRegistry()
+        schema = registry.get(phase=PhaseDef.DATAPREP, stage=StageDef.RAW)
+        assert schema == REVIEW_SCHEMA
+        assert registry.get(phase=PhaseDef.ABSA, stage=StageDef.ABSA_FT) is None
+
+        # Pandas, Spark and Arrow types are derived from the same declaration.
+        fields = {field.name: field.dataType for field in schema.struct_type.fields}
+        assert schema.dtypes["rating"] == "int16" and fields["rating"] == ShortType()
+        assert schema.dtypes["category"] == "category" and fields["category"] == StringType()
+        assert fields["date"] == TimestampType()
+        assert schema.arrow_schema.field("date").type == pa.timestamp("ms")
+        assert schema.names == [field.name for field in schema.arrow_schema]
+
+        selected = schema.select(columns=["content", "extra"], default="string")
+        assert selected == Schema(dtypes={"content": "string", "extra": "string"})
+
+        # CSV files are parsed directly into the declared types.
+        filepath = tmp_path / "reviews.csv"
+        pd.DataFrame(
+            {"id": ["1", "2"], "rating": [4, 5], "category": ["Book", "Finance"],
+             "date": ["2020-01-01 10:00:00", "2020-01-02 11:00:00"], "extra": [1.5, 2.5]}
+        ).to_csv(filepath, index=False)
+        df = PandasDataFrameCSVReader(kwargs={"encoding": "utf-8"}).read(
+            filepath=str(filepath), schema=schema
+        )
+        assert str(df["id"].dtype) == "string"
+        assert str(df["rating"].dtype) == "int16"
+        assert str(df["category"].dtype) == "category"
+        assert str(df["date"].dtype) == "datetime64[ms]"
+        assert str(df["extra"].dtype) == "float64"
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
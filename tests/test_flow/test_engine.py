@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_engine.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:24:52 pm                                                #
+# Modified   : Monday October 19th 2026 07:49:06 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+from datetime import datetime
+
+import pytest
+
+from genailab.core.dtypes import DFType
+from genailab.flow.base.engine import EngineSelector
+from genailab.flow.base.governor import MemoryGovernor
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def source(review_repo):
+    repo = review_repo("engine")
+    return repo.get_meta(asset_id="dataprep_raw_dataset_review").file
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.engine
+class TestEngineSelector:  # pragma: no cover
+    # ============================================================================================ #
+    def test_select(self, source, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        assert source.num_rows == 3000
+        engines = (DFType.PANDAS, DFType.DASK, DFType.SPARK)
+
+        # Fits the budget
+        selector = EngineSelector(governor=MemoryGovernor(fao=fao, memory_limit="1GB"))
+        assert selector.select(engines=engines, file=source) == DFType.PANDAS
+
+        # Exceeds the budget but not the local limit
+        selector = EngineSelector(governor=MemoryGovernor(fao=fao, memory_limit=1000), local_limit="1GB")
+        assert selector.select(engines=engines, file=source) == DFType.DASK
+        assert "dask" in caplog.text
+        # Falls back to the heaviest supported engine, or moves up to the next one
+        assert selector.select(engines=(DFType.PANDAS,), file=source) == DFType.PANDAS
+        assert selector.select(engines=(DFType.PANDAS, DFType.SPARK), file=source) == DFType.SPARK
+
+        # Exceeds the local limit
+        selector = EngineSelector(governor=MemoryGovernor(fao=fao, memory_limit=1000), local_limit=1000)
+        assert selector.select(engines=engines, file=source) == DFType.SPARK
+        assert selector.select(engines=(DFType.PANDAS, DFType.DASK), file=source) == DFType.DASK
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_default(self, source, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        governor = MemoryGovernor(fao=fao, memory_limit=1000)
+        engines = (DFType.PANDAS, DFType.DASK)
+
+        selector = EngineSelector(governor=governor, enabled=False, local_limit=1000)
+        assert selector.select(engines=engines, file=source) == DFType.PANDAS
+        assert selector.select(engines=engines, file=source, default=DFType.DASK) == DFType.DASK
+
+        selector = EngineSelector(governor=governor)
+        assert selector.select(engines=engines, file=None) == DFType.PANDAS
+        with pytest.raises(ValueError):
+            selector.select(engines=(), file=source)
+
+        # The estimate is close to the measured size of the dataframe.
+        estimate = governor.estimate_size(filepath=source.path, num_rows=source.num_rows)
+        actual = fao.read(filepath=source.path, dftype=DFType.PANDAS).memory_usage(deep=True, index=False).sum()
+        assert 0.5 * actual < estimate < 2 * actual
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_incremental.py                                                #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:49:19 pm                                                #
+# Modified   : Monday October 19th 2026 08:36:55 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.core.dtypes import DFType
+from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.stage import Stage
+from genailab.flow.base.task import Task
+from genailab.infra.persist.repo.cache import StageCache
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class IncrementalStage(Stage):
+    phase = PhaseDef.DATAPREP
+    stage = StageDef.DQA
+    dftype = DFType.PANDAS
+
+
+class StrippedStage(IncrementalStage):
+    """Strips the review text before the tasks run."""
+
+    @staticmethod
+    def _prepare(dataframe: pd.DataFrame) -> pd.DataFrame:
+        dataframe["content"] = dataframe["content"].str.strip()
+        return dataframe
+
+
+class LengthAboveTask(Task):
+    """Flags reviews longer than a threshold, counting the rows it runs on."""
+
+    def __init__(self, new_column: str, threshold: int) -> None:
+        super().__init__()
+        self.column = "content"
+        self.new_column = new_column
+        self.rows = 0
+        self.config = {
+            "module": __name__,
+            "class_name": self.name,
+            "params": {"new_column": new_column, "threshold": threshold},
+        }
+        self._threshold = threshold
+
+    @property
+    def additive(self) -> bool:
+        return True
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        self.rows += len(data)
+        data[self.new_column] = data[self.column].str.len() > self._threshold
+        return data
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def setup(fao, review_repo, review_config, tmp_path):
+    def create(name: str, repo=None, cache=None, long: int = 7, stage=IncrementalStage):
+        repo = repo or review_repo(name)
+        tasks = [
+            LengthAboveTask(new_column="dqa_short", threshold=4),
+            LengthAboveTask(new_column="dqa_long", threshold=long),
+        ]
+        stage = stage(
+            source_config=review_config("raw"),
+            target_config=review_config("dqa"),
+            tasks=tasks,
+            repo=repo,
+            dataset_builder=DatasetBuilder(repo=repo, fao=fao),
+            cache=cache or StageCache(location=os.path.join(tmp_path, name, "cache"), fao=fao, budget=1073741824),
+        )
+        return repo, stage, tasks
+
+    return create
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.stage
+class TestIncrementalRun:  # pragma: no cover
+    # ============================================================================================ #
+    def test_splice(self, setup, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stage, _ = setup("incremental")
+        dataset = stage.run()
+        before = repo.get(asset_id=dataset.asset_id).dataframe
+
+        # Changing one task's configuration re-runs only that task on the cached result.
+        _, stage, tasks = setup("incremental", repo=repo, cache=stage._cache, long=3)
+        assert stage._incremental_run_possible()
+        dataset = stage.run()
+        assert tasks[0].rows == 0
+        assert tasks[1].rows == 3000
+        actual = repo.get(asset_id=dataset.asset_id).dataframe
+
+        # The spliced result equals a full run, including the column order and untouched columns.
+        repo, stage, _ = setup("full", long=3)
+        expected = repo.get(asset_id=stage.run().asset_id).dataframe
+        pd.testing.assert_frame_equal(actual, expected)
+        assert list(actual.columns) == list(before.columns)
+        pd.testing.assert_series_equal(actual["dqa_short"], before["dqa_short"])
+        assert not actual["dqa_long"].equals(before["dqa_long"])
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_prepare(self, setup, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stage, _ = setup("prepared", long=3, stage=StrippedStage)
+        stage.run()
+
+        # The changed task runs on the prepared source, where "bad app\n" is stripped to 7 characters.
+        _, stage, tasks = setup("prepared", repo=repo, cache=stage._cache, stage=StrippedStage)
+        assert stage._incremental_run_possible()
+        actual = repo.get(asset_id=stage.run().asset_id).dataframe
+        assert tasks[1].rows == 3000
+
+        repo, stage, _ = setup("prepared_full", stage=StrippedStage)
+        expected = repo.get(asset_id=stage.run().asset_id).dataframe
+        pd.testing.assert_frame_equal(actual, expected)
+        assert not actual.loc[actual["content"] == "bad app", "dqa_long"].any()
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.stage
+class TestStageCacheRestore:  # pragma: no cover
+    # ============================================================================================ #
+    def test_restore(self, setup, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stage, _ = setup("restore")
+        expected = repo.get(asset_id=stage.run().asset_id).dataframe
+        cache = stage._cache
+        _, stage, _ = setup("restore", repo=repo, cache=cache, long=3)
+        stage.run(force=True)
+
+        # Reverting the configuration restores the first result from the cache without running.
+        _, stage, tasks = setup("restore", repo=repo, cache=cache)
+        assert stage._stage_cache_hit()
+        dataset = stage.run()
+        assert sum(task.rows for task in tasks) == 0
+        pd.testing.assert_frame_equal(repo.get(asset_id=dataset.asset_id).dataframe, expected)
+        assert stage.fresh()
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.stage
+class TestStageCacheKey:  # pragma: no cover
+    # ============================================================================================ #
+    def test_content_addressed(self, setup, fao, review_repo, review_config, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        n = 3000
+        flags = np.random.default_rng(0).random(n) < 0.5
+        # Swapping two flags within a partition leaves its footer statistics unchanged.
+        swapped = flags.copy()
+        i = next(k for k in range(3, n, 3) if flags[k] != flags[0])
+        swapped[[0, i]] = swapped[[i, 0]]
+
+        def seed(name: str, flags: np.ndarray):
+            repo = review_repo(name)
+            raw = repo.get_asset_id(phase=PhaseDef.DATAPREP, stage=StageDef.RAW, name="review")
+            df = repo.get(asset_id=raw).dataframe.sort_values("id", key=lambda ids: ids.astype(int))
+            repo.remove(asset_id=raw)
+            df = df.reset_index(drop=True).assign(flag=flags)
+            raw = DatasetBuilder(repo=repo, fao=fao).from_config(review_config("raw")).dataframe(df).creator("Test").build()
+            return repo, repo.add(dataset=raw, entity="Test")
+
+        repo, first = seed("first", flags)
+        _, stage, _ = setup("first", repo=repo)
+        stage.run()
+        cache = stage._cache
+
+        # The second source differs only in its values, so it misses the first source's entry.
+        repo, second = seed("second", swapped)
+        assert second.file.footer_fingerprint == first.file.footer_fingerprint
+        _, stage, tasks = setup("second", repo=repo, cache=cache)
+        assert not stage._stage_cache_hit()
+        dataset = stage.run()
+        assert all(task.rows == n for task in tasks)
+        result = repo.get(asset_id=dataset.asset_id).dataframe.set_index("id")
+        assert result.loc["0", "flag"] == swapped[0]
+        assert result.loc[str(i), "flag"] == swapped[i]
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
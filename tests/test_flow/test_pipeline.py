@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_pipeline.py                                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:02:38 pm                                                #
+# Modified   : Monday October 19th 2026 07:49:06 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.core.dtypes import DFType
+from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.pipeline import FusedPipeline
+from genailab.flow.base.stage import Stage
+from genailab.flow.dataprep.preprocess.task import RemoveNewlinesTask, VerifyEncodingTask
+from genailab.infra.persist.repo.dataset import DatasetRepo
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class FirstStage(Stage):
+    phase = PhaseDef.DATAPREP
+    stage = StageDef.PREPROCESS
+    dftype = DFType.PANDAS
+
+
+class SecondStage(Stage):
+    phase = PhaseDef.DATAPREP
+    stage = StageDef.DQA
+    dftype = DFType.PANDAS
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def setup(fao, review_repo, review_config):
+    def create(name: str, write_behind: bool = False):
+        repo = review_repo(name, rows=1000, categories=2, write_behind=write_behind)
+        stages = [
+            FirstStage(
+                source_config=review_config("raw"),
+                target_config=review_config("preprocess"),
+                tasks=[VerifyEncodingTask(column="content")],
+                repo=repo,
+                dataset_builder=DatasetBuilder(repo=repo, fao=fao),
+            ),
+            SecondStage(
+                source_config=review_config("preprocess"),
+                target_config=review_config("dqa"),
+                tasks=[RemoveNewlinesTask(column="content")],
+                repo=repo,
+                dataset_builder=DatasetBuilder(repo=repo, fao=fao),
+            ),
+        ]
+        return repo, stages
+
+    return create
+
+
+def records(repo: DatasetRepo) -> list:
+    registry = repo.registry.sort_values("asset_id")
+    return [
+        (row.asset_id, repo.get_meta(asset_id=row.asset_id).consumed is not None)
+        for row in registry.itertuples()
+    ]
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.pipeline
+class TestFusedPipeline:  # pragma: no cover
+    # ============================================================================================ #
+    def test_fused(self, setup, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stages = setup("staged")
+        for stage in stages:
+            expected = stage.run(force=True)
+        expected_df = repo.get(asset_id=expected.asset_id).dataframe
+        expected_records = records(repo)
+
+        # Fused runs leave the same registry and consumption records as staged runs.
+        for persist in ("async", "sync"):
+            repo, stages = setup(persist)
+            dataset = FusedPipeline(stages=stages, persist=persist).run()
+            assert records(repo) == expected_records
+            pd.testing.assert_frame_equal(repo.get(asset_id=dataset.asset_id).dataframe, expected_df)
+            assert not repo.get(asset_id=dataset.asset_id).dataframe["content"].str.contains("\n").any()
+
+        # Staged and fused runs writing behind leave the same records once joined.
+        repo, stages = setup("write_behind", write_behind=True)
+        for stage in stages:
+            dataset = stage.run(force=True)
+        repo.join()
+        assert records(repo) == expected_records
+        pd.testing.assert_frame_equal(repo.get(asset_id=dataset.asset_id).dataframe, expected_df)
+
+        repo, stages = setup("fused_write_behind", write_behind=True)
+        dataset = FusedPipeline(stages=stages, persist="async").run()
+        assert records(repo) == expected_records
+
+        # Skipping persistence publishes only the final dataset.
+        repo, stages = setup("skip")
+        dataset = FusedPipeline(stages=stages, persist="skip").run()
+        assert sorted(repo.registry["asset_id"]) == ["dataprep_dqa_dataset_review", "dataprep_raw_dataset_review"]
+        pd.testing.assert_frame_equal(repo.get(asset_id=dataset.asset_id).dataframe, expected_df)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
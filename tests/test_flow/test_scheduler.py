@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_scheduler.py                                                  #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:57:46 pm                                                #
+# Modified   : Monday October 19th 2026 06:57:46 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.task import Task
+from genailab.flow.dataprep.preprocess.task import RemoveNewlinesTask, VerifyEncodingTask
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class DetectTask(Task):
+    """Flags rows whose column contains a term."""
+
+    def __init__(self, column: str, new_column: str, term: str) -> None:
+        super().__init__()
+        self._column = column
+        self._new_column = new_column
+        self._term = term
+
+    @property
+    def column(self) -> str:
+        return self._column
+
+    @property
+    def new_column(self) -> str:
+        return self._new_column
+
+    @property
+    def additive(self) -> bool:
+        return True
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        data[self._new_column] = data[self._column].str.contains(self._term)
+        return data
+
+
+class RepairTask(Task):
+    """Drops flagged rows."""
+
+    def __init__(self, column: str) -> None:
+        super().__init__()
+        self._column = column
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.loc[~data[self._column]]
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def tasks() -> list:
+    return [
+        VerifyEncodingTask(column="content"),
+        DetectTask(column="app_name", new_column="dqa_app", term="Bank"),
+        RemoveNewlinesTask(column="content"),
+        DetectTask(column="content", new_column="dqa_spam", term="spam"),
+        DetectTask(column="content", new_column="dqa_ad", term="free"),
+        RepairTask(column="dqa_spam"),
+        DetectTask(column="content", new_column="dqa_ok", term="ok"),
+        DetectTask(column="app_name", new_column="dqa_app2", term="Book"),
+    ]
+
+
+@pytest.fixture
+def dataframe() -> pd.DataFrame:
+    content = ["ok\nfine", "spam here", "free app", "ok spam", "great\nok"] * 200
+    app_name = ["Bank", "Book", "Game", "Bank", "Book"] * 200
+    return pd.DataFrame({"id": range(1000), "app_name": app_name, "content": content})
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.scheduler
+class TestTaskScheduler:  # pragma: no cover
+    # ============================================================================================ #
+    def test_plan(self, tasks, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        segments = TaskScheduler(max_workers=4).plan(tasks=tasks)
+        names = [[[task.name for task in level] for level in segment] for segment in segments]
+        # Tasks rewriting content stay ordered, detectors reading it wait for the rewrite,
+        # and the repair task is a barrier.
+        assert names == [
+            [
+                ["VerifyEncodingTask", "DetectTask"],
+                ["RemoveNewlinesTask"],
+                ["DetectTask", "DetectTask"],
+            ],
+            [["RepairTask"]],
+            [["DetectTask", "DetectTask"]],
+        ]
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def test_run(self, tasks, dataframe, executor, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        expected = TaskScheduler(max_workers=1).run(tasks=tasks, dataframe=dataframe.copy())
+        result = TaskScheduler(max_workers=4, executor=executor).run(
+            tasks=tasks, dataframe=dataframe.copy()
+        )
+        pd.testing.assert_frame_equal(result, expected)
+        assert len(result) == 600
+        assert not result["content"].str.contains("\n").any()
+
+        # A failing task surfaces as a RuntimeError naming the task.
+        with pytest.raises(RuntimeError, match="DetectTask"):
+            TaskScheduler(max_workers=4, executor=executor).run(
+                tasks=[tasks[1], DetectTask(column="missing", new_column="x", term="y")],
+                dataframe=dataframe.copy(),
+            )
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_shard.py                                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:12:09 pm                                                #
+# Modified   : Monday October 19th 2026 07:49:06 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.core.dtypes import DFType
+from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.shard import ShardExecutor
+from genailab.flow.base.stage import Stage
+from genailab.flow.base.task import Task
+from genailab.flow.dataprep.preprocess.task import RemoveNewlinesTask, VerifyEncodingTask
+from genailab.infra.persist.repo.dataset import DatasetRepo
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+
+# ------------------------------------------------------------------------------------------------ #
+class ShardedStage(Stage):
+    phase = PhaseDef.DATAPREP
+    stage = StageDef.PREPROCESS
+    dftype = DFType.PANDAS
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def setup(fao, review_repo, review_config):
+    def create(name: str, sharder=None, tasks=None):
+        repo = review_repo(name, rows=900)
+        stage = ShardedStage(
+            source_config=review_config("raw"),
+            target_config=review_config("preprocess"),
+            tasks=tasks or [VerifyEncodingTask(column="content"), RemoveNewlinesTask(column="content")],
+            repo=repo,
+            dataset_builder=DatasetBuilder(repo=repo, fao=fao),
+            sharder=sharder,
+        )
+        return repo, stage
+
+    return create
+
+
+def read(repo: DatasetRepo, asset_id: str) -> pd.DataFrame:
+    df = repo.get(asset_id=asset_id).dataframe
+    return df.sort_values("id").reset_index(drop=True)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.shard
+class TestShardExecutor:  # pragma: no cover
+    # ============================================================================================ #
+    def test_sharded_run(self, setup, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stage = setup("full")
+        expected = read(repo, stage.run(force=True).asset_id)
+
+        for max_workers in (1, 2):
+            sharder = ShardExecutor(fao=fao, enabled=True, max_workers=max_workers)
+            repo, stage = setup(f"sharded_{max_workers}", sharder=sharder)
+            source = repo.get_meta(asset_id="dataprep_raw_dataset_review")
+            assert sorted(sharder.shards(filepath=source.file.path)) == ["Book", "Finance", "Health & Fitness"]
+
+            dataset = stage.run(force=True)
+            # The target is registered without being loaded.
+            assert dataset.dataframe.empty
+            assert repo.exists(asset_id=dataset.asset_id)
+            assert repo.get_meta(asset_id=source.asset_id).consumed
+            pd.testing.assert_frame_equal(read(repo, dataset.asset_id), expected, check_like=True)
+            assert not os.listdir(os.path.join(repo.location, ".staging"))
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_unshardable(self, setup, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        # Tasks that may depend on other rows run on the full dataframe.
+        sharder = ShardExecutor(fao=fao, enabled=True, max_workers=1)
+        repo, stage = setup("unshardable", sharder=sharder, tasks=[DropDuplicateContentTask()])
+        dataset = stage.run(force=True)
+        assert len(dataset.dataframe) == 3
+
+        # Declaring columns doesn't make a task shardable: duplicates spanning shards are found.
+        task = FlagDuplicateKeyTask()
+        assert task.outputs == ["dqa_duplicate_key"] and not task.shardable
+        repo, stage = setup("duplicates", sharder=sharder, tasks=[task])
+        dataset = stage.run(force=True)
+        assert dataset.dataframe["dqa_duplicate_key"].all()
+
+        # Shard failures are raised with the failing shard.
+        repo, stage = setup("failing", sharder=sharder, tasks=[FailingTask()])
+        with pytest.raises(RuntimeError, match="category=Book"):
+            stage.run(force=True)
+        assert not repo.exists(asset_id="dataprep_preprocess_dataset_review")
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_uniqueness_unshardable(self, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pytest.importorskip("fasttext")
+        from genailab.flow.dataprep.quality.unique import DetectOrRepairUniquenessTask
+        from genailab.flow.dataprep.quality.privacy import DetectOrRepairURLTask
+
+        task = DetectOrRepairUniquenessTask(column=["id"], new_column="dqa_duplicate_id")
+        assert task.additive and not task.row_local and not task.shardable
+        assert DetectOrRepairURLTask(column="content", new_column="dqa_url").shardable
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+class DropDuplicateContentTask(Task):
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.drop_duplicates(subset="content")
+
+
+class FailingTask(Task):
+    row_local = True
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        if (data["category"] == "Book").any():
+            raise ValueError("Book")
+        return data
+
+
+class FlagDuplicateKeyTask(Task):
+    """Flags rows sharing a key with another row. Rows with the same key are in different categories."""
+
+    column = "id"
+    new_column = "dqa_duplicate_key"
+
+    @property
+    def additive(self) -> bool:
+        return True
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        data[self.new_column] = (data["id"].astype(int) % 301).duplicated(keep=False)
+        return data
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_flow/test_stream.py                                                     #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:18:36 pm                                                #
+# Modified   : Monday October 19th 2026 07:59:17 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.core.dtypes import DFType
+from genailab.core.flow import PhaseDef, StageDef
+from genailab.flow.base.stream import StreamDriver
+from genailab.flow.base.stage import Stage
+from genailab.flow.base.task import Task
+from genailab.flow.dataprep.preprocess.task import RemoveNewlinesTask, VerifyEncodingTask
+from genailab.infra.persist.repo.file.layout import ParquetLayout
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class StreamedStage(Stage):
+    phase = PhaseDef.DATAPREP
+    stage = StageDef.PREPROCESS
+    dftype = DFType.PANDAS
+
+
+class BatchCountingTask(Task):
+    """Records the number of rows of each batch it runs on."""
+
+    def __init__(self, fail: bool = False) -> None:
+        super().__init__()
+        self.batches = []
+        self._fail = fail
+
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        return self.run_batch(data)
+
+    def run_batch(self, batch: pd.DataFrame) -> pd.DataFrame:
+        if self._fail and len(self.batches) == 2:
+            raise ValueError("Third batch")
+        self.batches.append(len(batch))
+        batch["length"] = batch["content"].str.len()
+        return batch
+
+
+class DropDuplicateContentTask(Task):
+    def run(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data.drop_duplicates(subset="content")
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def setup(fao, review_repo, review_config):
+    def create(name: str, streamer=None, fail: bool = False):
+        repo = review_repo(name)
+        counter = BatchCountingTask(fail=fail)
+        stage = StreamedStage(
+            source_config=review_config("raw"),
+            target_config=review_config("preprocess"),
+            tasks=[VerifyEncodingTask(column="content"), RemoveNewlinesTask(column="content"), counter],
+            repo=repo,
+            dataset_builder=DatasetBuilder(repo=repo, fao=fao),
+            streamer=streamer,
+        )
+        return repo, stage, counter
+
+    return create
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.stream
+class TestStreamDriver:  # pragma: no cover
+    # ============================================================================================ #
+    def test_streamed_run(self, setup, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo, stage, counter = setup("full")
+        dataset = stage.run(force=True)
+        assert counter.batches == [3000]
+        expected = repo.get(asset_id=dataset.asset_id).dataframe
+
+        streamer = StreamDriver(fao=fao, enabled=True, batch_size=200, prefetch=1)
+        repo, stage, counter = setup("streamed", streamer=streamer)
+        assert all(task.streamable and task.shardable for task in stage._tasks)
+        dataset = stage.run(force=True)
+        assert len(counter.batches) > 3
+        assert max(counter.batches) <= 200
+        assert sum(counter.batches) == 3000
+        assert dataset.dataframe.empty
+        assert repo.get_meta(asset_id="dataprep_raw_dataset_review").consumed
+        pd.testing.assert_frame_equal(repo.get(asset_id=dataset.asset_id).dataframe, expected)
+        # The spilled batches are compacted into one file per partition.
+        path = repo.get_meta(asset_id=dataset.asset_id).file.path
+        partitions = [files for _, _, files in os.walk(path) if files]
+        assert len(partitions) == 3
+        assert all(files == ["part-00000.parquet"] for files in partitions)
+
+        # Partitions larger than a file are split in order into files of the layout's size.
+        layout = ParquetLayout(target_file_size=8 * 1024, target_row_group_size=2 * 1024, sort_by=["id"])
+        streamer = StreamDriver(fao=fao, enabled=True, batch_size=200, prefetch=1, layout=layout)
+        repo, stage, _ = setup("compacted", streamer=streamer)
+        dataset = stage.run(force=True)
+        path = repo.get_meta(asset_id=dataset.asset_id).file.path
+        for root, _, files in os.walk(path):
+            if files:
+                assert len(files) > 1
+                for file in files:
+                    metadata = pq.read_metadata(os.path.join(root, file))
+                    assert metadata.num_row_groups > 1
+                    ids = pq.read_table(os.path.join(root, file)).column("id").to_pylist()
+                    assert ids == sorted(ids)
+        result = repo.get(asset_id=dataset.asset_id).dataframe
+        assert sorted(result["id"]) == sorted(expected["id"])
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_streamed_failure(self, setup, fao, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        streamer = StreamDriver(fao=fao, enabled=True, batch_size=200)
+        repo, stage, _ = setup("failing", streamer=streamer, fail=True)
+        with pytest.raises(RuntimeError, match="batch 2"):
+            stage.run(force=True)
+        assert not repo.exists(asset_id="dataprep_preprocess_dataset_review")
+        assert not os.listdir(os.path.join(repo.location, ".staging"))
+
+        # Tasks without run_batch are not streamed.
+        assert not streamer.supports(tasks=[DropDuplicateContentTask()])
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
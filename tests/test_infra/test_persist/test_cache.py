@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_persist/test_cache.py                                        #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:26:22 pm                                                #
+# Modified   : Monday October 19th 2026 06:28:43 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from genailab.core.dtypes import DFType
+from genailab.infra.persist.repo.cache import StageCache
+from genailab.infra.utils.file.fileset import FileFormat
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.cache
+class TestStageCache:  # pragma: no cover
+    # ============================================================================================ #
+    def test_cache(self, fao, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        df = pd.DataFrame(
+            {"id": [str(i) for i in range(100)], "category": ["Book", "Finance"] * 50}
+        )
+        filepath = os.path.join(tmp_path, "result.arrow")
+        fao.create(filepath=filepath, file_format=FileFormat.ARROW, dataframe=df)
+
+        tasks = [{"module": "m", "class_name": "A", "params": {"threshold": 0.35}}]
+        key = StageCache.get_key(source_fingerprint="abc", task_configs=tasks, code_version="1")
+        assert key == StageCache.get_key(source_fingerprint="abc", task_configs=tasks, code_version="1")
+        tasks[0]["params"]["threshold"] = 0.4
+        other = StageCache.get_key(source_fingerprint="abc", task_configs=tasks, code_version="1")
+        assert key != other
+
+        # Budget fits a single entry, so adding a second evicts the least recently used.
+        cache = StageCache(location=os.path.join(tmp_path, "cache"), fao=fao, budget=1)
+        assert cache.get_entry(key=key) is None
+        cache.put(
+            key=key,
+            filepath=filepath,
+            file_format=FileFormat.ARROW,
+            fingerprint="f",
+            metadata={"source_fingerprint": "abc", "code_version": "1"},
+        )
+        assert cache.get_entry(key=key)["fingerprint"] == "f"
+        assert cache.find(source_fingerprint="abc", code_version="1")["key"] == key
+        assert cache.find(source_fingerprint="abc", code_version="2") is None
+        result = cache.read(key=key, dftype=DFType.PANDAS)
+        assert len(result) == len(df)
+
+        cache.put(key=other, filepath=filepath, file_format=FileFormat.ARROW)
+        assert not cache.exists(key=key)
+        assert cache.exists(key=other)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
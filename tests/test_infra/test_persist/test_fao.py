@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_persist/test_fao.py                                          #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:20:12 pm                                                #
+# Modified   : Monday October 19th 2026 07:22:16 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import pytest
+
+from genailab.core.dtypes import DFType
+from genailab.core.schema import REVIEW_SCHEMA
+from genailab.infra.persist.repo.file.encoding import ParquetEncoding
+from genailab.infra.persist.repo.file.ingest import CSVIngestor
+from genailab.infra.persist.repo.file.layout import ParquetLayout
+from genailab.infra.persist.repo.file.pandas import (
+    PandasDataFrameParquetReader,
+    PandasDataFrameParquetWriter,
+)
+from genailab.infra.utils.data.hash import HashService
+from genailab.infra.utils.file.fileset import FileFormat
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture(scope="module")
+def reviews() -> pd.DataFrame:
+    n = 1000
+    return pd.DataFrame(
+        {
+            "id": [str(i) for i in range(n)],
+            "app_id": [str(i % 17) for i in range(n)],
+            "app_name": [f"App {i % 17}" for i in range(n)],
+            "category_id": [str(i % 3) for i in range(n)],
+            "category": [["Book", "Business", "Finance"][i % 3] for i in range(n)],
+            "author": [f"author_{i}" for i in range(n)],
+            "rating": [i % 5 + 1 for i in range(n)],
+            "content": [f"Review number {i} of this app." for i in range(n)],
+            "vote_count": [i % 7 for i in range(n)],
+            "vote_sum": [i % 11 for i in range(n)],
+            "date": pd.date_range("2020-01-01", periods=n, freq="h"),
+        }
+    ).astype(
+        {
+            "id": "string",
+            "app_id": "string",
+            "app_name": "string",
+            "category_id": "category",
+            "category": "category",
+            "author": "string",
+            "rating": "int16",
+            "content": "string",
+            "vote_count": "int64",
+            "vote_sum": "int64",
+        }
+    )
+
+
+@pytest.mark.fao
+class TestFAO:  # pragma: no cover
+    # ============================================================================================ #
+    def test_arrow(self, fao, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        filepath = os.path.join(tmp_path, "reviews.arrow")
+        fao.create(filepath=filepath, file_format=FileFormat.ARROW, dataframe=reviews)
+        assert os.path.isfile(filepath)
+
+        df = fao.read(filepath=filepath, dftype=DFType.PANDAS, file_format=FileFormat.ARROW)
+        assert isinstance(df, pd.DataFrame)
+        pd.testing.assert_frame_equal(df, reviews, check_like=True)
+
+        with pytest.raises(FileExistsError):
+            fao.create(filepath=filepath, file_format=FileFormat.ARROW, dataframe=reviews)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_fingerprint(self, fao, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        hash_service = HashService(chunk_size=100, max_workers=4)
+        assert hash_service.hash_dataframe(reviews) == hash_service.hash_dataframe(reviews.copy())
+
+        changed = reviews.copy()
+        changed.loc[999, "content"] = "Changed."
+        assert hash_service.hash_dataframe(reviews) != hash_service.hash_dataframe(changed)
+
+        filepath_1 = os.path.join(tmp_path, "reviews_1.parquet")
+        filepath_2 = os.path.join(tmp_path, "reviews_2.parquet")
+        fao.create(filepath=filepath_1, file_format=FileFormat.PARQUET, dataframe=reviews)
+        fao.create(filepath=filepath_2, file_format=FileFormat.PARQUET, dataframe=reviews)
+        assert hash_service.hash_file(filepath_1) == hash_service.hash_file(filepath_2)
+        assert hash_service.hash_footer(filepath_1) == hash_service.hash_footer(filepath_2)
+
+        fao.create(filepath=filepath_2, file_format=FileFormat.PARQUET, dataframe=changed, overwrite=True)
+        assert hash_service.hash_file(filepath_1) != hash_service.hash_file(filepath_2)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_parquet_layout(self, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        size = reviews.memory_usage(deep=True).sum()
+        layout = ParquetLayout(
+            target_file_size=size // 4, target_row_group_size=size // 20, sort_by=["app_id"]
+        )
+        writer = PandasDataFrameParquetWriter(
+            kwargs={"engine": "pyarrow", "index": False, "partition_cols": ["category"]},
+            layout=layout,
+        )
+        filepath = os.path.join(tmp_path, "reviews.parquet")
+        writer.write(dataframe=reviews, filepath=filepath)
+
+        dataset = ds.dataset(filepath, format="parquet", partitioning="hive")
+        fragments = list(dataset.get_fragments())
+        # Each category holds about a third of the rows, so it is split over two files.
+        assert len(fragments) > 3
+        assert sum(fragment.count_rows() for fragment in fragments) == len(reviews)
+
+        # Rows are sorted by app_id within each file, so a filter prunes most row groups.
+        row_groups = [rg for fragment in fragments for rg in fragment.split_by_row_group()]
+        selected = [
+            rg
+            for fragment in fragments
+            for rg in fragment.split_by_row_group(filter=ds.field("app_id") == "3")
+        ]
+        assert len(selected) < len(row_groups) / 2
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_parquet_encoding(self, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        rng = np.random.default_rng(seed=55)
+        data = pd.concat([reviews] * 50, ignore_index=True)
+        data["content"] = data["content"] + " " + pd.Series(
+            rng.choice(["Great", "Terrible", "Crashes often", "Love it"], size=len(data)),
+            dtype="string",
+        )
+        data["tqa_score"] = rng.random(size=len(data))
+        data["dqa_is_duplicate"] = rng.random(size=len(data)) > 0.95
+        data["dqa_has_url"] = rng.random(size=len(data)) > 0.99
+        size = data.memory_usage(deep=True).sum() / 1024**2
+
+        kwargs = {"engine": "pyarrow", "index": False, "partition_cols": ["category"]}
+        writers = {
+            "default": PandasDataFrameParquetWriter(kwargs={**kwargs, "compression": "snappy"}),
+            "policy": PandasDataFrameParquetWriter(
+                kwargs=kwargs,
+                encoding=ParquetEncoding(
+                    text_columns=["content"], dictionary_columns=["app_id", "app_name"]
+                ),
+            ),
+        }
+        results = {}
+        for name, writer in writers.items():
+            filepath = os.path.join(tmp_path, f"{name}.parquet")
+            write_start = datetime.now()
+            writer.write(dataframe=data, filepath=filepath)
+            write_time = (datetime.now() - write_start).total_seconds()
+            read_start = datetime.now()
+            assert len(pd.read_parquet(filepath)) == len(data)
+            read_time = (datetime.now() - read_start).total_seconds()
+            files = [f.path for f in ds.dataset(filepath, partitioning="hive").get_fragments()]
+            results[name] = {
+                "files": files,
+                "size": sum(os.path.getsize(f) for f in files) / 1024**2,
+                "write": size / write_time,
+                "read": size / read_time,
+            }
+        # Benchmark report: on-disk size and read/write throughput of the in-memory data.
+        for name, result in results.items():
+            logger.info(
+                f"{name:>8}: {result['size']:8.2f} MB on disk, write {result['write']:8.1f} MB/s, "
+                f"read {result['read']:8.1f} MB/s"
+            )
+        assert results["policy"]["size"] < results["default"]["size"]
+
+        metadata = pq.ParquetFile(results["policy"]["files"][0]).metadata
+        columns = {
+            metadata.row_group(0).column(i).path_in_schema: metadata.row_group(0).column(i)
+            for i in range(metadata.num_columns)
+        }
+        assert "category" not in columns
+        assert columns["content"].compression == "ZSTD"
+        assert "RLE_DICTIONARY" not in columns["content"].encodings
+        assert "RLE_DICTIONARY" in columns["app_name"].encodings
+        assert "DELTA_BINARY_PACKED" in columns["date"].encodings
+        assert "BYTE_STREAM_SPLIT" in columns["tqa_score"].encodings
+        assert columns["dqa_is_duplicate"].encodings == ("RLE",)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_parquet_reader(self, fao, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        filepath = os.path.join(tmp_path, "reviews.parquet")
+        PandasDataFrameParquetWriter(
+            kwargs={"engine": "pyarrow", "index": False, "partition_cols": ["category"]}
+        ).write(dataframe=reviews, filepath=filepath)
+        reader = PandasDataFrameParquetReader(
+            kwargs={"use_threads": True, "pre_buffer": True, "batch_size": 100}
+        )
+
+        df = reader.read(filepath=filepath)
+        assert len(df) == len(reviews)
+        assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+        assert sorted(df["category"].cat.categories) == ["Book", "Business", "Finance"]
+        assert (df.sort_values("id")["id"].values == reviews.sort_values("id")["id"].values).all()
+
+        # Columns and filters are pushed down to the scan.
+        df = reader.read(
+            filepath=filepath, columns=["id", "category"], filter=ds.field("category") == "Book"
+        )
+        assert list(df.columns) == ["id", "category"]
+        assert len(df) == (reviews["category"] == "Book").sum()
+
+        batches = list(reader.iter_batches(filepath=filepath))
+        assert len(batches) > 3
+        assert all(len(batch) <= 100 for batch in batches)
+        assert sum(len(batch) for batch in batches) == len(reviews)
+
+        # The FAO streams pandas or Arrow batches of the requested size and columns.
+        batches = list(fao.iter_batches(filepath=filepath, batch_size=50, columns=["id", "category"]))
+        assert all(len(batch) <= 50 for batch in batches)
+        assert sum(len(batch) for batch in batches) == len(reviews)
+        assert list(batches[0].columns) == ["id", "category"]
+        batches = list(fao.iter_batches(filepath=filepath, batch_size=50, arrow=True))
+        assert all(isinstance(batch, pa.RecordBatch) for batch in batches)
+        assert sum(batch.num_rows for batch in batches) == len(reviews)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_csv_ingest(self, reviews, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        source = os.path.join(tmp_path, "reviews.csv")
+        data = reviews.copy()
+        data["content"] = data["content"].str.replace(" of ", ",\n of ")
+        data.to_csv(source, index=False)
+        config = {
+            "ingest": {"block_size": 16384, "partition_cols": ["category"]},
+            "layout": {"target_row_group_size": 16384},
+            "encoding": {"text_columns": ["content"], "dictionary_columns": ["app_id"]},
+        }
+        filepath = os.path.join(tmp_path, "reviews")
+        rows = CSVIngestor(config=config).ingest(
+            source=source, destination=filepath, schema=REVIEW_SCHEMA
+        )
+        assert rows == len(reviews)
+        assert sorted(os.listdir(filepath)) == [
+            "category=Book",
+            "category=Business",
+            "category=Finance",
+        ]
+        with pytest.raises(FileExistsError):
+            CSVIngestor(config=config).ingest(source=source, destination=filepath)
+
+        # Quoted newlines survive and the declared types are applied while parsing.
+        df = PandasDataFrameParquetReader(kwargs={}).read(filepath=filepath, schema=REVIEW_SCHEMA)
+        assert len(df) == len(reviews)
+        assert df["content"].str.contains("\n").all()
+        assert df["rating"].dtype == "int16"
+        assert df["date"].dtype == "datetime64[ms]"
+        assert isinstance(df["category"].dtype, pd.CategoricalDtype)
+
+        # Files are written incrementally in bounded row groups.
+        file = os.path.join(filepath, "category=Book", os.listdir(os.path.join(filepath, "category=Book"))[0])
+        assert pq.ParquetFile(file).metadata.num_row_groups > 1
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
@@ -11,17 +11,29 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Thursday January 23rd 2025 10:16:31 pm                                              #
-# Modified   : Saturday January 25th 2025 04:41:13 pm                                              #
+# Modified   : Monday October 19th 2026 08:31:39 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
 # ================================================================================================ #
 import inspect
 import logging
+import os
+import threading
+import time
 from datetime import datetime
 
+import numpy as np
+import pandas as pd
 import pytest
 
+from genailab.asset.dataset.builder import DatasetBuilder
+from genailab.asset.dataset.config import DatasetConfig
+from genailab.infra.persist.repo.dataset import DatasetRepo
+from genailab.infra.persist.repo.object.dao import DAO
+from genailab.infra.persist.repo.object.rao import RAO
+from genailab.infra.utils.file.copy import Copy
+
 # ------------------------------------------------------------------------------------------------ #
 # pylint: disable=missing-class-docstring, line-too-long
 # mypy: ignore-errors
@@ -33,6 +45,28 @@ double_line = f"\n{100 * '='}"
 single_line = f"\n{100 * '-'}"
 
 
+# ------------------------------------------------------------------------------------------------ #
+class OverlapDAO(DAO):
+    """Counts reads that overlap an update, holding each read open for a moment."""
+
+    def __init__(self, db_path: str):
+        super().__init__(db_path=db_path)
+        self.updates = 0
+        self.overlaps = 0
+
+    def read(self, asset_id: str):
+        updates = self.updates
+        time.sleep(0.05)
+        asset = super().read(asset_id=asset_id)
+        if self.updates != updates:
+            self.overlaps += 1
+        return asset
+
+    def update(self, asset) -> None:
+        self.updates += 1
+        super().update(asset=asset)
+
+
 @pytest.mark.something
 class TestSomething:  # pragma: no cover
     # ============================================================================================ #
@@ -52,3 +86,296 @@ class TestSomething:  # pragma: no cover
             f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
         )
         logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.repo
+class TestDatasetRepoSnapshot:  # pragma: no cover
+    # ============================================================================================ #
+    def test_snapshot(self, fao, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        # Snapshots reproduce the source, linked or cloned where the filesystem allows.
+        source = tmp_path / "source"
+        (source / "category=Book").mkdir(parents=True)
+        (source / "category=Book" / "part-0.parquet").write_bytes(b"data")
+        Copy().snapshot(source=str(source), target=str(tmp_path / "snapshot"))
+        snapshot = tmp_path / "snapshot" / "category=Book" / "part-0.parquet"
+        assert snapshot.read_bytes() == b"data"
+        with pytest.raises(FileExistsError):
+            Copy().snapshot(source=str(source), target=str(tmp_path / "snapshot"))
+
+        repo = DatasetRepo(
+            location=str(tmp_path / "fal"),
+            dao=DAO(db_path=str(tmp_path / "dal" / "db")),
+            fao=fao,
+            rao=RAO(registry_path=str(tmp_path / "ral" / "registry")),
+        )
+
+        def build(stage: str, df: pd.DataFrame, source=None):
+            config = DatasetConfig.from_dict(
+                {"phase": "dataprep", "stage": stage, "name": "review", "file_format": "parquet", "dftype": "pandas"}
+            )
+            builder = DatasetBuilder(repo=repo, fao=fao).from_config(config).dataframe(df).creator("Test")
+            if source is not None:
+                builder = builder.source(source.passport)
+            return builder.build()
+
+        n = 3000
+        df = pd.DataFrame(
+            {
+                "id": [str(i) for i in range(n)],
+                "category": pd.Categorical([["Book", "Health & Fitness", "Finance"][i % 3] for i in range(n)]),
+                "vote_count": np.arange(n),
+            }
+        )
+        raw = repo.add(dataset=build("raw", df), entity="Test")
+        assert sorted(raw.file.partitions) == ["category=Book", "category=Finance", "category=Health & Fitness"]
+
+        # Row counts and sizes are recorded from footers and available without reading the data.
+        meta = repo.get_meta(asset_id=raw.asset_id)
+        assert meta.num_rows == n
+        assert meta.file.num_row_groups >= 3
+        assert sorted(meta.file.column_sizes) == ["id", "vote_count"]
+        entry = repo.registry.set_index("asset_id").loc[raw.asset_id]
+        assert entry["num_rows"] == n
+        assert entry["size"] == meta.file.size
+
+        # Only the footer fingerprint is recorded on add; the full one on the first full verify.
+        assert meta.file.footer_fingerprint is not None
+        assert meta.file.fingerprint is None
+        assert repo.verify(asset_id=raw.asset_id, full=True)
+        assert repo.get_meta(asset_id=raw.asset_id).file.fingerprint is not None
+        assert repo.verify(asset_id=raw.asset_id, full=True)
+
+        # Only the Book partition changes, so the other partitions are linked from the source.
+        df = df.loc[~((df["category"] == "Book") & (df["vote_count"] % 2 == 0))]
+        clean = repo.add(dataset=build("preprocess", df, source=raw), entity="Test")
+        assert clean.file.partitions["category=Finance"] == raw.file.partitions["category=Finance"]
+        assert clean.file.partitions["category=Book"] != raw.file.partitions["category=Book"]
+
+        result = repo.get(asset_id=clean.asset_id).dataframe
+        assert len(result) == len(df)
+        assert sorted(result["id"]) == sorted(df["id"])
+
+        def files(path: str, partition: str) -> list:
+            directory = [entry.path for entry in os.scandir(path) if partition in entry.name][0]
+            return [os.stat(entry.path) for entry in sorted(os.scandir(directory), key=lambda e: e.name)]
+
+        assert all(stat.st_nlink == 1 for stat in files(clean.file.path, "Book"))
+
+        # Linked partitions share the source's files where the filesystem hard links them.
+        probe = tmp_path / "probe"
+        probe.write_bytes(b"probe")
+        Copy.link(str(probe), str(tmp_path / "probe_link"))
+        if os.stat(probe).st_ino != os.stat(tmp_path / "probe_link").st_ino:
+            pytest.skip("The filesystem clones or copies files rather than hard linking them.")
+        linked = files(clean.file.path, "Finance")
+        assert [stat.st_ino for stat in linked] == [stat.st_ino for stat in files(raw.file.path, "Finance")]
+        assert all(stat.st_nlink > 1 for stat in linked)
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.repo
+class TestDatasetRepoFingerprint:  # pragma: no cover
+    # ============================================================================================ #
+    def test_get_fingerprint(self, fao, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo = DatasetRepo(
+            location=str(tmp_path / "fal"),
+            dao=DAO(db_path=str(tmp_path / "dal" / "db")),
+            fao=fao,
+            rao=RAO(registry_path=str(tmp_path / "ral" / "registry")),
+        )
+
+        def build(stage: str, df: pd.DataFrame):
+            config = DatasetConfig.from_dict(
+                {"phase": "dataprep", "stage": stage, "name": "review", "file_format": "parquet", "dftype": "pandas"}
+            )
+            return DatasetBuilder(repo=repo, fao=fao).from_config(config).dataframe(df).creator("Test").build()
+
+        n = 1000
+        df = pd.DataFrame(
+            {
+                "id": [str(i) for i in range(n)],
+                "category": ["Book", "Finance"] * (n // 2),
+                "flag": np.random.default_rng(0).random(n) < 0.5,
+            }
+        )
+        # Swapping two values within a partition leaves its footer statistics unchanged.
+        flags = df["flag"].to_numpy().copy()
+        i = next(k for k in range(2, n, 2) if flags[k] != flags[0])
+        flags[[0, i]] = flags[[i, 0]]
+        swapped = df.assign(flag=flags)
+        first = repo.add(dataset=build("raw", df), entity="Test")
+        second = repo.add(dataset=build("preprocess", swapped), entity="Test")
+        assert first.file.footer_fingerprint == second.file.footer_fingerprint
+
+        # The content fingerprints differ, and are computed once and recorded.
+        assert repo.get_meta(asset_id=first.asset_id).file.fingerprint is None
+        fingerprint = repo.get_fingerprint(dataset=repo.get_meta(asset_id=first.asset_id))
+        assert fingerprint is not None
+        assert fingerprint != repo.get_fingerprint(dataset=repo.get_meta(asset_id=second.asset_id))
+        assert repo.get_meta(asset_id=first.asset_id).file.fingerprint == fingerprint
+        assert repo.get_fingerprint(dataset=repo.get_meta(asset_id=first.asset_id)) == fingerprint
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.repo
+class TestDatasetRepoWriteBehind:  # pragma: no cover
+    # ============================================================================================ #
+    def test_add_async(self, fao, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        repo = DatasetRepo(
+            location=str(tmp_path / "fal"),
+            dao=DAO(db_path=str(tmp_path / "dal" / "db")),
+            fao=fao,
+            rao=RAO(registry_path=str(tmp_path / "ral" / "registry")),
+            write_behind=True,
+        )
+
+        def build(stage: str, df: pd.DataFrame):
+            config = DatasetConfig.from_dict(
+                {"phase": "dataprep", "stage": stage, "name": "review", "file_format": "parquet", "dftype": "pandas"}
+            )
+            return DatasetBuilder(repo=repo, fao=fao).from_config(config).dataframe(df).creator("Test").build()
+
+        df = pd.DataFrame(
+            {"id": [str(i) for i in range(1000)], "category": ["Book", "Finance"] * 500, "content": ["app"] * 1000}
+        )
+        expected = df.copy()
+
+        # The write is held open until released, so the dataset is served from memory.
+        release = threading.Event()
+        handle = repo.add_async(dataset=build("raw", df), entity="Test", on_registered=lambda dataset: release.wait(10))
+        assert not handle.done()
+        assert repo.exists(asset_id=handle.dataset.asset_id)
+        served = repo.get(asset_id=handle.dataset.asset_id, entity="Test")
+        assert served.dataframe is not df
+        served.dataframe["content"] = "changed"
+        df["content"] = "changed"
+
+        release.set()
+        dataset = handle.result(timeout=10)
+        assert dataset.file is not None
+        repo.join()
+        meta = repo.get_meta(asset_id=dataset.asset_id)
+        assert meta.num_rows == 1000
+        assert not meta.consumed
+        result = repo.get(asset_id=dataset.asset_id).dataframe
+        assert sorted(result["content"].unique()) == ["app"]
+        assert sorted(result["id"]) == sorted(expected["id"])
+
+        # Consumption recorded on a served copy keeps the file attributes.
+        served.consume(entity="Test")
+        repo.update(dataset=served)
+        assert repo.get_meta(asset_id=dataset.asset_id).file.path == dataset.file.path
+
+        # Failed writes leave neither files nor registrations and are raised at the join point.
+        bad = pd.DataFrame({"id": ["1", "2"], "category": ["Book", "Book"], "content": ["app", 1]})
+        handle = repo.add_async(dataset=build("preprocess", bad), entity="Test")
+        with pytest.raises(Exception):
+            repo.join()
+        assert not repo.exists(asset_id=handle.dataset.asset_id)
+        assert not os.path.exists(os.path.join(str(tmp_path / "fal"), "dataprep", f"{handle.dataset.asset_id}.parquet"))
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_update_while_pending(self, fao, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        dao = OverlapDAO(db_path=str(tmp_path / "dal" / "db"))
+        repo = DatasetRepo(
+            location=str(tmp_path / "fal"),
+            dao=dao,
+            fao=fao,
+            rao=RAO(registry_path=str(tmp_path / "ral" / "registry")),
+            write_behind=True,
+        )
+
+        def build(stage: str, df: pd.DataFrame, source=None):
+            config = DatasetConfig.from_dict(
+                {"phase": "dataprep", "stage": stage, "name": "review", "file_format": "parquet", "dftype": "pandas"}
+            )
+            return DatasetBuilder(repo=repo, fao=fao).from_config(config).source(source).dataframe(df).creator("Test").build()
+
+        df = pd.DataFrame(
+            {"id": [str(i) for i in range(1000)], "category": ["Book", "Finance"] * 500, "content": ["app"] * 1000}
+        )
+        source = repo.add(dataset=build("raw", df), entity="Test")
+
+        # An earlier write holds the writer thread, so the target is written behind while the
+        # source is consumed and updated, as a stage publishes it.
+        release = threading.Event()
+        repo.add_async(dataset=build("dqa", df), entity="Test", on_registered=lambda dataset: release.wait(10))
+        handle = repo.add_async(dataset=build("preprocess", df, source=source.passport), entity="Test")
+
+        def publish() -> None:
+            while not handle.done():
+                source.consume(entity="Test")
+                repo.update(dataset=source)
+                time.sleep(0.001)
+
+        publisher = threading.Thread(target=publish)
+        publisher.start()
+        release.set()
+        target = handle.result(timeout=30)
+        publisher.join(timeout=10)
+        repo.join()
+        assert dao.overlaps == 0
+        assert repo.exists(asset_id=target.asset_id)
+        assert repo.get_meta(asset_id=target.asset_id).num_rows == 1000
+        assert repo.get_meta(asset_id=source.asset_id).consumed
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
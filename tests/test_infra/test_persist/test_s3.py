@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_persist/test_s3.py                                           #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:46:11 pm                                                #
+# Modified   : Monday October 19th 2026 06:46:11 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import os
+from datetime import datetime
+
+import pytest
+
+from genailab.infra.persist.cloud.aws import S3Handler
+
+moto = pytest.importorskip("moto")
+boto3 = pytest.importorskip("boto3")
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+BUCKET = "appvocai-test"
+NUM_FILES = 1005  # More than one page of list_objects_v2 results.
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Runs in a scratch directory, so the S3 cache is created under tmp_path."""
+    monkeypatch.setenv("CONFIG_DIRECTORY", os.path.abspath("config"))
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.s3
+class TestS3Handler:  # pragma: no cover
+    # ============================================================================================ #
+    def test_transfer(self, workspace, monkeypatch, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        source = workspace / "source"
+        for i in range(NUM_FILES):
+            path = source / f"part={i % 3}" / f"{i}.txt"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(f"review {i}")
+
+        with moto.mock_aws():
+            s3 = S3Handler(s3_client=boto3.client("s3", region_name="us-east-1"))
+            s3.s3_client.create_bucket(Bucket=BUCKET)
+
+            # Uploads run through the thread pool and listing follows all pages.
+            s3.upload_folder(local_folder=str(source), bucket_name=BUCKET, s3_folder="reviews")
+            assert len(list(s3.list_objects(bucket_name=BUCKET, prefix="reviews"))) == NUM_FILES
+
+            local_paths = s3.download_folder(
+                bucket_name=BUCKET, s3_folder="reviews", local_folder=str(workspace / "first")
+            )
+            assert len(local_paths) == NUM_FILES
+            assert (workspace / "first" / "part=1" / "4.txt").read_text() == "review 4"
+
+            # A repeated pull of unchanged objects is served from the ETag cache.
+            def fail(*args, **kwargs):
+                raise AssertionError("Cached objects must not be downloaded again.")
+
+            with monkeypatch.context() as m:
+                m.setattr(s3.s3_client, "download_file", fail)
+                local_paths = s3.download_folder(
+                    bucket_name=BUCKET, s3_folder="reviews", local_folder=str(workspace / "second")
+                )
+            assert len(local_paths) == NUM_FILES
+            assert all(os.path.exists(path) for path in local_paths)
+            assert (workspace / "second" / "part=2" / "5.txt").read_text() == "review 5"
+
+            # A changed object has a new ETag and is downloaded again.
+            s3.s3_client.put_object(Bucket=BUCKET, Key="reviews/part=1/4.txt", Body=b"changed")
+            s3.download_file(
+                BUCKET, "reviews/part=1/4.txt", str(workspace / "first" / "part=1" / "4.txt"), force=True
+            )
+            assert (workspace / "first" / "part=1" / "4.txt").read_text() == "changed"
+            assert (workspace / "second" / "part=1" / "4.txt").read_text() == "review 4"
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
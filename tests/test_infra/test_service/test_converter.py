@@ -11,7 +11,7 @@
 # URL        : https://github.com/variancexplained/genai-lab-slm                                   #
 # ------------------------------------------------------------------------------------------------ #
 # Created    : Monday January 27th 2025 02:09:30 pm                                                #
-# Modified   : Monday January 27th 2025 02:28:22 pm                                                #
+# Modified   : Monday October 19th 2026 07:46:54 pm                                                #
 # ------------------------------------------------------------------------------------------------ #
 # License    : MIT License                                                                         #
 # Copyright  : (c) 2025 John James                                                                 #
@@ -24,6 +24,10 @@ import pandas as pd
 import pytest
 
 from genailab.infra.service.data.convert import Converter
+from genailab.infra.utils.data.convert import (
+    PandasToSparkConverter,
+    SparkToPandasConverter,
+)
 
 # ------------------------------------------------------------------------------------------------ #
 # pylint: disable=missing-class-docstring, line-too-long
@@ -39,7 +43,7 @@ single_line = f"\n{100 * '-'}"
 @pytest.mark.converter
 class TestConverter:  # pragma: no cover
     # ============================================================================================ #
-    def test_to_indirect(self, spark_df, caplog) -> None:
+    def test_to_pandas(self, spark_df, caplog) -> None:
         start = datetime.now()
         logger.info(
             f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
@@ -50,7 +54,7 @@ class TestConverter:  # pragma: no cover
         df = Converter.to_pandas(df=spark_df)
         end = datetime.now()
         duration = (end-start).total_seconds()
-        logging.info(f"\n\nIndirect Conversion Tool {round(duration,3)} Seconds")
+        logging.info(f"\n\nConversion Took {round(duration,3)} Seconds")
         assert isinstance(df, (pd.core.frame.DataFrame, pd.DataFrame))
         logging.info(f"\n\nDataFrame Information\n{df.info()}")
 
@@ -64,7 +68,7 @@ class TestConverter:  # pragma: no cover
         logger.info(single_line)
 
     # ============================================================================================ #
-    def test_to_direct(self, spark_df, caplog) -> None:
+    def test_iter_pandas(self, spark_df, caplog) -> None:
         start = datetime.now()
         logger.info(
             f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
@@ -72,12 +76,49 @@ class TestConverter:  # pragma: no cover
         logger.info(double_line)
         # ---------------------------------------------------------------------------------------- #
         start = datetime.now()
-        df = Converter.to_pandas(df=spark_df,direct=True)
+        chunks = list(SparkToPandasConverter().iter_pandas(sdf=spark_df))
         end = datetime.now()
         duration = (end-start).total_seconds()
-        logging.info(f"\n\nDirect Conversion Tool {round(duration,3)} Seconds")
-        assert isinstance(df, (pd.core.frame.DataFrame, pd.DataFrame))
-        logging.info(f"\n\nDataFrame Information\n{df.info()}")
+        logging.info(f"\n\nStreaming Conversion Took {round(duration,3)} Seconds")
+        assert all(isinstance(chunk, pd.DataFrame) for chunk in chunks)
+        assert sum(len(chunk) for chunk in chunks) == spark_df.count()
+        assert isinstance(chunks[0]["category"].dtype, pd.CategoricalDtype)
+        assert str(chunks[0]["date"].dtype) == "datetime64[ms]"
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_to_spark(self, pandas_df, spark, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        key = "spark.sql.execution.arrow.maxRecordsPerBatch"
+        previous = spark.conf.get(key)
+        converter = PandasToSparkConverter(batch_size=1000)
+        struct = converter.get_struct_type(pdf=pandas_df)
+        sdf = converter.to_spark(pdf=pandas_df, spark=spark)
+        assert sdf.schema == struct
+        assert sdf.count() == len(pandas_df)
+        # The shared session keeps its own Arrow settings.
+        assert spark.conf.get(key) == previous
+
+        # Frames above the spill threshold are staged through a Parquet file.
+        converter = PandasToSparkConverter(
+            batch_size=1000, spill_threshold=0, staging_dir=str(tmp_path)
+        )
+        sdf = converter.to_spark(pdf=pandas_df, spark=spark)
+        assert sdf.schema == struct
+        assert sdf.count() == len(pandas_df)
 
         # ---------------------------------------------------------------------------------------- #
         end = datetime.now()
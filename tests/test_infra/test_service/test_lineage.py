@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_service/test_lineage.py                                      #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:59:59 pm                                                #
+# Modified   : Monday October 19th 2026 08:35:17 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+from datetime import datetime
+
+import pytest
+from pyspark.sql import functions as F
+
+from genailab.flow.base.scheduler import TaskScheduler
+from genailab.flow.base.task import Task
+from genailab.infra.service.spark.lineage import LineageManager
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+class FlagTask(Task):
+    """Adds a flag column and filters nothing."""
+
+    def __init__(self, index: int) -> None:
+        super().__init__()
+        self._index = index
+
+    def run(self, data):
+        data = data.withColumn(f"dqa_flag_{self._index}", F.col("id") % (self._index + 2) == 0)
+        return data.filter(F.col("id") >= 0)
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.lineage
+class TestLineageManager:  # pragma: no cover
+    # ============================================================================================ #
+    def test_lineage(self, spark, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        tasks = [FlagTask(index=i) for i in range(25)]
+        dataframe = spark.range(1000)
+        expected = TaskScheduler(max_workers=1).run(tasks=tasks, dataframe=dataframe)
+
+        lineage = LineageManager(interval=10, max_depth=1000)
+        scheduler = TaskScheduler(max_workers=1, lineage=lineage)
+        result = scheduler.run(tasks=tasks, dataframe=dataframe)
+
+        # Truncation keeps the plan shallow without changing the data.
+        assert lineage.report["truncations"] == 2
+        assert LineageManager._depth(result) < LineageManager._depth(expected)
+        assert result.count() == expected.count()
+        assert sorted(result.collect()) == sorted(expected.collect())
+
+        # The depth threshold truncates independently of the interval. Each task adds two plan
+        # nodes, so both modes truncate once every five tasks, although persisting leaves the
+        # plan as deep as it was.
+        for mode in ("persist", "local_checkpoint"):
+            lineage = LineageManager(interval=0, max_depth=10, mode=mode)
+            TaskScheduler(max_workers=1, lineage=lineage).run(tasks=tasks, dataframe=dataframe)
+            assert lineage.report["truncations"] == len(tasks) // 5
+            lineage.reset()
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_service/test_pool.py                                         #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 07:27:51 pm                                                #
+# Modified   : Monday October 19th 2026 08:05:21 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import inspect
+import logging
+import math
+import os
+import zipfile
+from datetime import datetime
+
+import psutil
+import pytest
+from pyspark.sql import functions as F
+from pyspark.sql.types import StringType
+
+from genailab.core.dtypes import DFType
+from genailab.infra.service.spark.files import get_file
+from genailab.infra.service.spark.pool import SparkSessionPool
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+SPARK_CONFIG = {
+    "memory": "4g",
+    "retries": 1,
+    "parquet_block_size": 536870912,
+    "warm_start": False,
+    "offheap_fraction": 0.1,
+    "arrow_batch_size": 16 * 1024**2,
+}
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.pool
+class TestSparkSessionPool:  # pragma: no cover
+    # ============================================================================================ #
+    def test_settings(self, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = SparkSessionPool(spark_config=SPARK_CONFIG)
+        settings = pool.settings
+        assert settings["spark.serializer"] == "org.apache.spark.serializer.KryoSerializer"
+        assert settings["spark.memory.offHeap.enabled"] == "true"
+        assert int(settings["spark.memory.offHeap.size"]) == int(psutil.virtual_memory().total * 0.1)
+        assert "spark.sql.shuffle.partitions" not in settings
+
+        # A small input gets one shuffle partition per core.
+        runtime = pool.tune(input_size=50 * 1024**2, num_rows=50000)
+        assert runtime["spark.sql.shuffle.partitions"] == str(psutil.cpu_count(logical=True))
+        assert runtime["spark.sql.adaptive.advisoryPartitionSizeInBytes"] == str(256 * 1024**2)
+        # Rows of about 1 KB fill 16 MB batches with about 16k rows.
+        assert int(runtime["spark.sql.execution.arrow.maxRecordsPerBatch"]) == int(16 * 1024**2 / (50 * 1024**2 / 50000))
+        assert pool.settings["spark.sql.shuffle.partitions"] == runtime["spark.sql.shuffle.partitions"]
+
+        # A large input gets one shuffle partition per partition size of its threshold.
+        runtime = pool.tune(input_size=200 * 1024**3)
+        assert runtime["spark.sql.shuffle.partitions"] == str(max(psutil.cpu_count(logical=True), math.ceil(200 * 1024 / 768)))
+        assert "spark.sql.execution.arrow.maxRecordsPerBatch" not in runtime
+
+        # Unknown input sizes keep the defaults.
+        assert pool.tune(input_size=None) == {}
+
+        # Off-heap memory can be disabled.
+        pool = SparkSessionPool(spark_config={**SPARK_CONFIG, "offheap_fraction": 0})
+        assert "spark.memory.offHeap.enabled" not in pool.settings
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_warm_start_disabled(self, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = SparkSessionPool(spark_config=SPARK_CONFIG)
+        pool.warm(dftype=DFType.SPARK)
+        assert pool._pending == {}
+        pool.stop(keep=DFType.SPARK)
+        pool.stop()
+        assert pool.session == "No Active Spark Session"
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_executor_settings(self, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = SparkSessionPool(spark_config=SPARK_CONFIG)
+        assert pool.master == "local[*]"
+        assert pool.local
+        assert pool.files == []
+        assert pool.settings["spark.executor.memory"] == "4g"
+        assert "spark.cores.max" not in pool.settings
+
+        pool = SparkSessionPool(
+            spark_config={**SPARK_CONFIG, "master": "local-cluster[2,1,1024]", "executor": {"instances": 2, "cores": 1}}
+        )
+        assert not pool.local
+        settings = pool.settings
+        assert settings["spark.master"] == "local-cluster[2,1,1024]"
+        assert settings["spark.executor.memory"] == "1024m"
+        assert settings["spark.executor.instances"] == "2"
+        assert settings["spark.cores.max"] == "2"
+
+        pool = SparkSessionPool(
+            spark_config={**SPARK_CONFIG, "master": "spark://host:7077", "executor": {"instances": 4, "cores": 8, "memory": "32g"}}
+        )
+        assert pool.settings["spark.executor.memory"] == "32g"
+        assert pool.settings["spark.cores.max"] == "32"
+
+        # Outside Spark, files resolve to their configured path.
+        assert get_file("models/language_detection/lid.176.bin") == "models/language_detection/lid.176.bin"
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_package_archive(self, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        pool = SparkSessionPool(spark_config={**SPARK_CONFIG, "master": "local-cluster[2,1,1024]"})
+        archive = pool._package_archive()
+        try:
+            # The archive is built once and shared by later sessions.
+            assert SparkSessionPool(spark_config=SPARK_CONFIG)._package_archive() == archive
+            with zipfile.ZipFile(archive) as zf:
+                names = zf.namelist()
+            assert "genailab/infra/service/spark/pool.py" in names
+            assert not [name for name in names if "__pycache__" in name or name.endswith(".pyc")]
+
+            # Stopping a session but keeping the other leaves the archive in place.
+            pool.stop(keep=DFType.SPARK)
+            assert os.path.exists(archive)
+        finally:
+            pool.stop()
+        assert not os.path.exists(os.path.dirname(archive))
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_local_cluster(self, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        model = tmp_path / "model.bin"
+        model.write_text("weights")
+        pool = SparkSessionPool(
+            spark_config={
+                **SPARK_CONFIG,
+                "memory": "1g",
+                "master": "local-cluster[2,1,1024]",
+                "executor": {"instances": 2, "cores": 1},
+                "files": [str(model)],
+            }
+        )
+        try:
+            spark = pool.spark
+
+            def read_model(_):
+                # Runs in the executors' Python workers, importing genailab from the shipped package.
+                from genailab.infra.service.spark.files import get_file
+
+                with open(get_file("model.bin")) as file:
+                    return file.read()
+
+            udf = F.udf(read_model, StringType())
+            rows = spark.range(0, 100, numPartitions=4).select(udf(F.col("id")).alias("model")).distinct().collect()
+            assert [row.model for row in rows] == ["weights"]
+            assert spark.sparkContext.master == "local-cluster[2,1,1024]"
+        finally:
+            pool.stop()
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
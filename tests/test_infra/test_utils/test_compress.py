@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding:utf-8 -*-
+# ================================================================================================ #
+# Project    : GenAI-Lab-SLM                                                                       #
+# Version    : 0.1.0                                                                               #
+# Python     : 3.10.14                                                                             #
+# Filename   : /tests/test_infra/test_utils/test_compress.py                                       #
+# ------------------------------------------------------------------------------------------------ #
+# Author     : John James                                                                          #
+# Email      : john@variancexplained.com                                                           #
+# URL        : https://github.com/variancexplained/genai-lab-slm                                   #
+# ------------------------------------------------------------------------------------------------ #
+# Created    : Monday October 19th 2026 06:49:13 pm                                                #
+# Modified   : Monday October 19th 2026 07:47:39 pm                                                #
+# ------------------------------------------------------------------------------------------------ #
+# License    : MIT License                                                                         #
+# Copyright  : (c) 2026 John James                                                                 #
+# ================================================================================================ #
+import filecmp
+import gzip
+import inspect
+import logging
+import os
+import tarfile
+import zipfile
+from datetime import datetime
+
+import pytest
+
+from genailab.infra.utils.file.compress import (
+    BlockGzipReader,
+    TarGzHandler,
+    ZipFileHandler,
+)
+
+# ------------------------------------------------------------------------------------------------ #
+# pylint: disable=missing-class-docstring, line-too-long
+# mypy: ignore-errors
+# ------------------------------------------------------------------------------------------------ #
+# ------------------------------------------------------------------------------------------------ #
+logger = logging.getLogger(__name__)
+# ------------------------------------------------------------------------------------------------ #
+double_line = f"\n{100 * '='}"
+single_line = f"\n{100 * '-'}"
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.fixture
+def dataset(tmp_path) -> str:
+    """A partitioned dataset directory with a few text files and an empty file."""
+    directory = tmp_path / "reviews"
+    for category in ("Book", "Finance"):
+        partition = directory / f"category={category}"
+        partition.mkdir(parents=True)
+        (partition / "part-0.txt").write_text(
+            "".join(f"Review {i} of {category} app {i % 13}.\n" for i in range(20000))
+        )
+    (directory / "_SUCCESS").touch()
+    return str(directory)
+
+
+def _same(left: str, right: str) -> bool:
+    comparison = filecmp.dircmp(left, right)
+    if comparison.left_only or comparison.right_only or comparison.diff_files:
+        return False
+    return all(
+        _same(os.path.join(left, sub), os.path.join(right, sub)) for sub in comparison.common_dirs
+    )
+
+
+# ------------------------------------------------------------------------------------------------ #
+@pytest.mark.compress
+class TestCompress:  # pragma: no cover
+    # ============================================================================================ #
+    def test_tar_gz(self, dataset, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        archive = str(tmp_path / "reviews.tar.gz")
+        handler = TarGzHandler(block_size=65536, max_workers=4)
+        handler.compress_directory(dataset, archive)
+        assert BlockGzipReader.is_block_gzip(archive)
+
+        # Parallel extraction restores the directory.
+        handler.extract(archive, str(tmp_path / "parallel"))
+        assert _same(dataset, str(tmp_path / "parallel" / "reviews"))
+
+        # The archive is a standard multi-member gzip file readable by standard tools.
+        with gzip.open(archive) as file:
+            assert len(file.read()) > 65536 * 4
+        with tarfile.open(archive, "r:gz") as tar:
+            tar.extractall(path=str(tmp_path / "standard"))
+        assert _same(dataset, str(tmp_path / "standard" / "reviews"))
+
+        # Archives written by other tools are extracted serially.
+        with tarfile.open(str(tmp_path / "other.tar.gz"), "w:gz") as tar:
+            tar.add(dataset, arcname="reviews")
+        assert not BlockGzipReader.is_block_gzip(str(tmp_path / "other.tar.gz"))
+        handler.extract(str(tmp_path / "other.tar.gz"), str(tmp_path / "other"))
+        assert _same(dataset, str(tmp_path / "other" / "reviews"))
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)
+
+    # ============================================================================================ #
+    def test_zip(self, dataset, tmp_path, caplog) -> None:
+        start = datetime.now()
+        logger.info(
+            f"\n\nStarted {self.__class__.__name__} {inspect.stack()[0][3]} at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(double_line)
+        # ---------------------------------------------------------------------------------------- #
+        parquet = os.path.join(dataset, "category=Book", "part-1.parquet")
+        with open(parquet, "wb") as file:
+            file.write(os.urandom(1024))
+        zippath = str(tmp_path / "reviews.zip")
+        handler = ZipFileHandler(max_workers=4)
+        handler.compress_directory(dataset, zippath)
+        with zipfile.ZipFile(zippath) as zip_ref:
+            assert zip_ref.getinfo("category=Book/part-1.parquet").compress_type == zipfile.ZIP_STORED
+            assert zip_ref.getinfo("category=Book/part-0.txt").compress_type == zipfile.ZIP_DEFLATED
+        handler.extract(zippath, str(tmp_path / "extracted"))
+        assert _same(dataset, str(tmp_path / "extracted"))
+
+        # Members that would land outside the target directory are rejected up front.
+        for name in ("../escaped/part-0.txt", "/tmp/escaped/part-0.txt"):
+            zippath = str(tmp_path / "traversal.zip")
+            with zipfile.ZipFile(zippath, "w") as zip_ref:
+                zip_ref.writestr(name, "escaped")
+            with pytest.raises(ValueError):
+                handler.extract(zippath, str(tmp_path / "traversal"))
+            assert not os.path.exists(tmp_path / "escaped")
+            assert not os.path.exists("/tmp/escaped")
+
+        # ---------------------------------------------------------------------------------------- #
+        end = datetime.now()
+        duration = round((end - start).total_seconds(), 1)
+
+        logger.info(
+            f"\n\nCompleted {self.__class__.__name__} {inspect.stack()[0][3]} in {duration} seconds at {start.strftime('%I:%M:%S %p')} on {start.strftime('%m/%d/%Y')}"
+        )
+        logger.info(single_line)